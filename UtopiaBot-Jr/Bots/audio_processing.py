@@ -0,0 +1,165 @@
+"""
+Audio Processing - loudness normalization and load-adaptive speaking rate
+Google voices come out at noticeably different levels, so each utterance is
+measured (RMS of the 16-bit PCM) and brought to a common target using a gain
+learned per voice; the gain is cached and refined as more lines are spoken.
+The speaking rate follows the speech queue: faster while a backlog builds,
+back to normal once it drains. numpy is used when installed (optional).
+"""
+import io
+import sys
+import math
+import wave
+import threading
+from array import array
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def read_wav(data):
+    """(channels, sample width, frame rate, PCM bytes) of a WAV file in memory"""
+    with wave.open(io.BytesIO(data), "rb") as w:
+        return w.getnchannels(), w.getsampwidth(), w.getframerate(), w.readframes(w.getnframes())
+
+
+def write_wav(channels, sample_width, frame_rate, pcm):
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as w:
+        w.setnchannels(channels)
+        w.setsampwidth(sample_width)
+        w.setframerate(frame_rate)
+        w.writeframes(pcm)
+    return buffer.getvalue()
+
+
+def _samples(pcm):
+    samples = array("h", pcm[:len(pcm) - len(pcm) % 2])
+    if sys.byteorder == "big":
+        samples.byteswap()  # WAV is little-endian
+    return samples
+
+
+def rms_dbfs(pcm):
+    """Loudness of 16-bit little-endian PCM in dB relative to full scale (-inf for silence)"""
+    if numpy is not None:
+        samples = numpy.frombuffer(pcm[:len(pcm) - len(pcm) % 2], dtype="<i2").astype(numpy.float64)
+        mean_square = float(numpy.mean(samples * samples)) if len(samples) else 0.0
+    else:
+        samples = _samples(pcm)
+        mean_square = sum(s * s for s in samples) / len(samples) if samples else 0.0
+    if mean_square <= 0:
+        return float("-inf")
+    return 10 * math.log10(mean_square / (32768.0 * 32768.0))
+
+
+def apply_gain(pcm, gain_db):
+    """Scale 16-bit PCM by gain_db, clipping at full scale"""
+    factor = 10 ** (gain_db / 20.0)
+    if numpy is not None:
+        samples = numpy.frombuffer(pcm[:len(pcm) - len(pcm) % 2], dtype="<i2").astype(numpy.float64)
+        return numpy.clip(samples * factor, -32768, 32767).astype("<i2").tobytes()
+    samples = _samples(pcm)
+    scaled = array("h", (max(-32768, min(32767, int(s * factor))) for s in samples))
+    if sys.byteorder == "big":
+        scaled.byteswap()
+    return scaled.tobytes()
+
+
+def resample(pcm, from_rate, to_rate):
+    """Linear-interpolation resample of mono 16-bit PCM (e.g. espeak's 22.05 kHz to 24 kHz)"""
+    if from_rate == to_rate or not pcm:
+        return pcm
+    if numpy is not None:
+        samples = numpy.frombuffer(pcm[:len(pcm) - len(pcm) % 2], dtype="<i2").astype(numpy.float64)
+        count = int(len(samples) * to_rate / from_rate)
+        positions = numpy.arange(count) * (from_rate / to_rate)
+        return numpy.interp(positions, numpy.arange(len(samples)), samples).astype("<i2").tobytes()
+    samples = _samples(pcm)
+    last = len(samples) - 1
+    ratio = from_rate / to_rate
+    out = array("h")
+    for i in range(int(len(samples) / ratio)):
+        position = i * ratio
+        j = int(position)
+        k = min(j + 1, last)
+        out.append(int(samples[j] + (samples[k] - samples[j]) * (position - j)))
+    if sys.byteorder == "big":
+        out.byteswap()
+    return out.tobytes()
+
+
+class LoudnessNormalizer:
+    """Per-voice gain toward a target RMS level, learned as a running average of each voice's loudness"""
+
+    def __init__(self, target_dbfs=-20.0, max_gain_db=12.0, smoothing=0.2, enabled=True):
+        self.target_dbfs = target_dbfs
+        self.max_gain_db = max_gain_db
+        self.smoothing = smoothing
+        self.enabled = enabled
+        self.voice_loudness = {}  # voice -> running loudness in dBFS
+        self._lock = threading.Lock()
+
+    def configure(self, target_dbfs=None, max_gain_db=None, enabled=None):
+        if target_dbfs is not None:
+            self.target_dbfs = target_dbfs
+        if max_gain_db is not None:
+            self.max_gain_db = max_gain_db
+        if enabled is not None:
+            self.enabled = enabled
+
+    def gain_for(self, voice):
+        """Cached gain in dB for a voice (0 until it has been heard once)"""
+        loudness = self.voice_loudness.get(voice)
+        if loudness is None:
+            return 0.0
+        return max(-self.max_gain_db, min(self.max_gain_db, self.target_dbfs - loudness))
+
+    def process(self, audio, extension, voice):
+        """Normalize a 16-bit WAV; anything else (e.g. MP3) is passed through untouched"""
+        if not self.enabled or extension != "wav":
+            return audio
+        try:
+            channels, sample_width, frame_rate, pcm = read_wav(audio)
+        except (wave.Error, EOFError):
+            return audio
+        if sample_width != 2 or not pcm:
+            return audio
+        loudness = rms_dbfs(pcm)
+        if loudness == float("-inf"):
+            return audio
+        with self._lock:
+            previous = self.voice_loudness.get(voice)
+            self.voice_loudness[voice] = loudness if previous is None else \
+                previous + self.smoothing * (loudness - previous)
+            gain = self.gain_for(voice)
+        if abs(gain) < 0.5:
+            return audio
+        return write_wav(channels, sample_width, frame_rate, apply_gain(pcm, gain))
+
+    def status(self):
+        with self._lock:
+            return {voice: round(self.gain_for(voice), 1) for voice in self.voice_loudness}
+
+
+class SpeakingRate:
+    """Speaking rate for the current queue depth: 1.0 up to start_depth, then +step per line, capped"""
+
+    def __init__(self, start_depth=3, step=0.05, max_rate=1.4):
+        self.configure(start_depth, step, max_rate)
+        self.current = 1.0
+
+    def configure(self, start_depth=None, step=None, max_rate=None):
+        if start_depth is not None:
+            self.start_depth = start_depth
+        if step is not None:
+            self.step = step
+        if max_rate is not None:
+            self.max_rate = max_rate
+
+    def rate_for(self, depth):
+        backlog = max(0, depth - self.start_depth)
+        self.current = round(min(self.max_rate, 1.0 + backlog * self.step), 2)
+        return self.current
@@ -0,0 +1,216 @@
+"""
+TikTok TTS Bot - Offline Benchmark
+Drives TikTokTTSBot's join/comment handlers with synthetic events, a stand-in
+TTS backend with configurable latency and a null audio sink.
+
+Examples:
+    python benchmark.py --events 2000 --rate 200 --shape burst
+    python benchmark.py --dispatch thread --tts-latency 0.3 --json after.json --compare before.json
+"""
+import os
+import sys
+import json
+import time
+import asyncio
+import logging
+import argparse
+import tempfile
+import threading
+import tracemalloc
+
+from synthetic_events import SyntheticEventGenerator, SyntheticJoinEvent, BURST_SHAPES
+from pipeline_tracing import percentile
+from tts_backends import TTSBackend, TTSRouter, MESSAGE_CLASSES
+from tiktok_bot_unified import TikTokTTSBot
+
+
+class StandInTTSBackend(TTSBackend):
+    """Local stand-in TTS backend - sleeps like a network call and returns silence"""
+    name = "standin"
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+
+    def synthesize(self, text, voice_name=None, speaking_rate=1.0):
+        if self.latency:
+            time.sleep(self.latency)
+        return b"\x00" * min(len(text) * 64, 65536), "mp3"
+
+
+class BenchmarkBot(TikTokTTSBot):
+    """TikTokTTSBot with a stand-in TTS backend and a null audio sink"""
+
+    def __init__(self, tts_latency=0.0, dispatch="scheduler", **kwargs):
+        self.dispatch = dispatch
+        super().__init__(gui_mode=False, **kwargs)
+        self.tts_router = TTSRouter([StandInTTSBackend(tts_latency)],
+                                    routes={c: "standin" for c in MESSAGE_CLASSES},
+                                    fallback="standin")
+        # Synthetic floods would use up the real character budget in seconds
+        self.budget.configure(per_minute=0, per_session=0)
+        self.player.use_device = False
+
+    def play_audio(self, path):
+        """Null audio sink"""
+
+    def dispatch_speech(self, text, span=None, message_class="chat", user=None, voice_name=None):
+        """Speech scheduler (the bot's behaviour), inline, or one thread per utterance (the old GUI path)"""
+        if self.dispatch == "scheduler":
+            super().dispatch_speech(text, span, message_class, user, voice_name)
+        elif self.dispatch == "thread":
+            threading.Thread(target=self.speak, args=(text, span, message_class, voice_name, user), daemon=True).start()
+        else:
+            self.speak(text, span, message_class, voice_name, user)
+
+
+async def drive(bot, generator, realtime=True):
+    """Feed every synthetic event through the bot's handlers and time them"""
+    handler_times = []
+    lags = []
+    sent = 0
+    start = time.monotonic()
+    for offset, evt in generator:
+        if realtime:
+            delay = start + offset - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            lags.append(max(0.0, time.monotonic() - (start + offset)))
+        handler = bot.handle_join if isinstance(evt, SyntheticJoinEvent) else bot.handle_comment
+        t0 = time.monotonic()
+        await handler(evt)
+        handler_times.append(time.monotonic() - t0)
+        sent += 1
+    return sent, handler_times, lags
+
+
+def wait_for_spans(bot, expected, timeout):
+    """Wait until every event's span has finished (speech threads drained)"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if sum(bot.tracer.outcomes().values()) >= expected:
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def run_benchmark(args):
+    """Run one benchmark and return a results dict"""
+    generator = SyntheticEventGenerator(
+        rate=args.rate, events=args.events, shape=args.shape,
+        duplicate_ratio=args.dup_ratio, emoji_density=args.emoji_density,
+        join_ratio=args.join_ratio, command_ratio=args.command_ratio,
+        users=args.users, burst_size=args.burst_size, seed=args.seed)
+
+    if args.tracemalloc:
+        tracemalloc.start()
+    # Scratch directory for audio files and the viewer database
+    work_dir = tempfile.mkdtemp(prefix="tts_bench_")
+    bot = BenchmarkBot(tts_latency=args.tts_latency, dispatch=args.dispatch,
+                       viewer_db=os.path.join(work_dir, "viewers.db"),
+                       transcript_dir=os.path.join(work_dir, "transcripts"))
+    # Keep per-message logging from drowning the report
+    logging.getLogger("TikTokTTSBot").setLevel(logging.WARNING)
+    bot.audio_dir = bot.player.audio_dir = work_dir
+    mem_before = tracemalloc.get_traced_memory()[0] if args.tracemalloc else 0
+
+    wall_start = time.monotonic()
+    sent, handler_times, lags = asyncio.run(drive(bot, generator, realtime=not args.flood))
+    drained = wait_for_spans(bot, sent, args.drain_timeout)
+    wall = time.monotonic() - wall_start
+
+    mem_after, mem_peak = tracemalloc.get_traced_memory() if args.tracemalloc else (0, 0)
+    if args.tracemalloc:
+        tracemalloc.stop()
+
+    outcomes = bot.tracer.outcomes()
+    summary = bot.tracer.summary()
+    handler_times.sort()
+    lags.sort()
+    dropped = sent - outcomes.get("spoken", 0)
+    results = {
+        "config": {k: v for k, v in vars(args).items() if k not in ("json", "compare")},
+        "events": sent,
+        "wall_seconds": round(wall, 3),
+        "events_per_sec": round(sent / wall, 1) if wall else 0.0,
+        "drained": drained,
+        "outcomes": outcomes,
+        "drop_rate": round(dropped / sent, 4) if sent else 0.0,
+        "memory_growth_kb": round((mem_after - mem_before) / 1024, 1),
+        "memory_peak_kb": round(mem_peak / 1024, 1),
+        "handler_ms": {f"p{p}": round(percentile(handler_times, p) * 1000, 3) for p in (50, 95, 99)},
+        "schedule_lag_ms": {f"p{p}": round(percentile(lags, p) * 1000, 3) for p in (50, 95, 99)},
+        "stages_ms": {name: {k: round(v, 3) for k, v in row.items()} for name, row in summary.items()},
+    }
+    bot.shutdown()
+    return results
+
+
+def format_results(results, baseline=None):
+    """Report lines, with deltas against a previous run when given"""
+    def delta(key, sub=None):
+        if not baseline:
+            return ""
+        old = baseline.get(key, {})
+        new = results.get(key, {})
+        if sub:
+            old, new = old.get(sub), new.get(sub)
+        if not isinstance(old, (int, float)) or not old:
+            return ""
+        return f"  ({(new - old) / old * 100:+.1f}% vs baseline)"
+
+    lines = [
+        "📊 Benchmark results",
+        f"events:          {results['events']} in {results['wall_seconds']}s"
+        + ("" if results["drained"] else "  ⚠️ speech not fully drained"),
+        f"throughput:      {results['events_per_sec']} events/sec{delta('events_per_sec')}",
+        f"drop rate:       {results['drop_rate'] * 100:.1f}%  {results['outcomes']}",
+        f"memory growth:   {results['memory_growth_kb']} KB (peak {results['memory_peak_kb']} KB)",
+        f"handler latency: p50 {results['handler_ms']['p50']}ms  p95 {results['handler_ms']['p95']}ms  "
+        f"p99 {results['handler_ms']['p99']}ms{delta('handler_ms', 'p99')}",
+        f"schedule lag:    p50 {results['schedule_lag_ms']['p50']}ms  p95 {results['schedule_lag_ms']['p95']}ms  "
+        f"p99 {results['schedule_lag_ms']['p99']}ms",
+    ]
+    for name, row in results["stages_ms"].items():
+        lines.append(f"  {name:<12} n={row['count']:<7} p50 {row['p50']:.2f}ms  p95 {row['p95']:.2f}ms  p99 {row['p99']:.2f}ms")
+    return lines
+
+
+def main():
+    """Benchmark entry point"""
+    parser = argparse.ArgumentParser(description='TikTok TTS Bot - Offline Benchmark')
+    parser.add_argument('--events', type=int, default=1000, help='Number of synthetic events')
+    parser.add_argument('--rate', type=float, default=100.0, help='Average events per second')
+    parser.add_argument('--shape', choices=BURST_SHAPES, default='steady', help='Traffic shape')
+    parser.add_argument('--burst-size', type=int, default=50, help='Events per burst (burst shape)')
+    parser.add_argument('--dup-ratio', type=float, default=0.1, help='Fraction of exact duplicate comments')
+    parser.add_argument('--emoji-density', type=float, default=0.2, help='Chance of emoji after each word')
+    parser.add_argument('--join-ratio', type=float, default=0.2, help='Fraction of events that are joins')
+    parser.add_argument('--command-ratio', type=float, default=0.05, help='Fraction of comments that are commands')
+    parser.add_argument('--users', type=int, default=200, help='Distinct synthetic viewers')
+    parser.add_argument('--seed', type=int, default=1, help='Random seed (same seed = same traffic)')
+    parser.add_argument('--tts-latency', type=float, default=0.0, help='Stand-in TTS latency in seconds')
+    parser.add_argument('--dispatch', choices=('scheduler', 'inline', 'thread'), default='scheduler',
+                        help='scheduler = the bot, inline = no queueing, thread = one thread per utterance')
+    parser.add_argument('--flood', action='store_true', help='Ignore arrival times and send as fast as possible')
+    parser.add_argument('--drain-timeout', type=float, default=60.0, help='Seconds to wait for speech to finish')
+    parser.add_argument('--no-tracemalloc', dest='tracemalloc', action='store_false',
+                        help='Skip heap tracking (lower overhead, no memory numbers)')
+    parser.add_argument('--json', metavar='FILE', help='Write results as JSON for later comparison')
+    parser.add_argument('--compare', metavar='FILE', help='Show deltas against a previous --json result')
+    args = parser.parse_args()
+
+    results = run_benchmark(args)
+    baseline = None
+    if args.compare and os.path.exists(args.compare):
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+    for line in format_results(results, baseline):
+        print(line)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"💾 Results written to {args.json}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
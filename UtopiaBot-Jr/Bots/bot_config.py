@@ -0,0 +1,509 @@
+"""
+Bot Config - declarative settings from config/bot.toml with live reload
+The file is parsed and validated into an immutable BotConfig; a watcher
+(watchdog, then Linux inotify, then mtime polling) re-reads it on change and
+hands the new object to listeners, which swap it in with a single assignment.
+An invalid edit is logged and the running config is kept.
+"""
+import os
+import sys
+import select
+import struct
+import threading
+from types import MappingProxyType
+
+from lazy_imports import module_available
+from speech_scheduler import DEFAULT_CLASSES
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    try:
+        import tomli as tomllib
+    except ImportError:
+        tomllib = None
+
+DEFAULT_CONFIG_PATH = "config/bot.toml"
+
+DEFAULT_VOICES = {
+    "� Google Home Male": "en-US-Studio-M",
+    "🏠 Google Home Female": "en-US-Studio-O",
+    "� Assistant Male": "en-US-Polyglot-1",
+    "👩 Assistant Female": "en-US-Neural2-F",
+    "� British Female": "en-GB-Neural2-A",
+    "� British Male": "en-GB-Neural2-B",
+    "🌟 Conversational Male": "en-US-Neural2-D",
+    "✨ Conversational Female": "en-US-Neural2-G",
+    "🎭 British Assistant": "en-GB-Neural2-A",
+    "🎩 British Home": "en-GB-Neural2-B",
+
+    # More US Voices
+    "👨 Natural Male": "en-US-Neural2-A",
+    "🎯 Professional Male": "en-US-Neural2-I",
+    "🌟 Warm Male": "en-US-Neural2-J",
+    "💫 Premium Female": "en-US-Neural2-H",
+    "🎭 Dramatic Female": "en-US-Neural2-C",
+
+    # British Accents
+    "🎩 Posh British Female": "en-GB-Neural2-C",
+    "👔 Professional British Male": "en-GB-Neural2-D",
+
+    # Australian Voices
+    "🇦🇺 Aussie Female": "en-AU-Neural2-A",
+    "🇦🇺 Aussie Male": "en-AU-Neural2-B",
+    "🏄 Casual Aussie Female": "en-AU-Neural2-C",
+    "🦘 Outback Aussie Male": "en-AU-Neural2-D",
+
+    # Indian English (Fixed Gender Issues)
+    "🇮🇳 Indian Female A": "en-IN-Neural2-A",
+    "🇮🇳 Indian Male B": "en-IN-Neural2-B",
+    "🇮🇳 Indian Voice C": "en-IN-Neural2-C",
+    "�🇳 Indian Voice D": "en-IN-Neural2-D"
+}
+
+DEFAULT_HELP_TEXT = ("🤖 Available commands: !joke (random joke), !yo-mama (yo mama joke), "
+                     "!help (show this message). Just type normal messages for TTS!")
+
+DEFAULTS = {
+    "paths": {
+        "audio_dir": "tts_audio",
+        "jokes_file": "jokes/random/random.txt",
+        "yo_mama_file": "jokes/yo_mama/yo_mama.txt",
+    },
+    "dedup": {
+        "reset_interval": 300,
+    },
+    "commands": {
+        "help_text": DEFAULT_HELP_TEXT,
+    },
+    "connection": {
+        "stable_after": 30,
+        "breaker_threshold": 6,
+        "breaker_open_for": 300,
+        "backoff": {
+            "dropped": [1, 15],
+            "network": [2, 60],
+            "rate_limited": [30, 300],
+            "blocked": [600, 1800],
+            "offline": [15, 120],
+            "unknown": [5, 120],
+        },
+    },
+    "budget": {
+        "max_message_chars": 200,
+        "per_minute": 3000,
+        "per_session": 0,
+        "fallback": "summarize",
+    },
+    "audio": {
+        "normalize": True,
+        "target_loudness": -20.0,
+        "max_gain_db": 12.0,
+        "rate_start_depth": 3,
+        "rate_step": 0.05,
+        "max_rate": 1.4,
+    },
+    "playback": {
+        "device": True,
+        "prefetch": 2,
+    },
+    "events": {
+        "window": 10,
+        "min_likes": 20,
+        "max_names": 3,
+        "gifts": True,
+        "likes": True,
+        "follows": True,
+        "shares": True,
+    },
+    "speech": {
+        "regular_weight": 2.0,
+        "classes": DEFAULT_CLASSES,
+    },
+    "filter": {
+        "enabled": True,
+        "action": "mask",
+        "replacement": "beep",
+        "word_files": ["config/blocked_words.txt"],
+        "words": [],
+        "substitutions": {},
+    },
+    "languages": {
+        "detect": True,
+        "default": "en",
+        "min_letters": 12,
+        "min_confidence": 0.2,
+        "settle_after": 3,
+        "overrides": {},
+    },
+    "voices": {
+        "default": "en-US-Studio-M",
+        "catalog_cache": "data/voices.json",
+        "catalog_ttl_hours": 168,
+        "options": DEFAULT_VOICES,
+    },
+}
+
+
+class ConfigError(ValueError):
+    """The config file is unreadable or fails validation"""
+
+
+def _number(value, where, minimum=0):
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or value < minimum:
+        raise ConfigError(f"{where} must be a number >= {minimum}")
+    return value
+
+
+def _text(value, where):
+    if not isinstance(value, str) or not value.strip():
+        raise ConfigError(f"{where} must be a non-empty string")
+    return value
+
+
+def _flag(value, where):
+    if not isinstance(value, bool):
+        raise ConfigError(f"{where} must be true or false")
+    return value
+
+
+def _merge(defaults, overrides, where=""):
+    """Defaults overlaid with the file's values; unknown keys are errors (typos fail loudly)"""
+    merged = dict(defaults)
+    for key, value in overrides.items():
+        path = f"{where}.{key}" if where else key
+        if key not in defaults:
+            raise ConfigError(f"unknown setting '{path}'")
+        if isinstance(defaults[key], dict) and key not in ("options", "backoff", "classes", "overrides", "substitutions"):
+            if not isinstance(value, dict):
+                raise ConfigError(f"'{path}' must be a table")
+            merged[key] = _merge(defaults[key], value, path)
+        else:
+            merged[key] = value
+    return merged
+
+
+class BotConfig:
+    """Validated, read-only settings - replaced as a whole, never mutated"""
+
+    def __init__(self, data=None, source=None):
+        data = _merge(DEFAULTS, data or {})
+        self.source = source
+        paths = data["paths"]
+        self.audio_dir = _text(paths["audio_dir"], "paths.audio_dir")
+        self.jokes_file = _text(paths["jokes_file"], "paths.jokes_file")
+        self.yo_mama_file = _text(paths["yo_mama_file"], "paths.yo_mama_file")
+        self.reset_interval = _number(data["dedup"]["reset_interval"], "dedup.reset_interval", 1)
+        self.help_text = _text(data["commands"]["help_text"], "commands.help_text")
+
+        connection = data["connection"]
+        self.stable_after = _number(connection["stable_after"], "connection.stable_after")
+        self.breaker_threshold = int(_number(connection["breaker_threshold"], "connection.breaker_threshold", 1))
+        self.breaker_open_for = _number(connection["breaker_open_for"], "connection.breaker_open_for", 1)
+        backoff = dict(DEFAULTS["connection"]["backoff"], **connection["backoff"])
+        policies = {}
+        for kind, bounds in backoff.items():
+            where = f"connection.backoff.{kind}"
+            if kind not in DEFAULTS["connection"]["backoff"]:
+                raise ConfigError(f"unknown error class '{where}'")
+            if not isinstance(bounds, (list, tuple)) or len(bounds) != 2:
+                raise ConfigError(f"{where} must be [base, max] seconds")
+            base, cap = (_number(v, where, 0.1) for v in bounds)
+            if cap < base:
+                raise ConfigError(f"{where}: max must be >= base")
+            policies[kind] = (base, cap)
+        self.backoff = MappingProxyType(policies)
+
+        budget = data["budget"]
+        self.max_message_chars = int(_number(budget["max_message_chars"], "budget.max_message_chars", 20))
+        self.chars_per_minute = int(_number(budget["per_minute"], "budget.per_minute"))
+        self.chars_per_session = int(_number(budget["per_session"], "budget.per_session"))
+        self.budget_fallback = _text(budget["fallback"], "budget.fallback")
+        if self.budget_fallback not in ("summarize", "skip"):
+            raise ConfigError("budget.fallback must be \"summarize\" or \"skip\"")
+
+        audio = data["audio"]
+        self.normalize_loudness = _flag(audio["normalize"], "audio.normalize")
+        self.target_loudness = audio["target_loudness"]
+        if isinstance(self.target_loudness, bool) or not isinstance(self.target_loudness, (int, float)) \
+                or not -60 <= self.target_loudness <= 0:
+            raise ConfigError("audio.target_loudness must be between -60 and 0 dBFS")
+        self.max_gain_db = _number(audio["max_gain_db"], "audio.max_gain_db")
+        self.rate_start_depth = int(_number(audio["rate_start_depth"], "audio.rate_start_depth"))
+        self.rate_step = _number(audio["rate_step"], "audio.rate_step")
+        self.max_rate = _number(audio["max_rate"], "audio.max_rate", 1)
+        if self.max_rate > 4:
+            raise ConfigError("audio.max_rate must be <= 4 (Google's limit)")
+
+        playback = data["playback"]
+        self.audio_device = _flag(playback["device"], "playback.device")
+        self.prefetch = int(_number(playback["prefetch"], "playback.prefetch", 1))
+
+        events = data["events"]
+        self.event_window = _number(events["window"], "events.window", 1)
+        self.min_likes = int(_number(events["min_likes"], "events.min_likes"))
+        self.max_names = int(_number(events["max_names"], "events.max_names", 1))
+        self.announce_events = tuple(kind for kind in ("gifts", "likes", "follows", "shares")
+                                     if _flag(events[kind], f"events.{kind}"))
+
+        speech = data["speech"]
+        self.regular_weight = _number(speech["regular_weight"], "speech.regular_weight", 0.1)
+        classes = {}
+        for name, settings in dict(DEFAULTS["speech"]["classes"], **speech["classes"]).items():
+            where = f"speech.classes.{name}"
+            if name not in DEFAULTS["speech"]["classes"]:
+                raise ConfigError(f"unknown speech class '{where}'")
+            if not isinstance(settings, dict) or set(settings) - {"target", "max_wait"}:
+                raise ConfigError(f"{where} must be a table with target and max_wait")
+            settings = dict(DEFAULTS["speech"]["classes"][name], **settings)
+            target = _number(settings["target"], f"{where}.target", 0.1)
+            max_wait = _number(settings["max_wait"], f"{where}.max_wait", 0.1)
+            if max_wait < target:
+                raise ConfigError(f"{where}: max_wait must be >= target")
+            classes[name] = MappingProxyType({"target": target, "max_wait": max_wait})
+        self.speech_classes = MappingProxyType(classes)
+
+        content = data["filter"]
+        self.filter_enabled = _flag(content["enabled"], "filter.enabled")
+        self.filter_action = _text(content["action"], "filter.action")
+        if self.filter_action not in ("mask", "substitute", "skip"):
+            raise ConfigError("filter.action must be \"mask\", \"substitute\" or \"skip\"")
+        self.filter_replacement = _text(content["replacement"], "filter.replacement")
+        for key in ("word_files", "words"):
+            if not isinstance(content[key], list):
+                raise ConfigError(f"filter.{key} must be a list of strings")
+            for i, entry in enumerate(content[key]):
+                _text(entry, f"filter.{key}[{i}]")
+        self.filter_files = tuple(content["word_files"])
+        self.filter_words = tuple(content["words"])
+        substitutions = content["substitutions"]
+        if not isinstance(substitutions, dict):
+            raise ConfigError("filter.substitutions must be a table of word = replacement")
+        for word, replacement in substitutions.items():
+            _text(replacement, f"filter.substitutions.{word}")
+        self.filter_substitutions = MappingProxyType(dict(substitutions))
+
+        languages = data["languages"]
+        self.detect_language = _flag(languages["detect"], "languages.detect")
+        self.default_language = _text(languages["default"], "languages.default")
+        self.language_min_letters = int(_number(languages["min_letters"], "languages.min_letters", 1))
+        self.language_min_confidence = _number(languages["min_confidence"], "languages.min_confidence")
+        if self.language_min_confidence > 1:
+            raise ConfigError("languages.min_confidence must be between 0 and 1")
+        self.language_settle_after = int(_number(languages["settle_after"], "languages.settle_after", 1))
+        overrides = languages["overrides"]
+        if not isinstance(overrides, dict):
+            raise ConfigError("languages.overrides must be a table of language = voice name")
+        for language, name in overrides.items():
+            _text(name, f"languages.overrides.{language}")
+        self.language_voices = MappingProxyType(dict(overrides))
+
+        voices = data["voices"]
+        options = voices["options"]
+        if not isinstance(options, dict) or not options:
+            raise ConfigError("voices.options must be a non-empty table of label = voice name")
+        for label, name in options.items():
+            _text(name, f"voices.options.'{label}'")
+        self.voice_options = MappingProxyType(dict(options))
+        self.default_voice = _text(voices["default"], "voices.default")
+        self.voice_catalog_cache = _text(voices["catalog_cache"], "voices.catalog_cache")
+        self.voice_catalog_ttl_hours = _number(voices["catalog_ttl_hours"], "voices.catalog_ttl_hours", 1)
+
+    def __setattr__(self, name, value):
+        if name in self.__dict__:
+            raise AttributeError("BotConfig is read-only - load a new one instead")
+        super().__setattr__(name, value)
+
+    def default_voice_label(self):
+        """Dropdown label for the default voice (first label if it isn't listed)"""
+        for label, name in self.voice_options.items():
+            if name == self.default_voice:
+                return label
+        return next(iter(self.voice_options))
+
+
+def load_config(path=DEFAULT_CONFIG_PATH):
+    """Parse and validate `path`; built-in defaults if the file doesn't exist"""
+    if not path or not os.path.exists(path):
+        return BotConfig()
+    if tomllib is None:
+        raise ConfigError("reading TOML needs Python 3.11+ or 'pip install tomli'")
+    try:
+        with open(path, "rb") as f:
+            data = tomllib.load(f)
+    except (OSError, tomllib.TOMLDecodeError) as e:
+        raise ConfigError(f"{path}: {e}")
+    return BotConfig(data, source=path)
+
+
+# File watchers - each calls `callback()` when the watched file may have changed
+class PollingWatcher(threading.Thread):
+    """Portable fallback: compare mtime/size every `interval` seconds"""
+
+    name_hint = "polling"
+
+    def __init__(self, path, callback, interval=2.0):
+        super().__init__(name="config-watch", daemon=True)
+        self.path = path
+        self.callback = callback
+        self.interval = interval
+        self.stopped = threading.Event()
+
+    def _stamp(self):
+        try:
+            stat = os.stat(self.path)
+            return stat.st_mtime_ns, stat.st_size
+        except OSError:
+            return None
+
+    def run(self):
+        last = self._stamp()
+        while not self.stopped.wait(self.interval):
+            stamp = self._stamp()
+            if stamp != last:
+                last = stamp
+                self.callback()
+
+    def stop(self):
+        self.stopped.set()
+
+
+class InotifyWatcher(threading.Thread):
+    """Linux inotify through ctypes - watches the directory so atomic saves (rename) are seen"""
+
+    name_hint = "inotify"
+    IN_MODIFY, IN_CLOSE_WRITE, IN_MOVED_TO, IN_CREATE = 0x2, 0x8, 0x80, 0x100
+    EVENT = struct.Struct("iIII")
+
+    def __init__(self, path, callback):
+        import ctypes
+        import ctypes.util
+        super().__init__(name="config-watch", daemon=True)
+        self.filename = os.path.basename(path).encode()
+        self.callback = callback
+        self.stopped = threading.Event()
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.fd = libc.inotify_init1(os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        directory = os.path.dirname(os.path.abspath(path)).encode()
+        mask = self.IN_CLOSE_WRITE | self.IN_MOVED_TO | self.IN_CREATE | self.IN_MODIFY
+        if libc.inotify_add_watch(self.fd, directory, mask) < 0:
+            os.close(self.fd)
+            raise OSError(ctypes.get_errno(), "inotify_add_watch failed")
+
+    def run(self):
+        try:
+            while not self.stopped.is_set():
+                ready, _, _ = select.select([self.fd], [], [], 1.0)
+                if not ready:
+                    continue
+                data = os.read(self.fd, 64 * 1024)
+                offset, changed = 0, False
+                while offset + self.EVENT.size <= len(data):
+                    _, _, _, length = self.EVENT.unpack_from(data, offset)
+                    name = data[offset + self.EVENT.size:offset + self.EVENT.size + length].rstrip(b"\0")
+                    changed = changed or name == self.filename
+                    offset += self.EVENT.size + length
+                if changed:
+                    self.callback()
+        finally:
+            os.close(self.fd)
+
+    def stop(self):
+        self.stopped.set()
+
+
+class WatchdogWatcher:
+    """Cross-platform native notifications through the optional watchdog package"""
+
+    name_hint = "watchdog"
+
+    def __init__(self, path, callback):
+        from watchdog.observers import Observer
+        from watchdog.events import FileSystemEventHandler
+        target = os.path.abspath(path)
+
+        class Handler(FileSystemEventHandler):
+            def on_any_event(self, event):
+                paths = (getattr(event, "src_path", None), getattr(event, "dest_path", None))
+                if any(p and os.path.abspath(p) == target for p in paths):
+                    callback()
+
+        self.observer = Observer()
+        self.observer.schedule(Handler(), os.path.dirname(target), recursive=False)
+
+    def start(self):
+        self.observer.daemon = True
+        self.observer.start()
+
+    def stop(self):
+        self.observer.stop()
+
+
+class ConfigWatcher:
+    """Reloads the config file on change and passes each valid version to the listeners"""
+
+    def __init__(self, path, config, log=None, debounce=0.25):
+        self.path = path
+        self.config = config
+        self.log = log or (lambda message, level="info": None)
+        self.debounce = debounce
+        self.listeners = []
+        self.backend = None
+        self._timer = None
+        self._lock = threading.Lock()
+
+    def add_listener(self, listener):
+        self.listeners.append(listener)
+
+    def start(self):
+        """Watch with the best backend available; returns its name"""
+        directory = os.path.dirname(os.path.abspath(self.path))
+        if not os.path.isdir(directory):
+            return None
+        candidates = []
+        if module_available("watchdog"):
+            candidates.append(WatchdogWatcher)
+        if sys.platform.startswith("linux"):
+            candidates.append(InotifyWatcher)
+        for backend in candidates:
+            try:
+                self.backend = backend(self.path, self._changed)
+                break
+            except Exception as e:
+                self.log(f"⚠️ Config watcher '{backend.name_hint}' unavailable: {e}", "warning")
+        if self.backend is None:
+            self.backend = PollingWatcher(self.path, self._changed)
+        self.backend.start()
+        return self.backend.name_hint
+
+    def _changed(self):
+        # Editors write in several steps - wait for the burst to settle
+        with self._lock:
+            if self._timer:
+                self._timer.cancel()
+            self._timer = threading.Timer(self.debounce, self.reload)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def reload(self):
+        try:
+            config = load_config(self.path)
+        except ConfigError as e:
+            self.log(f"❌ Config not applied - {e}", "error")
+            return None
+        self.config = config
+        for listener in self.listeners:
+            try:
+                listener(config)
+            except Exception as e:
+                self.log(f"❌ Applying config failed: {e}", "error")
+        self.log(f"⚙️ Config reloaded from {self.path}", "success")
+        return config
+
+    def stop(self):
+        if self._timer:
+            self._timer.cancel()
+        if self.backend:
+            self.backend.stop()
@@ -0,0 +1,156 @@
+"""
+Bot Services - the heavyweight pieces a bot needs that don't depend on the stream
+Config (with live reload), text normalizer, TTS router (one Google client), voice catalog,
+content filter, language detector, character budget, loudness normalizer, pipeline tracer,
+viewer history and chat transcript. A single bot builds its own; a multi-stream host
+builds one set and hands it to every stream.
+"""
+import os
+import threading
+
+from pipeline_tracing import PipelineTracer
+from tts_backends import GoogleTTSBackend, LocalTTSBackend, TTSRouter
+from text_normalizer import TextNormalizer
+from viewer_store import ViewerStore
+from membership_index import ViewerIndex
+from transcript import TranscriptWriter
+from joke_corpus import JokeCorpus
+from speech_budget import SpeechBudget
+from audio_processing import LoudnessNormalizer
+from voice_catalog import VoiceCatalog
+from language_detect import LanguageDetector
+from content_filter import ContentFilter
+from bot_config import BotConfig, ConfigError, ConfigWatcher, load_config, DEFAULT_CONFIG_PATH
+
+
+class BotServices:
+    """Stream-independent components, created once and closed once"""
+
+    def __init__(self, trace_path=None, tts_routes=None, failover_latency=2.5, failover_error_rate=0.3,
+                 viewer_db="data/viewers.db", transcript_dir="transcripts", log=None,
+                 config_path=DEFAULT_CONFIG_PATH, watch_config=True):
+        self.log = log or (lambda message, level="info": None)
+
+        # Declarative settings - swapped whole on reload, so readers never see half an update
+        try:
+            self.config = load_config(config_path)
+        except ConfigError as e:
+            self.log(f"❌ Config not loaded - using defaults ({e})", "error")
+            self.config = BotConfig()
+        self.config_watcher = None
+        if config_path and watch_config:
+            self.config_watcher = ConfigWatcher(config_path, self.config, log=self.log)
+            self.config_watcher.add_listener(self._swap_config)
+            backend = self.config_watcher.start()
+            if backend:
+                self.log(f"⚙️ Watching {config_path} for changes ({backend})", "info")
+
+        # Chat text normalization (emoji lookup built once in the background, LRU cached)
+        self.normalizer = TextNormalizer()
+        threading.Thread(target=self.normalizer.warm_up, daemon=True).start()
+
+        # Durable viewer history (first/last seen, join and message counts)
+        self.viewer_store = None
+        if viewer_db:
+            try:
+                self.viewer_store = ViewerStore(viewer_db, log=self.log)
+            except Exception as e:
+                self.log(f"⚠️ Viewer database unavailable ({e}) - history won't be saved", "warning")
+
+        # Returning-viewer index (Bloom filter with an on-disk snapshot next to the database)
+        self.viewer_index = None
+        if self.viewer_store:
+            try:
+                snapshot_path = os.path.splitext(viewer_db)[0] + ".bloom"
+                self.viewer_index = ViewerIndex(self.viewer_store, snapshot_path, log=self.log)
+            except Exception as e:
+                self.log(f"⚠️ Returning-viewer index unavailable: {e}", "warning")
+
+        # Pipeline tracing (JSONL sink is optional)
+        self.tracer = PipelineTracer(sink_path=trace_path)
+
+        # Append-only chat transcript (one file per session, written in the background)
+        self.transcript = None
+        if transcript_dir:
+            try:
+                self.transcript = TranscriptWriter(transcript_dir, log=self.log)
+            except OSError as e:
+                self.log(f"⚠️ Transcript unavailable ({e}) - chat won't be logged to disk", "warning")
+
+        # TTS backends - routed per message class, local engine as failover
+        google = GoogleTTSBackend()
+        self.tts_router = TTSRouter([google, LocalTTSBackend()],
+                                    routes=tts_routes,
+                                    latency_threshold=failover_latency,
+                                    error_rate_threshold=failover_error_rate,
+                                    log=self.log)
+        self.log(f"🔊 TTS backends: {self.tts_router.status()}", "info")
+
+        # All Google voices - read from the disk cache or fetched once, in the background
+        self.voice_catalog = VoiceCatalog(google.list_voices, self.config.voice_catalog_cache,
+                                          ttl=self.config.voice_catalog_ttl_hours * 3600, log=self.log)
+        google.catalog = self.voice_catalog
+        threading.Thread(target=self.voice_catalog.load, daemon=True).start()
+
+        # Blocked-word filter - one automaton for every stream, rebuilt when the lists change
+        self.content_filter = ContentFilter(self.config.filter_words, self.config.filter_files,
+                                            self.config.filter_substitutions, self.config.filter_action,
+                                            self.config.filter_replacement, self.config.filter_enabled, log=self.log)
+
+        # Chat language detection - viewers' languages are remembered across streams
+        self.language_detector = LanguageDetector(default=self.config.default_language,
+                                                  min_letters=self.config.language_min_letters,
+                                                  min_confidence=self.config.language_min_confidence,
+                                                  settle_after=self.config.language_settle_after)
+
+        # Synthesized-character budget - one per TTS account, so shared by every stream
+        self.budget = SpeechBudget(self.config.max_message_chars, self.config.chars_per_minute,
+                                   self.config.chars_per_session, self.config.budget_fallback)
+
+        # Per-voice loudness gains - learned once, used by every stream
+        self.loudness = LoudnessNormalizer(self.config.target_loudness, self.config.max_gain_db,
+                                           enabled=self.config.normalize_loudness)
+
+        # Joke files, memory-mapped once and shared by every stream
+        self.joke_corpora = {}
+
+    def _swap_config(self, config):
+        self.config = config
+        self.budget.configure(config.max_message_chars, config.chars_per_minute,
+                              config.chars_per_session, config.budget_fallback)
+        self.loudness.configure(config.target_loudness, config.max_gain_db, config.normalize_loudness)
+        self.content_filter.configure(config.filter_words, config.filter_files, config.filter_substitutions,
+                                      config.filter_action, config.filter_replacement, config.filter_enabled)
+        self.language_detector.configure(default=config.default_language,
+                                         min_letters=config.language_min_letters,
+                                         min_confidence=config.language_min_confidence,
+                                         settle_after=config.language_settle_after)
+
+    def add_config_listener(self, listener):
+        """Call `listener(config)` after each successful reload"""
+        if self.config_watcher:
+            self.config_watcher.add_listener(listener)
+
+    def corpus(self, path):
+        """Shared JokeCorpus for a joke file"""
+        corpus = self.joke_corpora.get(path)
+        if corpus is None:
+            corpus = self.joke_corpora.setdefault(path, JokeCorpus(path))
+        return corpus
+
+    def close(self):
+        """Flush and close everything that writes to disk"""
+        if self.config_watcher:
+            self.config_watcher.stop()
+        if self.transcript:
+            self.transcript.close()
+        if self.viewer_index:
+            try:
+                self.viewer_index.save()
+            except OSError as e:
+                self.log(f"⚠️ Could not save viewer index snapshot: {e}", "warning")
+        if self.viewer_store:
+            self.viewer_store.close()
+        self.tracer.close()
+        for corpus in self.joke_corpora.values():
+            corpus.close()
@@ -0,0 +1,268 @@
+"""
+Connection Supervisor - keeps the TikTok Live connection up
+One retry loop for GUI and CLI: errors are classified, waits use decorrelated
+jitter per error class, a circuit breaker backs off hard when TikTok keeps
+refusing, and a connection that was up for a while reconnects within seconds.
+Bot state (dedup, speech in flight, stats) lives on the bot, so it survives.
+"""
+import time
+import random
+import asyncio
+
+# error class -> (base delay, max delay) in seconds
+BACKOFF_POLICIES = {
+    "dropped": (1, 15),          # connection was up and went away - come back fast
+    "network": (2, 60),
+    "rate_limited": (30, 300),
+    "blocked": (600, 1800),
+    "offline": (15, 120),        # not live yet - poll slowly until the stream starts
+    "unknown": (5, 120),
+}
+FATAL_ERRORS = ("not_found",)
+
+
+def classify_error(error):
+    """Map a TikTokLive / network exception onto a retry policy name"""
+    name = type(error).__name__.lower()
+    message = str(error).lower()
+    if "notfound" in name or "user not found" in message:
+        return "not_found"
+    if "offline" in name or "not capable of going live" in message or "not live" in message:
+        return "offline"
+    if "ratelimit" in name or "rate limit" in message or "no message provided" in message or "429" in message:
+        return "rate_limited"
+    if "blocked" in name or "blocked" in message:
+        return "blocked"
+    if isinstance(error, (ConnectionError, TimeoutError, asyncio.TimeoutError, OSError)) or \
+            any(word in message for word in ("timed out", "timeout", "connection", "network", "dns")):
+        return "network"
+    return "unknown"
+
+
+class DecorrelatedJitter:
+    """sleep = min(cap, random(base, previous sleep * 3))"""
+
+    def __init__(self, base, cap, rng=None):
+        self.base = base
+        self.cap = cap
+        self.rng = rng or random.Random()
+        self.sleep = base
+
+    def next_delay(self):
+        self.sleep = min(self.cap, self.rng.uniform(self.base, self.sleep * 3))
+        return self.sleep
+
+    def reset(self):
+        self.sleep = self.base
+
+
+class CircuitBreaker:
+    """Opens after `threshold` consecutive failures; one trial attempt after `open_for` seconds"""
+
+    def __init__(self, threshold=6, open_for=300, max_open_for=1800):
+        self.threshold = threshold
+        self.base_open_for = open_for
+        self.open_for = open_for
+        self.max_open_for = max_open_for
+        self.failures = 0
+        self.opened_at = None
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return "closed"
+        return "half-open" if self.remaining() <= 0 else "open"
+
+    def remaining(self):
+        if self.opened_at is None:
+            return 0.0
+        return max(0.0, self.opened_at + self.open_for - time.monotonic())
+
+    def record_failure(self):
+        """Count a failure; returns True if this opened (or re-opened) the breaker"""
+        self.failures += 1
+        if self.opened_at is not None:
+            # The half-open trial failed - stay open for longer
+            self.open_for = min(self.max_open_for, self.open_for * 2)
+            self.opened_at = time.monotonic()
+            return True
+        if self.failures >= self.threshold:
+            self.opened_at = time.monotonic()
+            return True
+        return False
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+        self.open_for = self.base_open_for
+
+
+class ConnectionSupervisor:
+    """Runs `connect()` until the bot stops, reconnecting with classified backoff"""
+
+    def __init__(self, connect, is_running, is_offline=None, log=None, on_state=None,
+                 stable_after=30, breaker=None, rng=None, policies=None, disconnect=None):
+        self.connect = connect
+        self.disconnect = disconnect
+        self.is_running = is_running
+        self.is_offline = is_offline or (lambda: False)
+        self.log = log or (lambda message, level="info": None)
+        self.on_state = on_state or (lambda state, detail=None: None)
+        self.stable_after = stable_after
+        self.breaker = breaker or CircuitBreaker()
+        self.rng = rng or random.Random()
+        self.policies = dict(policies or BACKOFF_POLICIES)
+        self.backoff = {}
+        self.attempts = 0
+        self.reconnects = 0
+        self.last_error = None
+        self._connected_at = None
+        self._reset_requested = False
+        self._cancel_requested = False
+        self._loop = None
+        self._task = None
+
+    def mark_connected(self):
+        """Called from the ConnectEvent handler"""
+        if self._connected_at is None:
+            self._connected_at = time.monotonic()
+        self.on_state("connected")
+
+    def reset(self):
+        """Forget backoff and close the breaker (manual 'reset rate limit')"""
+        self.backoff.clear()
+        self.breaker.record_success()
+        self._reset_requested = True
+
+    def configure(self, policies=None, stable_after=None, breaker_threshold=None, breaker_open_for=None):
+        """Retune on the fly (config reload) - the live connection is left alone"""
+        if policies is not None:
+            self.policies = dict(policies)
+            self.backoff = {}
+        if stable_after is not None:
+            self.stable_after = stable_after
+        if breaker_threshold is not None:
+            self.breaker.threshold = breaker_threshold
+        if breaker_open_for is not None:
+            self.breaker.base_open_for = breaker_open_for
+            if self.breaker.opened_at is None:
+                self.breaker.open_for = breaker_open_for
+
+    def stop(self):
+        """Disconnect and cancel the current connection attempt from any thread"""
+        if self._loop and self._task and not self._loop.is_closed():
+            self._cancel_requested = True
+            self._loop.call_soon_threadsafe(lambda: self._loop.create_task(self._close(self._task)))
+
+    async def _close(self, task):
+        """Close the live connection, then cancel the attempt if it is still running"""
+        try:
+            if self.disconnect:
+                await asyncio.wait_for(self.disconnect(), timeout=5)
+        except Exception as e:
+            self.log(f"⚠️ Disconnect failed: {e}", "warning")
+        finally:
+            task.cancel()
+
+    def status(self):
+        return {"attempts": self.attempts, "reconnects": self.reconnects,
+                "breaker": self.breaker.state, "last_error": self.last_error}
+
+    def _delay_for(self, kind):
+        jitter = self.backoff.get(kind)
+        if jitter is None:
+            base, cap = self.policies.get(kind, self.policies.get("unknown", BACKOFF_POLICIES["unknown"]))
+            jitter = self.backoff[kind] = DecorrelatedJitter(base, cap, self.rng)
+        return jitter.next_delay()
+
+    async def _wait(self, seconds, state):
+        """Sleep in short ticks so stop/reset take effect immediately"""
+        deadline = time.monotonic() + seconds
+        last_shown = None
+        while self.is_running() and not self._reset_requested:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            if last_shown is None or last_shown - remaining >= 1:
+                last_shown = remaining
+                self.on_state(state, int(remaining + 0.999))
+            await asyncio.sleep(min(0.5, remaining))
+        self._reset_requested = False
+
+    async def run(self):
+        self._loop = asyncio.get_running_loop()
+        self._cancel_requested = False
+        while self.is_running():
+            if self.breaker.state == "open":
+                remaining = self.breaker.remaining()
+                self.log(f"🧯 Too many failed connections - pausing {remaining:.0f}s before trying again", "warning")
+                await self._wait(remaining, "circuit-open")
+                continue
+
+            self.attempts += 1
+            self._connected_at = None
+            self.on_state("connecting")
+            kind = None
+            try:
+                self._task = asyncio.ensure_future(self.connect())
+                await self._task
+            except asyncio.CancelledError:
+                # Only our own stop() or the client cancelling its connection is ours to handle;
+                # anything else (Ctrl+C under asyncio.run, a host shutting down) must propagate
+                current = asyncio.current_task()
+                outer = current.cancelling() if hasattr(current, "cancelling") else not self._cancel_requested
+                if self._cancel_requested and not outer:
+                    self._cancel_requested = False
+                    if not self.is_running():
+                        break
+                elif outer or not self._task.cancelled():
+                    raise
+                kind = "dropped"
+            except Exception as e:
+                kind = classify_error(e)
+                self.last_error = f"{kind}: {e}"
+                self._log_error(kind, e)
+            finally:
+                self._task = None
+            if not self.is_running():
+                break
+
+            stable = self._connected_at is not None and time.monotonic() - self._connected_at >= self.stable_after
+            if kind is None:
+                kind = "dropped"
+                self.log("📴 Disconnected from TikTok Live", "warning")
+            if kind in FATAL_ERRORS:
+                self.on_state("failed", kind)
+                return
+            if stable:
+                # It was working - treat this as a blip, not a pattern
+                self.backoff.clear()
+                self.breaker.record_success()
+            elif self.breaker.record_failure():
+                self.log(f"🧯 Circuit breaker open after {self.breaker.failures} failed attempts", "warning")
+                continue
+            if kind in ("network", "unknown", "dropped") and self.is_offline():
+                kind = "offline"
+
+            delay = self._delay_for(kind)
+            self.reconnects += 1
+            self.log(f"🔄 Reconnecting in {delay:.1f}s ({kind}, attempt {self.attempts + 1})", "info")
+            await self._wait(delay, "retrying")
+        self.on_state("stopped")
+
+    def _log_error(self, kind, error):
+        if kind == "not_found":
+            self.log(f"❌ Connection Error: user cannot go live or doesn't exist ({error})", "error")
+            self.log("💡 Make sure the username is correct and the user can broadcast live", "warning")
+        elif kind == "offline":
+            self.log("🔴 Stream is not live yet - will keep checking", "warning")
+        elif kind == "rate_limited":
+            self.log("❌ Connection Error: TikTok Live API issue (Rate Limited)", "error")
+            self.log("🔄 This is normal - TikTok limits API requests to prevent spam", "info")
+        elif kind == "blocked":
+            self.log("❌ Connection Error: Blocked by TikTok", "error")
+            self.log("💡 You may be temporarily blocked. Try using a VPN or waiting 10-15 minutes", "warning")
+        elif kind == "network":
+            self.log(f"🌐 Network error: {error}", "warning")
+        else:
+            self.log(f"❌ Connection Error: {error}", "error")
@@ -0,0 +1,248 @@
+"""
+Content Filter - blocked words caught before chat reaches the speaker
+The word lists are compiled once into an Aho-Corasick automaton, so checking a
+message is one pass over its characters however many rules there are. Text is
+folded first (case, accents, leetspeak like 'h3ll0', repeated letters like
+'heeeey' or 'asssss') so the usual disguises still match, and matches are
+mapped back to the original text for masking or substitution. Word files are re-read when
+they change; config reloads swap in a new automaton without touching the bot.
+"""
+import os
+import re
+import time
+import threading
+import unicodedata
+from collections import Counter, deque
+from functools import lru_cache
+
+ACTIONS = ("mask", "substitute", "skip")
+LEET_DIGITS = str.maketrans({"0": "o", "1": "i", "3": "e", "4": "a", "5": "s", "7": "t", "8": "b", "9": "g"})
+# Symbols only stand for letters inside a word ('sh!t'), not as punctuation ('no!')
+LEET_SYMBOLS = {"@": "a", "$": "s", "!": "i", "|": "l", "+": "t"}
+TOKEN = re.compile(r"\S+")
+
+
+@lru_cache(maxsize=4096)
+def _fold_char(char):
+    return unicodedata.normalize("NFKD", char)[:1].lower() or char
+
+
+def decode(text):
+    """One character per character of `text`: lower-case, accents stripped, leetspeak decoded.
+    Digits only count as letters in a token that also has letters ('a55', not '455')"""
+    bases = [_fold_char(char) for char in text]
+    for token in TOKEN.finditer(text):
+        start, end = token.span()
+        if not any(char.isalpha() for char in bases[start:end]):
+            continue
+        for i in range(start, end):
+            if bases[i].isdigit():
+                bases[i] = bases[i].translate(LEET_DIGITS)
+            elif bases[i] in LEET_SYMBOLS and i + 1 < end and text[i + 1].isalnum():
+                bases[i] = LEET_SYMBOLS[bases[i]]
+    return bases
+
+
+def fold(text):
+    """(folded text, origin) - decoded, every run of a repeated character collapsed to one;
+    origin[i] is the (start, end) of folded character i in `text`, so end - start is the run length"""
+    bases = decode(text)
+    chars, origin = [], []
+    start = 0
+    while start < len(bases):
+        end = start + 1
+        while end < len(bases) and bases[end] == bases[start]:
+            end += 1
+        chars.append(bases[start])
+        origin.append((start, end))
+        start = end
+    return "".join(chars), origin
+
+
+def parse_rule(line):
+    """'word', 'word*' (any ending) or 'word = replacement' -> (pattern, prefix, replacement) or None"""
+    line = line.split("#", 1)[0].strip()
+    if not line:
+        return None
+    pattern, _, replacement = line.partition("=")
+    pattern = pattern.strip()
+    prefix = pattern.endswith("*")
+    pattern = "".join(decode(pattern.rstrip("*").strip()))
+    return (pattern, prefix, replacement.strip() or None) if pattern else None
+
+
+class Automaton:
+    """Aho-Corasick over folded (run-collapsed) patterns; matches() is linear in the text plus the hits"""
+
+    def __init__(self, patterns):
+        self.patterns = list(patterns)
+        self.goto = [{}]
+        self.fail = [0]
+        self.out = [()]
+        for index, pattern in enumerate(self.patterns):
+            state = 0
+            for char in pattern:
+                nxt = self.goto[state].get(char)
+                if nxt is None:
+                    nxt = self.goto[state][char] = len(self.goto)
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.out.append(())
+                state = nxt
+            self.out[state] += (index,)
+        # Breadth-first fail links; each state inherits the outputs of its fail state
+        pending = deque(self.goto[0].values())
+        while pending:
+            state = pending.popleft()
+            for char, nxt in self.goto[state].items():
+                pending.append(nxt)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                target = self.goto[fallback].get(char, 0)
+                self.fail[nxt] = target if target != nxt else 0
+                self.out[nxt] += self.out[self.fail[nxt]]
+
+    def matches(self, text):
+        """(start, end, pattern index) for every occurrence, overlapping ones included"""
+        goto, fail, out = self.goto, self.fail, self.out
+        state = 0
+        for i, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for index in out[state]:
+                yield i + 1 - len(self.patterns[index]), i + 1, index
+
+
+class ContentFilter:
+    """check(text) -> text to speak (masked/substituted) or None when the action is skip"""
+
+    def __init__(self, words=(), files=(), substitutions=None, action="mask", replacement="beep",
+                 enabled=True, recheck_files=2.0, log=None):
+        self.log = log or (lambda message, level="info": None)
+        self.recheck_files = recheck_files
+        self.hits = Counter()  # rule -> matches since start
+        self.checked = 0
+        self.flagged = 0
+        self.skipped = 0
+        self._lock = threading.Lock()
+        self._automaton = None
+        self.configure(words, files, substitutions, action, replacement, enabled)
+
+    def configure(self, words=(), files=(), substitutions=None, action="mask", replacement="beep", enabled=True):
+        """Set the rules (config reload) and rebuild the automaton"""
+        self.words = tuple(words)
+        self.files = tuple(files)
+        self.substitutions = dict(substitutions or {})
+        self.action = action
+        self.replacement = replacement
+        self.enabled = enabled
+        self.rebuild()
+
+    def _file_stamps(self):
+        stamps = {}
+        for path in self.files:
+            try:
+                stat = os.stat(path)
+                stamps[path] = (stat.st_mtime_ns, stat.st_size)
+            except OSError:
+                stamps[path] = None
+        return stamps
+
+    def rebuild(self):
+        """Read the word files and compile every rule into a new automaton (swapped in whole)"""
+        stamps = self._file_stamps()
+        lines = list(self.words)
+        for path, stamp in stamps.items():
+            if stamp is None:
+                self.log(f"⚠️ Word list not found: {path}", "warning")
+                continue
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    lines.extend(f)
+            except OSError as e:
+                self.log(f"⚠️ Could not read word list {path}: {e}", "warning")
+        lines.extend(f"{word} = {replacement}" for word, replacement in self.substitutions.items())
+        rules = {}
+        for line in lines:
+            rule = parse_rule(line)
+            if rule:
+                rules[rule[:2]] = rule  # later lines (e.g. substitutions) win
+        rules = list(rules.values())
+        # 'ass' is searched as 'as' with a minimum run of two s's, so 'asssss' matches and 'as' doesn't
+        folded = [fold(pattern) for pattern, _, _ in rules]
+        automaton = Automaton(key for key, _ in folded)
+        runs = [[end - start for start, end in origin] for _, origin in folded]
+        with self._lock:
+            self._rules, self._automaton, self._runs, self._stamps = rules, automaton, runs, stamps
+            self._checked_files = time.monotonic()
+        return len(rules)
+
+    def _maybe_reload_files(self):
+        if not self.files or time.monotonic() - self._checked_files < self.recheck_files:
+            return
+        self._checked_files = time.monotonic()
+        if self._file_stamps() != self._stamps:
+            count = self.rebuild()
+            self.log(f"🧹 Word lists reloaded ({count} rules)", "info")
+
+    def find(self, text):
+        """Non-overlapping whole-word hits as (start, end, rule) spans of the original text"""
+        self._maybe_reload_files()
+        rules, automaton, runs = self._rules, self._automaton, self._runs
+        if not rules:
+            return []
+        folded, origin = fold(text)
+        found = []
+        for start, end, index in automaton.matches(folded):
+            if any(origin[start + k][1] - origin[start + k][0] < run for k, run in enumerate(runs[index])):
+                continue
+            prefix = rules[index][1]
+            if start > 0 and folded[start - 1].isalnum():
+                continue
+            if prefix:
+                while end < len(folded) and folded[end].isalnum():
+                    end += 1
+            elif end < len(folded) and folded[end].isalnum():
+                continue
+            found.append((start, end, index))
+        # Leftmost, then longest, never overlapping
+        found.sort(key=lambda hit: (hit[0], hit[0] - hit[1]))
+        spans, last_end = [], 0
+        for start, end, index in found:
+            if start >= last_end:
+                spans.append((origin[start][0], origin[end - 1][1], rules[index]))
+                last_end = end
+        return spans
+
+    def check(self, text):
+        """Filtered text, the unchanged text if clean, or None if the message should be skipped"""
+        if not self.enabled:
+            return text
+        self.checked += 1
+        spans = self.find(text)
+        if not spans:
+            return text
+        self.flagged += 1
+        with self._lock:
+            for _, _, rule in spans:
+                self.hits[rule[0] + ("*" if rule[1] else "")] += 1
+        if self.action == "skip":
+            self.skipped += 1
+            return None
+        pieces, position = [], 0
+        for start, end, (_, _, replacement) in spans:
+            pieces.append(text[position:start])
+            if self.action == "substitute" or replacement:
+                pieces.append(replacement or self.replacement)
+            else:
+                pieces.append(text[start] + "*" * (end - start - 1))
+            position = end
+        pieces.append(text[position:])
+        return "".join(pieces)
+
+    def stats(self, top=10):
+        with self._lock:
+            return {"checked": self.checked, "flagged": self.flagged, "skipped": self.skipped,
+                    "rules": len(self._rules), "hits": dict(self.hits.most_common(top))}
@@ -0,0 +1,222 @@
+"""
+Control API - local HTTP/JSON control of a running bot
+Served from the bot's own asyncio loop, so a headless (--daemon) bot needs no
+Tk at all. Everything the GUI buttons do is an endpoint:
+
+    GET  /stats                      counters, connection and TTS status
+    POST /start | /stop              start or stop listening to the stream
+    POST /test-tts                   speak a test message
+    POST /skip                       cut the current line short ({"clear": true} drops queued lines too)
+    POST /reset-rate-limit           forget reconnect backoff
+    GET  /voice   POST /voice        current voice / {"voice": "en-US-Studio-M"}
+    GET  /voices?language=de-DE      voice catalog (also gender=, tier=)
+    POST /export                     {"format": "csv", "compression": "gzip"}
+    GET  /events?kinds=log,join      newline-delimited JSON event stream (stats as deltas)
+"""
+import json
+import asyncio
+from urllib.parse import urlsplit, parse_qs
+
+MAX_BODY = 64 * 1024
+REASONS = {200: "OK", 202: "Accepted", 400: "Bad Request", 401: "Unauthorized",
+           404: "Not Found", 405: "Method Not Allowed", 409: "Conflict", 413: "Payload Too Large",
+           500: "Internal Server Error"}
+
+
+class ApiError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class ControlServer:
+    """Minimal HTTP/1.1 server in front of a TikTokTTSBot"""
+
+    def __init__(self, bot, host="127.0.0.1", port=8765, token=None, stats_interval=1.0):
+        self.bot = bot
+        self.host = host
+        self.port = port
+        self.token = token
+        self.stats_interval = stats_interval
+        self.server = None
+        self.routes = {
+            ("GET", "/stats"): self.get_stats,
+            ("POST", "/start"): self.post_start,
+            ("POST", "/stop"): self.post_stop,
+            ("POST", "/test-tts"): self.post_test_tts,
+            ("POST", "/skip"): self.post_skip,
+            ("POST", "/reset-rate-limit"): self.post_reset_rate_limit,
+            ("GET", "/voice"): self.get_voice,
+            ("POST", "/voice"): self.post_voice,
+            ("GET", "/voices"): self.get_voices,
+            ("POST", "/export"): self.post_export,
+        }
+
+    async def start(self):
+        self.server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        self.bot.events.attach(asyncio.get_running_loop())
+        self.bot.log(f"🛰️ Control API listening on http://{self.host}:{self.port}", "info")
+
+    async def close(self):
+        if self.server:
+            self.server.close()
+            await self.server.wait_closed()
+
+    # HTTP plumbing
+    async def _handle(self, reader, writer):
+        try:
+            method, path, query, headers, body = await self._read_request(reader)
+            if self.token and headers.get("authorization") != f"Bearer {self.token}":
+                raise ApiError(401, "missing or wrong bearer token")
+            if method == "GET" and path == "/events":
+                await self._stream_events(writer, query)
+                return
+            handler = self.routes.get((method, path))
+            if handler is None:
+                known = any(route_path == path for _, route_path in self.routes)
+                raise ApiError(405 if known else 404, f"{method} {path} not supported")
+            result = handler(query if method == "GET" else body)
+            status, payload = await result if asyncio.iscoroutine(result) else result
+            await self._respond(writer, status, payload)
+        except ApiError as e:
+            await self._respond(writer, e.status, {"error": str(e)})
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except Exception as e:
+            # Details go to the log, not to the client
+            self.bot.log(f"❌ Control API error: {type(e).__name__}: {e}", "error")
+            await self._respond(writer, 500, {"error": "internal error"})
+        finally:
+            writer.close()
+
+    async def _read_request(self, reader):
+        request_line = (await reader.readline()).decode("latin-1").strip()
+        try:
+            method, target, _ = request_line.split(" ", 2)
+        except ValueError:
+            raise ApiError(400, "malformed request line")
+        headers = {}
+        while True:
+            line = (await reader.readline()).decode("latin-1")
+            if line in ("\r\n", "\n", ""):
+                break
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+        try:
+            length = int(headers.get("content-length") or 0)
+        except ValueError:
+            raise ApiError(400, "bad Content-Length")
+        if length > MAX_BODY:
+            raise ApiError(413, "request body too large")
+        body = {}
+        if length:
+            try:
+                body = json.loads(await reader.readexactly(length))
+            except ValueError:
+                raise ApiError(400, "body must be JSON")
+        url = urlsplit(target)
+        return method.upper(), url.path.rstrip("/") or "/", parse_qs(url.query), headers, body
+
+    async def _respond(self, writer, status, payload):
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        head = (f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+                "Content-Type: application/json\r\n"
+                f"Content-Length: {len(data)}\r\n"
+                "Connection: close\r\n\r\n")
+        try:
+            writer.write(head.encode("latin-1") + data)
+            await writer.drain()
+        except ConnectionError:
+            pass
+
+    async def _stream_events(self, writer, query):
+        """NDJSON until the client goes away; changed stats fields at most every stats_interval"""
+        kinds = ",".join(query.get("kinds", [])).split(",") if query.get("kinds") else None
+        subscription = self.bot.events.subscribe(kinds=[k for k in kinds or [] if k] or None)
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/x-ndjson\r\n"
+                     b"Cache-Control: no-cache\r\nConnection: close\r\n\r\n")
+        loop = asyncio.get_running_loop()
+        want_stats = subscription.kinds is None or "stats" in subscription.kinds
+        next_stats = 0.0
+        last_stats = {}
+        try:
+            while True:
+                batch = await subscription.next_batch(timeout=self.stats_interval)
+                if want_stats and loop.time() >= next_stats:
+                    # Only the fields that changed since the last stats line
+                    next_stats = loop.time() + self.stats_interval
+                    snapshot = self.bot.stats_snapshot()
+                    delta = {key: value for key, value in snapshot.items() if last_stats.get(key) != value}
+                    last_stats = snapshot
+                    if delta:
+                        batch.append({"kind": "stats", **delta})
+                if subscription.dropped:
+                    batch.append({"kind": "dropped", "count": subscription.dropped})
+                    subscription.dropped = 0
+                # An empty line is a heartbeat - it also notices clients that went away
+                writer.write(b"".join(json.dumps(event, ensure_ascii=False).encode("utf-8") + b"\n"
+                                      for event in batch) or b"\n")
+                await writer.drain()
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            subscription.close()
+
+    # Endpoints - each returns (status, payload)
+    def get_stats(self, body):
+        return 200, self.bot.stats_snapshot()
+
+    def post_start(self, body):
+        if self.bot.bot_running:
+            raise ApiError(409, "bot is already running")
+        self.bot.start_bot()
+        return 202, {"running": True}
+
+    def post_stop(self, body):
+        if not self.bot.bot_running:
+            raise ApiError(409, "bot is not running")
+        self.bot.stop_bot()
+        return 200, {"running": False}
+
+    def post_test_tts(self, body):
+        self.bot.test_tts()
+        return 202, {"voice": self.bot.current_voice_name()}
+
+    def post_skip(self, body):
+        self.bot.skip_speech(clear=bool(isinstance(body, dict) and body.get("clear")))
+        return 200, {"playback": self.bot.player.status()}
+
+    def post_reset_rate_limit(self, body):
+        self.bot.reset_rate_limit()
+        return 200, {"supervisor": self.bot.supervisor.status()}
+
+    def get_voice(self, body):
+        return 200, {"voice": self.bot.current_voice_name()}
+
+    def get_voices(self, query):
+        catalog = self.bot.voice_catalog
+        if not catalog.loaded:
+            raise ApiError(409, "voice catalog not loaded (no Google credentials or cache yet)")
+        first = {key: (query.get(key) or [None])[0] for key in ("language", "gender", "tier")}
+        voices = catalog.voices(**first)
+        return 200, {"count": len(voices), "voices": [voice.as_dict() for voice in voices]}
+
+    def post_voice(self, body):
+        voice = body.get("voice") if isinstance(body, dict) else None
+        if not voice or not isinstance(voice, str):
+            raise ApiError(400, 'expected {"voice": "<google voice name>"}')
+        if self.bot.voice_catalog.loaded and self.bot.voice_catalog.get(voice) is None:
+            raise ApiError(404, f"unknown voice '{voice}'")
+        self.bot.set_voice(voice)
+        return 200, {"voice": self.bot.current_voice_name()}
+
+    async def post_export(self, body):
+        body = body if isinstance(body, dict) else {}
+        # Starting an export touches the viewer database - keep it off the event loop
+        job = await asyncio.get_running_loop().run_in_executor(
+            None, lambda: self.bot.export_users_list(body.get("format") or "csv", body.get("compression") or "none",
+                                                     directory=body.get("directory") or "exports"))
+        if job is None:
+            raise ApiError(409, "export not started (nothing to export or one already running)")
+        return 202, {"exporting": True}
@@ -0,0 +1,179 @@
+"""
+Event Aggregator - gifts, likes, follows and shares as periodic summaries
+Likes and gift combos arrive dozens of times a second in a busy stream, so
+instead of one utterance per event they are folded into a window and read
+out once per window: "Alice sent 5 Roses. 120 likes in the last 10 seconds!"
+Gift combo streaks are counted once, when the streak ends.
+"""
+import time
+import threading
+
+
+def gift_details(evt):
+    """(gift name, count, diamonds each, streak finished) for a TikTokLive GiftEvent"""
+    gift = getattr(evt, "gift", None)
+    info = getattr(gift, "info", None)  # TikTokLive 5.x keeps the name under gift.info
+    name = getattr(gift, "name", None) or getattr(info, "name", None) or "gift"
+    diamonds = getattr(gift, "diamond_count", None) or getattr(info, "diamond_count", None) or 0
+    count = getattr(evt, "repeat_count", None) or getattr(gift, "repeat_count", None) \
+        or getattr(gift, "count", None) or 1
+    streakable = getattr(gift, "streakable", None)
+    if streakable is None:
+        streakable = getattr(evt, "streakable", False)
+    if not streakable:
+        return name, count, diamonds, True
+    streaking = getattr(evt, "streaking", None)
+    if streaking is None:
+        streaking = not (getattr(evt, "repeat_end", None) or getattr(gift, "repeat_end", None))
+    return name, count, diamonds, not streaking
+
+
+def like_count(evt):
+    """Likes carried by one TikTokLive LikeEvent (they arrive batched)"""
+    return getattr(evt, "count", None) or getattr(evt, "likes", None) or 1
+
+
+def plural(count, noun):
+    if count == 1:
+        return f"a {noun}"
+    return f"{count} {noun}" if noun.endswith("s") else f"{count} {noun}s"
+
+
+def name_list(names, max_names):
+    """'Alice', 'Alice and Bob', 'Alice, Bob and 3 others'"""
+    shown = names[:max_names]
+    others = len(names) - len(shown)
+    if others > 0:
+        return f"{', '.join(shown)} and {others} other{'s' if others > 1 else ''}"
+    if len(shown) == 1:
+        return shown[0]
+    return f"{', '.join(shown[:-1])} and {shown[-1]}"
+
+
+class EventAggregator:
+    """Collects engagement events and calls announce(text) once per window;
+    on_gift(user, gift, count, diamonds) runs for every gift counted in it, ended streaks included"""
+
+    def __init__(self, announce, window=10.0, min_likes=20, max_names=3,
+                 kinds=("gifts", "likes", "follows", "shares"), log=None, on_gift=None):
+        self.announce = announce
+        self.on_gift = on_gift or (lambda user, name, count, diamonds: None)
+        self.log = log or (lambda message, level="info": None)
+        self.configure(window, min_likes, max_names, kinds)
+        self._lock = threading.Lock()
+        self._streaks = {}  # (user, gift) -> [count, diamonds, last update] while a combo is running
+        self._reset_window()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def configure(self, window=None, min_likes=None, max_names=None, kinds=None):
+        """Retune (config reload) - takes effect from the next window"""
+        if window is not None:
+            self.window = window
+        if min_likes is not None:
+            self.min_likes = min_likes
+        if max_names is not None:
+            self.max_names = max_names
+        if kinds is not None:
+            self.kinds = frozenset(kinds)
+
+    def _reset_window(self):
+        self._gifts = {}  # user -> {gift name: count}, insertion order = first gift first
+        self._gift_value = {}  # user -> diamonds this window, to pick who gets named
+        self._counted = []  # (user, gift, count, diamonds) for on_gift
+        self._likes = 0
+        self._followers = []
+        self._sharers = []
+
+    def _ensure_started(self):
+        if self._thread is None:
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._run, name="event-aggregator", daemon=True)
+            self._thread.start()
+
+    def add_gift(self, user, name, count=1, diamonds=0, finished=True):
+        """Count a gift; combo updates are held until the streak finishes"""
+        with self._lock:
+            key = (user, name)
+            if not finished:
+                self._streaks[key] = [count, diamonds, time.monotonic()]
+                self._ensure_started()
+                return
+            self._streaks.pop(key, None)
+            self._add_gift(user, name, count, diamonds)
+            self._ensure_started()
+
+    def _add_gift(self, user, name, count, diamonds):
+        gifts = self._gifts.setdefault(user, {})
+        gifts[name] = gifts.get(name, 0) + count
+        self._gift_value[user] = self._gift_value.get(user, 0) + count * diamonds
+        self._counted.append((user, name, count, diamonds))
+
+    def add_like(self, user, count=1):
+        with self._lock:
+            self._likes += count
+            self._ensure_started()
+
+    def add_follow(self, user):
+        with self._lock:
+            if user not in self._followers:
+                self._followers.append(user)
+            self._ensure_started()
+
+    def add_share(self, user):
+        with self._lock:
+            if user not in self._sharers:
+                self._sharers.append(user)
+            self._ensure_started()
+
+    def summary(self):
+        """Close the current window and return its announcement (None if nothing to say)"""
+        with self._lock:
+            now = time.monotonic()
+            for key, (count, diamonds, updated) in list(self._streaks.items()):
+                # A combo whose end event never arrived still counts
+                if now - updated >= self.window:
+                    del self._streaks[key]
+                    self._add_gift(key[0], key[1], count, diamonds)
+            gifts, gift_value, counted = self._gifts, self._gift_value, self._counted
+            likes, followers, sharers = self._likes, self._followers, self._sharers
+            self._reset_window()
+        for gift in counted:
+            try:
+                self.on_gift(*gift)
+            except Exception as e:
+                self.log(f"❌ Gift callback error: {e}", "error")
+
+        parts = []
+        if gifts and "gifts" in self.kinds:
+            top = sorted(gifts, key=lambda user: -gift_value.get(user, 0))[:self.max_names]
+            for user in top:
+                sent = [plural(count, name) for name, count in gifts[user].items()]
+                parts.append(f"{user} sent {name_list(sent, len(sent))}.")
+            if len(gifts) > len(top):
+                others = len(gifts) - len(top)
+                parts.append(f"{others} more viewer{'s' if others > 1 else ''} sent gifts.")
+        if followers and "follows" in self.kinds:
+            parts.append(f"Thanks for the follow, {name_list(followers, self.max_names)}!")
+        if sharers and "shares" in self.kinds:
+            parts.append(f"{name_list(sharers, self.max_names)} shared the stream!")
+        if likes >= self.min_likes and "likes" in self.kinds:
+            parts.append(f"{likes} likes in the last {self.window:g} seconds!")
+        return " ".join(parts) or None
+
+    def _run(self):
+        while not self._stopped.wait(self.window):
+            text = self.summary()
+            if text:
+                try:
+                    self.announce(text)
+                except Exception as e:
+                    self.log(f"❌ Event summary error: {e}", "error")
+
+    def stop(self):
+        """Stop the window timer; the last window is counted (on_gift) but not announced"""
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+            self._thread = None
+        self.summary()
@@ -0,0 +1,94 @@
+"""
+Event Bus - fan bot events (log lines, joins, stats) out to live subscribers
+Publishing is thread-safe and never blocks: each subscriber has a bounded
+queue, and a subscriber that falls behind loses its oldest events (counted)
+instead of slowing the bot down.
+"""
+import time
+import asyncio
+import threading
+from collections import deque
+
+
+class Subscription:
+    """One subscriber's bounded backlog"""
+
+    def __init__(self, bus, kinds=None, max_pending=1000):
+        self.bus = bus
+        self.kinds = set(kinds) if kinds else None
+        self.pending = deque()
+        self.max_pending = max_pending
+        self.dropped = 0
+        self._ready = asyncio.Event()
+
+    def _offer(self, event):
+        # Runs on the bus loop
+        if self.kinds is not None and event["kind"] not in self.kinds:
+            return
+        if len(self.pending) >= self.max_pending:
+            self.pending.popleft()
+            self.dropped += 1
+        self.pending.append(event)
+        self._ready.set()
+
+    async def next_batch(self, max_items=200, timeout=None):
+        """Wait for events and return up to `max_items` of them (empty list on timeout)"""
+        if not self.pending:
+            self._ready.clear()
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout)
+            except asyncio.TimeoutError:
+                return []
+        batch = []
+        while self.pending and len(batch) < max_items:
+            batch.append(self.pending.popleft())
+        return batch
+
+    def close(self):
+        self.bus.unsubscribe(self)
+
+
+class EventBus:
+    """Thread-safe publish, asyncio-side subscribe"""
+
+    def __init__(self):
+        self.loop = None
+        self.subscriptions = []
+        self.published = 0
+        self._lock = threading.Lock()
+
+    def attach(self, loop):
+        """Deliver events on `loop` (the loop serving the subscribers)"""
+        self.loop = loop
+
+    def subscribe(self, kinds=None, max_pending=1000):
+        subscription = Subscription(self, kinds, max_pending)
+        with self._lock:
+            self.subscriptions = self.subscriptions + [subscription]
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self.subscriptions = [s for s in self.subscriptions if s is not subscription]
+
+    def publish(self, kind, **data):
+        """Queue an event for every subscriber - cheap no-op when nobody listens"""
+        if not self.subscriptions or self.loop is None or self.loop.is_closed():
+            return
+        self.published += 1
+        event = {"kind": kind, "ts": round(time.time(), 3), **data}
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        try:
+            if running is self.loop:
+                self._deliver(event)
+            else:
+                self.loop.call_soon_threadsafe(self._deliver, event)
+        except RuntimeError:
+            pass  # loop shutting down
+
+    def _deliver(self, event):
+        for subscription in self.subscriptions:
+            subscription._offer(event)
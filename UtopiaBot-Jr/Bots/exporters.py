@@ -0,0 +1,208 @@
+"""
+Exporters - stream session data to CSV / JSONL / Parquet off the UI thread
+Rows are pulled from a source in chunks and written as they arrive, so memory
+stays flat no matter how long the stream was.
+"""
+import os
+import bz2
+import csv
+import json
+import gzip
+import lzma
+import threading
+from datetime import datetime
+
+from transcript import iter_transcript
+
+EXPORT_FORMATS = ("csv", "jsonl", "parquet")
+COMPRESSIONS = ("none", "gzip", "bz2", "xz")
+_OPENERS = {"gzip": (gzip.open, ".gz"), "bz2": (bz2.open, ".bz2"), "xz": (lzma.open, ".xz")}
+# Parquet compresses internally and has no bz2/xz codec
+PARQUET_CODECS = {"none": "none", "gzip": "gzip"}
+
+
+class ExportSource:
+    """A named table: column names, a chunk iterator and an (optional) row count"""
+
+    def __init__(self, name, columns, chunks, total=None, converters=None):
+        self.name = name
+        self.columns = columns
+        self.chunks = chunks
+        self.total = total
+        self.converters = converters or {}
+
+    def iter_rows(self):
+        """Yield lists of row tuples with converters applied"""
+        if not self.converters:
+            yield from self.chunks()
+            return
+        indexes = [(self.columns.index(col), fn) for col, fn in self.converters.items()]
+        for chunk in self.chunks():
+            out = []
+            for row in chunk:
+                row = list(row)
+                for i, fn in indexes:
+                    row[i] = fn(row[i])
+                out.append(row)
+            yield out
+
+
+def iso_time(ts):
+    return datetime.fromtimestamp(ts).isoformat(timespec="seconds") if ts else None
+
+
+def viewers_source(store, chunk_size=1000):
+    """All known viewers from the viewer store"""
+    return ExportSource(
+        "viewers", ["username", "first_seen", "last_seen", "join_count", "message_count"],
+        lambda: store.iter_viewers(chunk_size=chunk_size), total=store.count_viewers(),
+        converters={"first_seen": iso_time, "last_seen": iso_time})
+
+
+def joins_source(store, since=None, chunk_size=1000):
+    """Join events (optionally only this session's) from the viewer store"""
+    return ExportSource(
+        "joins", ["username", "joined_at"],
+        lambda: store.iter_joins(since=since, newest_first=False, chunk_size=chunk_size),
+        total=store.count_joins(since), converters={"joined_at": iso_time})
+
+
+def memory_joins_source(joined_users):
+    """Join list kept in memory (used when the viewer database is disabled)"""
+    snapshot = [(user["username"], user["timestamp"]) for user in reversed(joined_users)]
+    return ExportSource("joins", ["username", "joined_at"], lambda: iter([snapshot]), total=len(snapshot))
+
+
+def transcript_source(paths, chunk_size=1000):
+    """Chat transcript entries (joins, comments, spoken utterances) from JSONL parts"""
+    columns = ["ts", "stream", "kind", "user", "text", "message_class"]
+
+    def chunks():
+        for entries in iter_transcript(paths, chunk_size=chunk_size):
+            yield [tuple(entry.get(col) for col in columns) for entry in entries]
+    return ExportSource("transcript", columns, chunks, converters={"ts": iso_time})
+
+
+class _TextWriter:
+    def __init__(self, path, compression):
+        opener = _OPENERS.get(compression)
+        if opener:
+            self.file = opener[0](path, "wt", encoding="utf-8", newline="")
+        else:
+            self.file = open(path, "w", encoding="utf-8", newline="")
+
+    def close(self):
+        self.file.close()
+
+
+class CsvWriter(_TextWriter):
+    def __init__(self, path, columns, compression):
+        super().__init__(path, compression)
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(columns)
+
+    def write(self, rows):
+        self.writer.writerows(rows)
+
+
+class JsonlWriter(_TextWriter):
+    def __init__(self, path, columns, compression):
+        super().__init__(path, compression)
+        self.columns = columns
+
+    def write(self, rows):
+        columns = self.columns
+        self.file.writelines(json.dumps(dict(zip(columns, row)), ensure_ascii=False) + "\n" for row in rows)
+
+
+class ParquetWriter:
+    """Columnar output through pyarrow (optional dependency), one row group per chunk"""
+
+    def __init__(self, path, columns, compression):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise RuntimeError("Parquet export needs pyarrow (pip install pyarrow)")
+        self.pa = pa
+        self.pq = pq
+        self.path = path
+        self.columns = columns
+        self.codec = PARQUET_CODECS[compression]
+        self.pq_writer = None
+
+    def write(self, rows):
+        columns = list(zip(*rows)) if rows else [[] for _ in self.columns]
+        table = self.pa.table({name: list(values) for name, values in zip(self.columns, columns)})
+        if self.pq_writer is None:
+            self.pq_writer = self.pq.ParquetWriter(self.path, table.schema, compression=self.codec)
+        self.pq_writer.write_table(table)
+
+    def close(self):
+        if self.pq_writer is not None:
+            self.pq_writer.close()
+
+
+WRITERS = {"csv": CsvWriter, "jsonl": JsonlWriter, "parquet": ParquetWriter}
+
+
+def export_path(directory, name, fmt, compression, timestamp=None):
+    """exports/joins_20250727_120000.csv.gz style path"""
+    timestamp = timestamp or datetime.now().strftime("%Y%m%d_%H%M%S")
+    suffix = _OPENERS[compression][1] if fmt != "parquet" and compression in _OPENERS else ""
+    return os.path.join(directory, f"{name}_{timestamp}.{fmt}{suffix}")
+
+
+class ExportJob(threading.Thread):
+    """Background export of one or more sources, reporting progress as it goes.
+    `sources` may be a callable returning them, so counting rows happens on this thread too"""
+
+    def __init__(self, sources, directory="exports", fmt="csv", compression="none",
+                 progress=None, done=None):
+        super().__init__(name="export", daemon=True)
+        if fmt not in WRITERS:
+            raise ValueError(f"Unknown export format '{fmt}'")
+        if fmt == "parquet" and compression not in PARQUET_CODECS:
+            raise ValueError(f"Parquet export can't use {compression} compression "
+                             f"(choose {' or '.join(PARQUET_CODECS)})")
+        self.sources = sources
+        self.directory = directory
+        self.fmt = fmt
+        self.compression = compression if compression in COMPRESSIONS else "none"
+        self.progress = progress or (lambda source, written, total: None)
+        self.done = done or (lambda paths, error: None)
+        self.cancelled = threading.Event()
+        self.paths = []
+
+    def cancel(self):
+        self.cancelled.set()
+
+    def run(self):
+        error = None
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            sources = self.sources() if callable(self.sources) else self.sources
+            for source in sources:
+                if self.cancelled.is_set():
+                    break
+                path = export_path(self.directory, source.name, self.fmt, self.compression, timestamp)
+                self._export_source(source, path)
+                self.paths.append(path)
+        except Exception as e:
+            error = e
+        self.done(self.paths, error)
+
+    def _export_source(self, source, path):
+        writer = WRITERS[self.fmt](path, source.columns, self.compression)
+        written = 0
+        try:
+            for rows in source.iter_rows():
+                if self.cancelled.is_set():
+                    break
+                writer.write(rows)
+                written += len(rows)
+                self.progress(source.name, written, source.total)
+        finally:
+            writer.close()
+        self.progress(source.name, written, written)
@@ -0,0 +1,180 @@
+"""
+Fleet - shard many streams across worker processes
+Each worker runs a MultiStreamHost for its shard of usernames on its own
+event loop, reports metrics back over a queue, and is restarted (with
+backoff) if it crashes. Joke files are memory-mapped, so workers share one
+page-cache copy of them. All workers share one viewer database, so moving a
+stream to another worker (or changing --workers) keeps its viewers' history.
+"""
+import os
+import time
+import queue
+import threading
+import multiprocessing
+
+from multi_stream import MultiStreamHost
+
+STAT_KEYS = ("messages", "jokes", "welcomes", "returning")
+
+
+def shard_streams(streams, workers):
+    """Deal usernames round-robin in name order - balanced, and a restarted worker gets the same shard"""
+    shards = [[] for _ in range(workers)]
+    for i, stream in enumerate(sorted(streams, key=lambda s: s[0].lower())):
+        shards[i % workers].append(stream)
+    return shards
+
+
+def streams_label(streams, limit=3):
+    """'alice+bob' - names a worker's per-run files by its streams, not by worker number"""
+    names = sorted(username for username, _ in streams)
+    label = "+".join(names[:limit])
+    return f"{label}+{len(names) - limit}more" if len(names) > limit else label
+
+
+def stream_path(path, streams):
+    """data/trace.jsonl -> data/trace_alice+bob.jsonl"""
+    if not path:
+        return path
+    root, ext = os.path.splitext(path)
+    return f"{root}_{streams_label(streams)}{ext}"
+
+
+def worker_main(shard_id, streams, options, metrics, stop_event, report_interval):
+    """Worker process entry point - one MultiStreamHost for this shard"""
+    def log(message, level="info"):
+        print(f"[{time.strftime('%H:%M:%S')}] [w{shard_id}] {message}", flush=True)
+
+    # Every worker writes the one viewer database (SQLite WAL serializes the writers), so a
+    # viewer's history doesn't depend on which worker their stream lands on. The trace and
+    # transcript only cover this run and are named after the streams they contain.
+    options = dict(options)
+    options["trace_path"] = stream_path(options.get("trace_path"), streams)
+    if options.get("transcript_dir"):
+        options["transcript_dir"] = os.path.join(options["transcript_dir"], streams_label(streams))
+    host = MultiStreamHost(streams, log=log, **options)
+
+    def reporter():
+        while not stop_event.wait(report_interval):
+            metrics.put((shard_id, os.getpid(), host.stats()))
+        host.stop()
+
+    threading.Thread(target=reporter, daemon=True).start()
+    try:
+        host.start()
+    finally:
+        metrics.put((shard_id, os.getpid(), host.stats()))
+        host.shutdown()
+
+
+class FleetSupervisor:
+    """start / stop a fleet of worker processes; restarts workers that die"""
+
+    def __init__(self, streams, workers=None, options=None, report_interval=5.0,
+                 max_restart_delay=60, log=None):
+        self.workers = max(1, min(workers or os.cpu_count() or 1, len(streams)))
+        self.shards = shard_streams(streams, self.workers)
+        self.options = options or {}
+        self.report_interval = report_interval
+        self.max_restart_delay = max_restart_delay
+        self.log = log or (lambda message, level="info": print(message))
+        self.metrics = multiprocessing.Queue()
+        self.stop_event = multiprocessing.Event()
+        self.processes = {}
+        self.restarts = {}
+        self.restart_at = {}
+        self.latest = {}
+        self.running = False
+
+    def _spawn(self, shard_id):
+        process = multiprocessing.Process(
+            target=worker_main, name=f"tts-worker-{shard_id}",
+            args=(shard_id, self.shards[shard_id], self.options, self.metrics,
+                  self.stop_event, self.report_interval))
+        process.start()
+        self.processes[shard_id] = process
+        usernames = ", ".join("@" + username for username, _ in self.shards[shard_id])
+        self.log(f"🧩 Worker {shard_id} (pid {process.pid}): {usernames}", "info")
+
+    def start(self):
+        """Spawn every worker and supervise until stop() or Ctrl+C"""
+        self.running = True
+        for shard_id, shard in enumerate(self.shards):
+            if shard:
+                self._spawn(shard_id)
+        try:
+            while self.running and self.processes:
+                self._drain_metrics(timeout=1.0)
+                self._check_workers()
+        except KeyboardInterrupt:
+            self.log("🛑 Shutting down fleet...", "warning")
+        finally:
+            self.stop()
+
+    def _check_workers(self):
+        now = time.monotonic()
+        for shard_id, process in list(self.processes.items()):
+            if process.is_alive():
+                continue
+            if process.exitcode == 0 and shard_id not in self.restart_at:
+                # Clean exit - every stream in the shard stopped for good (e.g. user not found)
+                self.log(f"⏹️ Worker {shard_id} finished", "info")
+                del self.processes[shard_id]
+                continue
+            if shard_id not in self.restart_at:
+                count = self.restarts.get(shard_id, 0) + 1
+                self.restarts[shard_id] = count
+                delay = min(self.max_restart_delay, 2 ** (count - 1))
+                self.restart_at[shard_id] = now + delay
+                self.log(f"💥 Worker {shard_id} exited (code {process.exitcode}) - restarting in {delay}s", "warning")
+            elif now >= self.restart_at[shard_id]:
+                del self.restart_at[shard_id]
+                self._spawn(shard_id)
+
+    def _drain_metrics(self, timeout=0.0):
+        try:
+            shard_id, pid, stats = self.metrics.get(timeout=timeout)
+        except queue.Empty:
+            return
+        self.latest[shard_id] = stats
+        while True:
+            try:
+                shard_id, pid, stats = self.metrics.get_nowait()
+            except queue.Empty:
+                return
+            self.latest[shard_id] = stats
+
+    def stop(self, timeout=15):
+        """Ask every worker to finish its queued speech and exit"""
+        if not self.processes:
+            return
+        self.running = False
+        self.stop_event.set()
+        deadline = time.monotonic() + timeout
+        for process in self.processes.values():
+            process.join(max(0.1, deadline - time.monotonic()))
+            if process.is_alive():
+                process.terminate()
+        self._drain_metrics()
+        self.processes.clear()
+
+    def stats(self):
+        """Latest per-stream stats from every worker plus fleet totals"""
+        streams, status = {}, {}
+        for worker_stats in self.latest.values():
+            streams.update(worker_stats["streams"])
+            status.update(worker_stats["status"])
+        totals = {key: sum(values[key] for values in streams.values()) for key in STAT_KEYS}
+        return {"workers": self.workers, "restarts": sum(self.restarts.values()),
+                "streams": streams, "status": status, "totals": totals}
+
+    def report(self):
+        stats = self.stats()
+        lines = [f"📊 Fleet summary - {stats['workers']} workers, {stats['restarts']} restarts"]
+        for username, values in sorted(stats["streams"].items()):
+            lines.append(f"  @{username:<24} {stats['status'][username]:<12} "
+                         f"messages {values['messages']:>6}  welcomes {values['welcomes']:>6}  jokes {values['jokes']:>5}")
+        totals = stats["totals"]
+        lines.append(f"  {'total':<25} {'':<12} messages {totals['messages']:>6}  "
+                     f"welcomes {totals['welcomes']:>6}  jokes {totals['jokes']:>5}")
+        return lines
@@ -0,0 +1,81 @@
+"""
+Joke Corpus - memory-mapped joke files with a line-offset index
+The file is mapped read-only, so every bot and every fleet worker on the host
+shares the same page-cache copy; a pick is one random offset instead of
+re-reading and splitting the file for each !joke.
+"""
+import os
+import mmap
+import random
+import threading
+from array import array
+
+
+class JokeCorpus:
+    """Random non-empty lines from a text file, reloaded when the file changes"""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._map = None
+        self._starts = array("Q")
+        self._ends = array("Q")
+        self._stamp = None
+
+    def _refresh(self):
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            self._close_map()
+            self._stamp = None
+            return
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        if stamp == self._stamp:
+            return
+        with self._lock:
+            if stamp == self._stamp:
+                return
+            self._close_map()
+            starts, ends = array("Q"), array("Q")
+            if stat.st_size:
+                with open(self.path, "rb") as f:
+                    self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                data = self._map
+                pos, size = 0, len(data)
+                while pos < size:
+                    end = data.find(b"\n", pos)
+                    if end == -1:
+                        end = size
+                    if data[pos:end].strip():
+                        starts.append(pos)
+                        ends.append(end)
+                    pos = end + 1
+            self._starts, self._ends = starts, ends
+            self._stamp = stamp
+
+    def _close_map(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._starts, self._ends = array("Q"), array("Q")
+
+    def exists(self):
+        return os.path.exists(self.path)
+
+    def __len__(self):
+        self._refresh()
+        return len(self._starts)
+
+    def random_line(self, rng=random):
+        """A random non-empty line, or None if the file is missing or empty"""
+        self._refresh()
+        with self._lock:
+            if not self._starts:
+                return None
+            i = rng.randrange(len(self._starts))
+            return self._map[self._starts[i]:self._ends[i]].decode("utf-8", errors="replace").strip()
+
+    def close(self):
+        with self._lock:
+            self._close_map()
+            self._stamp = None
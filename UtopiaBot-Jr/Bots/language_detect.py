@@ -0,0 +1,214 @@
+"""
+Language Detection - which language is this chat message in?
+Non-Latin scripts are decided by Unicode range alone (kana -> Japanese, hangul
+-> Korean, ...). Latin-script text is scored against character-trigram
+profiles built once from the small built-in samples below. Results are cached
+per text, and each viewer's language is remembered: once a few of their
+messages agree, later ones skip the n-gram scoring entirely.
+"""
+import math
+import threading
+from collections import Counter, OrderedDict
+from functools import lru_cache
+
+# Everyday phrases per language - enough to tell chat-length messages apart
+SAMPLES = {
+    "en": "hello how are you doing today this is so funny i love this stream what are you playing "
+          "thank you for the follow can you say my name please that was amazing lets go good game "
+          "where are you from i think you should try again it is the best thing i have ever seen "
+          "what did he say why not when will you be live again the weather is nice here tonight",
+    "es": "hola como estas que tal todo bien me encanta este directo que estas jugando gracias por "
+          "el saludo puedes decir mi nombre por favor eso fue increible vamos de donde eres creo que "
+          "deberias intentarlo otra vez es lo mejor que he visto que dijo por que no cuando vuelves "
+          "muy bueno jajaja saludos desde mexico buenas noches a todos los amigos del chat",
+    "pt": "ola tudo bem como voce esta eu amo essa live o que voce esta jogando obrigado pelo "
+          "seguir pode falar meu nome por favor isso foi incrivel vamos de onde voce e acho que voce "
+          "deveria tentar de novo e a melhor coisa que eu ja vi o que ele disse por que nao quando "
+          "voce volta muito bom kkkkk abraco do brasil boa noite pra todo mundo no chat",
+    "fr": "bonjour comment ca va j adore ce live a quoi tu joues merci pour le suivi tu peux dire "
+          "mon nom s il te plait c etait incroyable allez d ou viens tu je pense que tu devrais "
+          "reessayer c est la meilleure chose que j ai jamais vue qu est ce qu il a dit pourquoi pas "
+          "quand est ce que tu reviens tres bien mdr bonne soiree a tout le monde dans le chat",
+    "de": "hallo wie geht es dir ich liebe diesen stream was spielst du gerade danke fur das folgen "
+          "kannst du bitte meinen namen sagen das war unglaublich los geht s woher kommst du ich "
+          "glaube du solltest es noch einmal versuchen das ist das beste was ich je gesehen habe was "
+          "hat er gesagt warum nicht wann bist du wieder live sehr gut gute nacht an alle im chat",
+    "it": "ciao come stai adoro questa diretta a cosa stai giocando grazie per il segui puoi dire "
+          "il mio nome per favore e stato incredibile andiamo di dove sei penso che dovresti "
+          "riprovare e la cosa piu bella che abbia mai visto cosa ha detto perche no quando torni in "
+          "diretta molto bene ahahah saluti dall italia buona notte a tutti nella chat",
+    "nl": "hallo hoe gaat het met je ik hou van deze stream wat ben je aan het spelen bedankt voor "
+          "het volgen kun je mijn naam zeggen alsjeblieft dat was geweldig kom op waar kom je vandaan "
+          "ik denk dat je het nog een keer moet proberen het is het beste wat ik ooit heb gezien wat "
+          "zei hij waarom niet wanneer ben je weer live heel goed goedenacht iedereen in de chat",
+    "tr": "merhaba nasilsin bu yayini cok seviyorum ne oynuyorsun takip ettigin icin tesekkurler "
+          "adimi soyler misin lutfen bu inanilmazdi hadi nerelisin bence tekrar denemelisin "
+          "gordugum en iyi sey bu ne dedi neden olmasin ne zaman tekrar canli olacaksin cok iyi "
+          "herkese iyi geceler sohbetteki herkese selamlar cok guzel olmus abi",
+    "pl": "czesc jak sie masz kocham ten stream w co grasz dzieki za obserwowanie mozesz powiedziec "
+          "moje imie prosze to bylo niesamowite dawaj skad jestes mysle ze powinienes sprobowac "
+          "jeszcze raz to najlepsza rzecz jaka widzialem co on powiedzial czemu nie kiedy znowu "
+          "bedziesz na zywo bardzo dobrze dobranoc wszystkim na czacie pozdrawiam z polski",
+    "id": "halo apa kabar aku suka banget live ini lagi main apa terima kasih sudah follow bisa "
+          "sebut nama aku tolong itu keren banget ayo dari mana kamu aku pikir kamu harus coba lagi "
+          "ini hal terbaik yang pernah aku lihat dia bilang apa kenapa tidak kapan live lagi bagus "
+          "sekali wkwkwk salam dari indonesia selamat malam semua yang ada di chat",
+}
+
+# Unicode ranges that identify a language on their own (checked in this order)
+SCRIPT_RANGES = (
+    ("ja", ((0x3040, 0x30FF),)),                    # hiragana / katakana
+    ("ko", ((0xAC00, 0xD7AF), (0x1100, 0x11FF))),   # hangul
+    ("zh", ((0x4E00, 0x9FFF), (0x3400, 0x4DBF))),   # han without kana
+    ("ru", ((0x0400, 0x04FF),)),
+    ("ar", ((0x0600, 0x06FF),)),
+    ("he", ((0x0590, 0x05FF),)),
+    ("el", ((0x0370, 0x03FF),)),
+    ("th", ((0x0E00, 0x0E7F),)),
+    ("hi", ((0x0900, 0x097F),)),
+)
+UKRAINIAN_LETTERS = set("їєіґЇЄІҐ")
+
+# Detected language -> language code prefix in Google's voice list
+GOOGLE_LANGUAGE = {"zh": "cmn"}
+
+
+def script_language(text):
+    """Language implied by the writing system, or None for Latin/other text"""
+    counts = Counter()
+    for char in text:
+        code = ord(char)
+        if code < 0x0370:
+            continue
+        for language, ranges in SCRIPT_RANGES:
+            if any(low <= code <= high for low, high in ranges):
+                counts[language] += 1
+                break
+    if not counts:
+        return None
+    if counts["ja"]:
+        return "ja"  # Japanese mixes kana with han
+    language = counts.most_common(1)[0][0]
+    if language == "ru" and any(char in UKRAINIAN_LETTERS for char in text):
+        return "uk"
+    return language
+
+
+def trigrams(text):
+    """Character trigrams of each word, padded with spaces ('hi' -> ' hi', 'hi ')"""
+    grams = []
+    for word in text.lower().split():
+        word = "".join(char for char in word if char.isalpha())
+        if word:
+            padded = f" {word} "
+            grams.extend(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class TrigramModel:
+    """Add-one smoothed trigram log-probabilities per language"""
+
+    def __init__(self, samples=SAMPLES):
+        self.log_probs = {}
+        self.unseen = {}
+        for language, text in samples.items():
+            counts = Counter(trigrams(text))
+            total = sum(counts.values()) + len(counts) + 1
+            self.log_probs[language] = {gram: math.log((count + 1) / total) for gram, count in counts.items()}
+            self.unseen[language] = math.log(1 / total)
+
+    def score(self, text):
+        """(best language, confidence 0..1) - confidence is the per-trigram margin over the runner-up"""
+        grams = trigrams(text)
+        if not grams:
+            return None, 0.0
+        scores = []
+        for language, log_probs in self.log_probs.items():
+            unseen = self.unseen[language]
+            scores.append((sum(log_probs.get(gram, unseen) for gram in grams), language))
+        scores.sort(reverse=True)
+        margin = (scores[0][0] - scores[1][0]) / len(grams)
+        return scores[0][1], min(1.0, margin)
+
+
+class LanguageDetector:
+    """detect(text, user) -> language code; per-text LRU and per-viewer memo"""
+
+    _model = None
+    _model_lock = threading.Lock()
+
+    def __init__(self, default="en", min_letters=12, min_confidence=0.2, settle_after=3,
+                 max_users=20000, cache_size=4096):
+        self.configure(default=default, min_letters=min_letters, min_confidence=min_confidence,
+                       settle_after=settle_after)
+        self.max_users = max_users
+        self.users = OrderedDict()  # user -> [language, agreeing messages]
+        self.detections = 0
+        self.memo_hits = 0
+        self._lock = threading.Lock()
+        self.detect_text = lru_cache(maxsize=cache_size)(self._detect_text)
+
+    def configure(self, default=None, min_letters=None, min_confidence=None, settle_after=None):
+        if default is not None:
+            self.default = default
+        if settle_after is not None:
+            self.settle_after = settle_after
+        if min_letters is not None or min_confidence is not None:
+            if min_letters is not None:
+                self.min_letters = min_letters
+            if min_confidence is not None:
+                self.min_confidence = min_confidence
+            if hasattr(self, "detect_text"):
+                self.detect_text.cache_clear()  # cached verdicts used the old thresholds
+
+    @classmethod
+    def model(cls):
+        """Trigram profiles are built once per process"""
+        if cls._model is None:
+            with cls._model_lock:
+                if cls._model is None:
+                    cls._model = TrigramModel()
+        return cls._model
+
+    def _detect_text(self, text):
+        """(language or None, confidence) for one message, no per-user memory"""
+        language = script_language(text)
+        if language:
+            return language, 1.0
+        if sum(1 for char in text if char.isalpha()) < self.min_letters:
+            return None, 0.0
+        # Without a clear lead over the runner-up, keep the default (or the viewer's known) language
+        language, confidence = self.model().score(text)
+        return (language, confidence) if confidence >= self.min_confidence else (None, confidence)
+
+    def detect(self, text, user=None, fallback=None):
+        """Language for this message - a viewer's settled language skips the n-gram model;
+        unclear messages get the viewer's known language, else `fallback`, else the default"""
+        with self._lock:
+            memo = self.users.get(user) if user is not None else None
+            if memo is not None:
+                self.users.move_to_end(user)
+        script = script_language(text)
+        if memo is not None and memo[1] >= self.settle_after and (script is None or script == memo[0]):
+            self.memo_hits += 1
+            return memo[0]
+        language, confidence = (script, 1.0) if script else self.detect_text(text)
+        self.detections += 1
+        if language is None:
+            return memo[0] if memo else fallback or self.default
+        if user is not None:
+            with self._lock:
+                if memo is not None and memo[0] == language:
+                    memo[1] += 1
+                else:
+                    self.users[user] = [language, 1]
+                    if len(self.users) > self.max_users:
+                        self.users.popitem(last=False)
+        return language
+
+    def forget(self, user):
+        with self._lock:
+            self.users.pop(user, None)
+
+    def stats(self):
+        return {"detections": self.detections, "memo_hits": self.memo_hits, "viewers": len(self.users)}
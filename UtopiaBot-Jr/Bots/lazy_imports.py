@@ -0,0 +1,75 @@
+"""
+Lazy Imports - load heavy dependencies on first use and time them
+Keeps `--help` and CLI start-up from paying for TikTokLive, Google Cloud,
+tkinter and friends until they are actually needed.
+"""
+import sys
+import time
+import importlib
+import importlib.util
+import threading
+
+PROCESS_START = time.perf_counter()
+
+# name -> (seconds since process start when loaded, seconds spent importing)
+IMPORT_TIMES = {}
+MILESTONES = []
+_lock = threading.RLock()
+
+
+class LazyModule:
+    """Module proxy that imports the real module on first attribute access"""
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def _load(self):
+        if self._module is None:
+            with _lock:
+                if self._module is None:
+                    already_loaded = self._name in sys.modules
+                    start = time.perf_counter()
+                    module = importlib.import_module(self._name)
+                    if not already_loaded:
+                        IMPORT_TIMES[self._name] = (start - PROCESS_START, time.perf_counter() - start)
+                    self._module = module
+        return self._module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __repr__(self):
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<lazy module '{self._name}' ({state})>"
+
+
+def lazy_import(name):
+    """Return a proxy for module `name`; the import happens on first use"""
+    return LazyModule(name)
+
+
+def module_available(*names):
+    """True if every named module can be imported (without importing it)"""
+    try:
+        return all(importlib.util.find_spec(name) is not None for name in names)
+    except (ImportError, ValueError):
+        return False
+
+
+def mark(milestone):
+    """Record a start-up milestone such as 'connecting'"""
+    MILESTONES.append((milestone, time.perf_counter() - PROCESS_START))
+
+
+def import_report():
+    """Report lines: deferred imports by cost plus start-up milestones"""
+    lines = ["⏱️ Import-time report (ms since start / ms spent importing)"]
+    ordered = sorted(IMPORT_TIMES.items(), key=lambda item: item[1][1], reverse=True)
+    for name, (loaded_at, cost) in ordered:
+        lines.append(f"  {name:<32} at {loaded_at * 1000:>8.1f}   cost {cost * 1000:>8.1f}")
+    if not ordered:
+        lines.append("  (no deferred modules loaded)")
+    for milestone, at in MILESTONES:
+        lines.append(f"  ▶ {milestone:<30} at {at * 1000:>8.1f}")
+    return lines
@@ -0,0 +1,88 @@
+"""
+Links Model - links/links.txt parsed once, re-read only when the file changes
+The file becomes a flat list of display rows (category headers, text lines and
+rows of up to `columns` links) with a fixed height per kind, so the Links tab
+can find the rows inside the visible part of its canvas by bisection and build
+widgets for just those. Loading again is a stat() unless the file was edited.
+"""
+import os
+import re
+from bisect import bisect_right
+
+LINK_MARKER = "🔗"
+# A line with any of these is a category header
+CATEGORY_MARKERS = "🎮📺📸🐦🎵💬🧱☕🌐"
+CATEGORY_LINE = re.compile(f"[{re.escape(CATEGORY_MARKERS)}]")
+ROW_HEIGHTS = {"category": 52, "text": 24, "links": 64, "error": 140}
+
+
+def parse_links(content, columns=3):
+    """Rows to display: ('category', line), ('text', line) and ('links', [up to `columns` links])"""
+    rows, pending = [], []
+
+    def flush():
+        rows.extend(("links", pending[i:i + columns]) for i in range(0, len(pending), columns))
+        pending.clear()
+
+    for line in content.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        if CATEGORY_LINE.search(line):
+            flush()
+            rows.append(("category", line))
+        elif line.startswith(LINK_MARKER):
+            url = line[len(LINK_MARKER):].strip()
+            full_url = url if url.startswith(("http://", "https://")) else "https://" + url
+            pending.append({"url": url, "full_url": full_url})
+        else:
+            flush()
+            rows.append(("text", line))
+    flush()
+    return rows
+
+
+class LinksFile:
+    """Parsed links file, cached until its mtime or size changes"""
+
+    def __init__(self, path, columns=3):
+        self.path = path
+        self.columns = columns
+        self.rows = []
+        self.offsets = [0]  # y of each row's top edge, plus the total height at the end
+        self.link_count = 0
+        self.category_count = 0
+        self._stamp = None
+
+    @property
+    def height(self):
+        return self.offsets[-1]
+
+    def load(self):
+        """(rows, changed) - the file is only read and parsed again when it was modified"""
+        try:
+            stat = os.stat(self.path)
+            stamp = (stat.st_mtime_ns, stat.st_size)
+            if stamp == self._stamp:
+                return self.rows, False
+            with open(self.path, "r", encoding="utf-8") as f:
+                rows = parse_links(f.read(), self.columns)
+        except FileNotFoundError:
+            stamp, rows = None, [("error", "❌ links/links.txt not found\n\nCreate a file at: links/links.txt\n"
+                                           "with your links organized by categories")]
+        except (OSError, UnicodeDecodeError) as e:
+            stamp, rows = None, [("error", f"❌ Error loading links: {e}")]
+        self._stamp = stamp
+        self.rows = rows
+        self.offsets = [0]
+        for kind, _ in rows:
+            self.offsets.append(self.offsets[-1] + ROW_HEIGHTS[kind])
+        self.link_count = sum(len(value) for kind, value in rows if kind == "links")
+        self.category_count = sum(1 for kind, _ in rows if kind == "category")
+        return rows, True
+
+    def visible(self, top, bottom):
+        """Indexes of the rows that overlap the band top..bottom (canvas y)"""
+        first = max(0, bisect_right(self.offsets, top) - 1)
+        last = min(len(self.rows), bisect_right(self.offsets, bottom))
+        return range(first, last)
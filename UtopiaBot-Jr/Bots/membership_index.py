@@ -0,0 +1,175 @@
+"""
+Membership Index - constant-time "have we seen this viewer before?" checks
+A Bloom filter over every username in the viewer store, saved as a small
+binary snapshot so start-up doesn't have to rescan the database.
+
+Snapshot layout (little endian):
+    magic "UTBF" | version u8 | k u8 | bits u64 | count u64 | capacity u64 | watermark f64 | bit array
+"""
+import os
+import math
+import struct
+import hashlib
+import threading
+
+MAGIC = b"UTBF"
+VERSION = 1
+HEADER = struct.Struct("<4sBBQQQd")
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter using double hashing over one blake2b digest"""
+
+    def __init__(self, capacity=100000, error_rate=0.001, bits=None, hashes=None, data=None):
+        self.capacity = max(1, int(capacity))
+        self.error_rate = error_rate
+        if bits is None:
+            bits = int(math.ceil(-self.capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.bits = max(8, bits)
+        self.hashes = hashes or max(1, int(round(self.bits / self.capacity * math.log(2))))
+        self.data = data if data is not None else bytearray((self.bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key):
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        bits = self.bits
+        return [(h1 + i * h2) % bits for i in range(self.hashes)]
+
+    def add(self, key):
+        """Add a key; returns True if it was (probably) new"""
+        new = False
+        data = self.data
+        for pos in self._positions(key):
+            byte, mask = pos >> 3, 1 << (pos & 7)
+            if not data[byte] & mask:
+                data[byte] |= mask
+                new = True
+        if new:
+            self.count += 1
+        return new
+
+    def __contains__(self, key):
+        data = self.data
+        return all(data[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+    def is_full(self):
+        return self.count >= self.capacity
+
+
+class ViewerIndex:
+    """In-memory Bloom filter of known viewers, backed by the viewer store"""
+
+    def __init__(self, store, snapshot_path=None, capacity=100000, error_rate=0.001, log=None):
+        self.store = store
+        self.snapshot_path = snapshot_path
+        self.error_rate = error_rate
+        self.log = log or (lambda message, level="info": None)
+        self.watermark = 0.0
+        self._lock = threading.Lock()
+        self._added_during_rebuild = None  # usernames added while a bigger filter is being built
+        self.filter = self._load_snapshot()
+        if self.filter is None:
+            self.filter = self._rebuild(max(capacity, store.count_viewers() * 2 if store else 0))
+        else:
+            self._catch_up()
+
+    def seen_before(self, username):
+        """True if the viewer has (probably) been here before - O(1)"""
+        return username in self.filter
+
+    def add(self, username):
+        """Remember a viewer; when the filter fills up a bigger one is built in the background"""
+        with self._lock:
+            self.filter.add(username)
+            if self._added_during_rebuild is not None:
+                self._added_during_rebuild.append(username)
+            elif self.filter.is_full() and self.store:
+                # The full filter keeps answering (a little less precisely) until the new one is ready
+                self.log("🔁 Viewer index full - rebuilding at double capacity", "info")
+                self._added_during_rebuild = [username]
+                threading.Thread(target=self._grow, args=(self.filter.capacity * 2,),
+                                 name="viewer-index-rebuild", daemon=True).start()
+
+    def _grow(self, capacity):
+        try:
+            self.store.flush()
+            bloom, watermark = self._build(capacity)
+        except Exception as e:
+            self.log(f"⚠️ Viewer index rebuild failed: {e}", "warning")
+            with self._lock:
+                self._added_during_rebuild = None
+            return
+        with self._lock:
+            for username in self._added_during_rebuild:
+                bloom.add(username)
+            self._added_during_rebuild = None
+            self.filter, self.watermark = bloom, max(self.watermark, watermark)
+
+    def _rebuild(self, capacity):
+        bloom, self.watermark = self._build(capacity)
+        return bloom
+
+    def _build(self, capacity):
+        """(filter of every viewer in the store, newest last_seen)"""
+        bloom = BloomFilter(capacity, self.error_rate)
+        watermark = 0.0
+        if self.store:
+            for rows in self.store.iter_viewers(chunk_size=5000):
+                for username, first_seen, last_seen, _, _ in rows:
+                    bloom.add(username)
+                    watermark = max(watermark, last_seen)
+        return bloom, watermark
+
+    def _catch_up(self):
+        """Add viewers seen after the snapshot was written"""
+        if not self.store:
+            return
+        added = 0
+        for rows in self.store.iter_viewers_since(self.watermark):
+            for username, last_seen in rows:
+                added += self.filter.add(username)  # viewers this process already added don't count
+                self.watermark = max(self.watermark, last_seen)
+        if added:
+            self.log(f"👥 Viewer index caught up with {added} viewers since last snapshot", "info")
+
+    def _load_snapshot(self):
+        if not self.snapshot_path or not os.path.exists(self.snapshot_path):
+            return None
+        try:
+            with open(self.snapshot_path, "rb") as f:
+                header = f.read(HEADER.size)
+                magic, version, hashes, bits, count, capacity, watermark = HEADER.unpack(header)
+                if magic != MAGIC or version != VERSION:
+                    raise ValueError("unrecognised snapshot format")
+                data = bytearray(f.read())
+            if len(data) != (bits + 7) // 8:
+                raise ValueError("truncated snapshot")
+        except (OSError, ValueError, struct.error) as e:
+            self.log(f"⚠️ Ignoring viewer index snapshot ({e}) - rebuilding from database", "warning")
+            return None
+        bloom = BloomFilter(capacity, self.error_rate, bits=bits, hashes=hashes, data=data)
+        bloom.count = count
+        self.watermark = watermark
+        return bloom
+
+    def save(self):
+        """Write the snapshot atomically"""
+        if not self.snapshot_path:
+            return
+        if self.store:
+            # Other processes may share the database - pull in whatever they wrote, so
+            # the snapshot covers everything on disk up to its watermark
+            self.store.flush()
+            self._catch_up()
+        with self._lock:
+            bloom = self.filter
+            header = HEADER.pack(MAGIC, VERSION, bloom.hashes, bloom.bits, bloom.count,
+                                 bloom.capacity, self.watermark)
+            data = bytes(bloom.data)
+        tmp_path = f"{self.snapshot_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(header)
+            f.write(data)
+        os.replace(tmp_path, self.snapshot_path)
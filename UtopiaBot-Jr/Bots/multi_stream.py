@@ -0,0 +1,114 @@
+"""
+Multi-Stream Host - serve several TikTok usernames from one process
+Every stream gets its own TikTokLive client, supervisor, voice, dedup state and
+stats, all running on one asyncio loop. The TTS router (one Google client),
+normalizer caches, viewer history, transcript, tracer and the audio output are
+shared - lines from different streams take turns instead of playing over each other.
+"""
+import time
+import asyncio
+
+from tiktok_bot_unified import TikTokTTSBot
+from bot_services import BotServices
+from playback import PlaybackEngine
+
+
+def parse_streams(spec):
+    """'alice=en-GB-Wavenet-A,bob' -> [('alice', 'en-GB-Wavenet-A'), ('bob', None)]"""
+    streams = []
+    seen = set()
+    for item in spec.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        username, _, voice = item.partition("=")
+        username = username.strip().lstrip("@")
+        if username in seen:
+            raise ValueError(f"Username '{username}' listed twice")
+        seen.add(username)
+        streams.append((username, voice.strip() or None))
+    if not streams:
+        raise ValueError("No usernames given")
+    return streams
+
+
+class StreamBot(TikTokTTSBot):
+    """One stream inside a host - shared services, its own voice, dedup and stats"""
+
+    def __init__(self, username, services, voice_name=None, player=None):
+        super().__init__(username=username, gui_mode=False, services=services, voice_name=voice_name,
+                         player=player)
+
+    def log(self, message, level="info"):
+        super().log(f"[@{self.username}] {message}", level)
+
+
+class MultiStreamHost:
+    """Runs one StreamBot per username on a single event loop"""
+
+    def __init__(self, streams, services=None, log=None, **service_options):
+        self.log = log or (lambda message, level="info": print(message))
+        self.services = services or BotServices(log=self.log, **service_options)
+        config = self.services.config
+        self.player = PlaybackEngine(self.play_audio, config.audio_dir, prefetch=config.prefetch,
+                                     use_device=config.audio_device, log=self.log)
+        self.bots = [StreamBot(username, self.services, voice, self.player) for username, voice in streams]
+
+    def play_audio(self, path):
+        self.bots[0].play_audio(path)
+
+    async def run(self):
+        started = time.time()
+        for bot in self.bots:
+            bot.bot_running = True
+            bot.stats["start_time"] = started
+        self.log(f"🚀 Hosting {len(self.bots)} streams: {', '.join('@' + b.username for b in self.bots)}", "info")
+        for bot in self.bots:
+            bot.start_online_monitor()
+        try:
+            await asyncio.gather(*(bot.supervisor.run() for bot in self.bots))
+        finally:
+            # Cancelled (Ctrl+C) or finished - close live connections while the loop still runs
+            await asyncio.gather(*(bot.disconnect_client() for bot in self.bots), return_exceptions=True)
+
+    def start(self):
+        try:
+            asyncio.run(self.run())
+        except KeyboardInterrupt:
+            self.log("🛑 Shutting down...", "warning")
+            self.stop()
+            # Interrupted - drop queued speech rather than reading it all out first
+            for bot in self.bots:
+                bot.speech_scheduler.stop(drain=False)
+            self.player.close(drain=False)
+
+    def stop(self):
+        for bot in self.bots:
+            bot.stop_bot()
+
+    def stats(self):
+        """Per-stream stats plus totals"""
+        keys = ("messages", "jokes", "welcomes", "returning")
+        per_stream = {bot.username: {key: bot.stats[key] for key in keys} for bot in self.bots}
+        per_stream_status = {bot.username: bot.connection_status for bot in self.bots}
+        totals = {key: sum(stats[key] for stats in per_stream.values()) for key in keys}
+        return {"streams": per_stream, "status": per_stream_status, "totals": totals}
+
+    def report(self):
+        stats = self.stats()
+        lines = ["📊 Multi-stream summary"]
+        for username, values in stats["streams"].items():
+            lines.append(f"  @{username:<24} {stats['status'][username]:<12} "
+                         f"messages {values['messages']:>6}  welcomes {values['welcomes']:>6}  jokes {values['jokes']:>5}")
+        totals = stats["totals"]
+        lines.append(f"  {'total':<25} {'':<12} messages {totals['messages']:>6}  "
+                     f"welcomes {totals['welcomes']:>6}  jokes {totals['jokes']:>5}")
+        return lines
+
+    def shutdown(self):
+        """Let queued speech finish, then close the shared services"""
+        for bot in self.bots:
+            bot.bot_running = False
+            bot.shutdown()
+        self.player.close(drain=True, timeout=30)
+        self.services.close()
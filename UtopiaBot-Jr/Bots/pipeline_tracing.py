@@ -0,0 +1,211 @@
+"""
+Pipeline Tracing - per-event stage timings for the comment-to-speech path
+Each chat event gets a span that stamps every stage with monotonic timestamps
+"""
+import json
+import time
+import threading
+import itertools
+from collections import deque
+from contextlib import contextmanager
+
+# Stages in the order they happen for a single chat event
+STAGES = ("delivery", "dedup", "filter", "normalize", "language", "queue", "synthesize", "file_write", "playback")
+PERCENTILES = (50, 95, 99)
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(round(pct / 100.0 * len(sorted_values))))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def event_create_time(evt):
+    """Best-effort server timestamp (seconds) of a TikTokLive event, or None"""
+    for holder in ("common", "base_message"):
+        create_time = getattr(getattr(evt, holder, None), "create_time", None)
+        if create_time:
+            # TikTok sends milliseconds since epoch
+            return create_time / 1000.0 if create_time > 1e11 else float(create_time)
+    return None
+
+
+class TraceSpan:
+    """Stage timings for one Join/Comment event"""
+
+    def __init__(self, tracer, event_id, kind, user):
+        self.tracer = tracer
+        self.event_id = event_id
+        self.kind = kind
+        self.user = user
+        self.started = time.monotonic()
+        self.stamps = {}
+        self.stages = {}
+        self.outcome = None
+
+    @contextmanager
+    def stage(self, name):
+        """Time a block of code as one pipeline stage"""
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            end = time.monotonic()
+            self.stamps.setdefault(name, start - self.started)
+            self.stages[name] = self.stages.get(name, 0.0) + (end - start)
+
+    def record(self, name, seconds):
+        """Record a stage that was measured outside this process (e.g. delivery lag)"""
+        if seconds is not None and seconds >= 0:
+            self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    def finish(self, outcome="spoken"):
+        """Close the span and hand it to the tracer (only the first call counts)"""
+        if self.outcome is not None:
+            return
+        self.outcome = outcome
+        self.tracer.complete(self, time.monotonic() - self.started)
+
+
+class NullSpan:
+    """Span used when tracing is disabled - every call is a no-op"""
+    event_id = None
+
+    @contextmanager
+    def stage(self, name):
+        yield
+
+    def record(self, name, seconds):
+        pass
+
+    def finish(self, outcome="spoken"):
+        pass
+
+
+class PipelineTracer:
+    """Collects spans, keeps a bounded sample per stage and optionally writes JSONL"""
+
+    def __init__(self, sink_path=None, max_samples=10000, enabled=True):
+        self.enabled = enabled
+        self.sink_path = sink_path
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._samples = {}
+        self._max_samples = max_samples
+        self._outcomes = {}
+        self._sink = None
+        self._pending_lines = 0
+        if sink_path:
+            self._sink = open(sink_path, "a", encoding="utf-8")
+
+    def start(self, kind, user=None, evt=None):
+        """Open a span for an incoming event"""
+        if not self.enabled:
+            return NullSpan()
+        span = TraceSpan(self, next(self._ids), kind, user)
+        created = event_create_time(evt) if evt is not None else None
+        if created:
+            span.record("delivery", max(0.0, time.time() - created))
+        return span
+
+    def complete(self, span, total):
+        """Store the finished span's timings"""
+        with self._lock:
+            for name, seconds in span.stages.items():
+                self._sample(name).append(seconds)
+            self._sample("total").append(total)
+            self._outcomes[span.outcome] = self._outcomes.get(span.outcome, 0) + 1
+
+            if self._sink:
+                record = {
+                    "id": span.event_id,
+                    "kind": span.kind,
+                    "user": span.user,
+                    "outcome": span.outcome,
+                    "total_ms": round(total * 1000, 3),
+                    "stages_ms": {k: round(v * 1000, 3) for k, v in span.stages.items()},
+                    "offsets_ms": {k: round(v * 1000, 3) for k, v in span.stamps.items()},
+                }
+                self._sink.write(json.dumps(record, ensure_ascii=False) + "\n")
+                self._pending_lines += 1
+                if self._pending_lines >= 50:
+                    self._sink.flush()
+                    self._pending_lines = 0
+
+    def _sample(self, name):
+        if name not in self._samples:
+            self._samples[name] = deque(maxlen=self._max_samples)
+        return self._samples[name]
+
+    def summary(self):
+        """Return {stage: {"count", "p50", "p95", "p99"}} in milliseconds"""
+        with self._lock:
+            samples = {name: sorted(values) for name, values in self._samples.items()}
+        return summarize(samples)
+
+    def outcomes(self):
+        """Return how many spans ended in each outcome"""
+        with self._lock:
+            return dict(self._outcomes)
+
+    def report(self):
+        """Human readable p50/p95/p99 table"""
+        return format_report(self.summary(), self.outcomes())
+
+    def close(self):
+        """Flush and close the JSONL sink"""
+        with self._lock:
+            if self._sink:
+                self._sink.close()
+                self._sink = None
+
+
+def summarize(samples):
+    """Turn {stage: sorted seconds} into a percentile summary in milliseconds"""
+    result = {}
+    for name, values in samples.items():
+        if not values:
+            continue
+        entry = {"count": len(values)}
+        for pct in PERCENTILES:
+            entry[f"p{pct}"] = percentile(values, pct) * 1000
+        result[name] = entry
+    return result
+
+
+def format_report(summary, outcomes=None):
+    """Format a summary as report lines"""
+    if not summary:
+        return ["📈 No trace data collected yet"]
+    lines = ["📈 Pipeline trace report (ms)",
+             f"{'stage':<12}{'count':>8}{'p50':>10}{'p95':>10}{'p99':>10}"]
+    ordered = [s for s in STAGES if s in summary] + sorted(s for s in summary if s not in STAGES)
+    for name in ordered:
+        row = summary[name]
+        lines.append(f"{name:<12}{row['count']:>8}{row['p50']:>10.1f}{row['p95']:>10.1f}{row['p99']:>10.1f}")
+    if outcomes:
+        lines.append("outcomes: " + ", ".join(f"{k}={v}" for k, v in sorted(outcomes.items())))
+    return lines
+
+
+def report_from_file(path):
+    """Build a report from a JSONL trace written by a previous run"""
+    samples = {}
+    outcomes = {}
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            for name, ms in record.get("stages_ms", {}).items():
+                samples.setdefault(name, []).append(ms / 1000.0)
+            samples.setdefault("total", []).append(record.get("total_ms", 0) / 1000.0)
+            outcome = record.get("outcome")
+            outcomes[outcome] = outcomes.get(outcome, 0) + 1
+    return format_report(summarize({k: sorted(v) for k, v in samples.items()}), outcomes)
@@ -0,0 +1,218 @@
+"""
+Playback Engine - one persistent audio output, utterances back to back
+With sounddevice installed (optional) a single output stream stays open and
+decoded PCM is written to it one utterance after another, so there is no
+player start-up or gap between lines. Up to `prefetch` utterances wait
+synthesized and decoded while the current one plays; skip() cuts the current
+line short and clear() drops the waiting ones too. Without sounddevice (or
+for audio it can't decode) each line is written to a file and played with
+playsound as before.
+"""
+import io
+import os
+import time
+import wave
+import threading
+from collections import deque
+
+from lazy_imports import module_available
+from audio_processing import read_wav, resample
+
+SAMPLE_RATE = 24000  # Google LINEAR16 output; other rates are resampled to this
+CHUNK_SECONDS = 0.05  # skip() takes effect within one chunk
+
+
+class _Queued:
+    __slots__ = ("pcm", "path", "span", "on_done")
+
+    def __init__(self, pcm=None, path=None, span=None, on_done=None):
+        self.pcm = pcm
+        self.path = path
+        self.span = span
+        self.on_done = on_done
+
+
+class PlaybackEngine:
+    """submit() from the speech worker; a player thread plays everything in submission order"""
+
+    def __init__(self, play_file, audio_dir="tts_audio", prefetch=2, use_device=True, log=None):
+        self.play_file = play_file
+        self.audio_dir = audio_dir
+        self.prefetch = prefetch
+        self.use_device = use_device
+        self.log = log or (lambda message, level="info": None)
+        self.backend = None
+        self.stream = None
+        self.played = 0
+        self.skipped = 0
+        self.pending = deque()
+        self._cond = threading.Condition()
+        self._skip = threading.Event()
+        self._thread = None
+        self._closing = False
+
+    def _open(self):
+        """Pick the output once: a persistent sounddevice stream, else playsound files"""
+        self.backend = "playsound"
+        if not self.use_device or not module_available("sounddevice"):
+            return
+        try:
+            import sounddevice
+            self.stream = sounddevice.RawOutputStream(samplerate=SAMPLE_RATE, channels=1, dtype="int16")
+            self.stream.start()
+            self.backend = "sounddevice"
+        except Exception as e:
+            self.stream = None
+            self.log(f"⚠️ Audio device unavailable ({e}) - playing through playsound", "warning")
+
+    def submit(self, audio, extension, span=None, on_done=None):
+        """Decode (or write) now, then wait for room among the `prefetch` queued utterances"""
+        with self._cond:
+            if self.backend is None:
+                self._open()
+            if self._thread is None:
+                self._closing = False
+                self._thread = threading.Thread(target=self._run, name="playback", daemon=True)
+                self._thread.start()
+        item = self._prepare(audio, extension, span, on_done)
+        with self._cond:
+            while len(self.pending) >= max(1, self.prefetch) and not self._closing:
+                self._cond.wait()
+            self.pending.append(item)
+            self._cond.notify_all()
+
+    def _prepare(self, audio, extension, span, on_done):
+        if self.stream is not None and extension == "wav":
+            try:
+                channels, sample_width, frame_rate, pcm = read_wav(audio)
+                if channels == 1 and sample_width == 2:
+                    return _Queued(pcm=resample(pcm, frame_rate, SAMPLE_RATE), span=span, on_done=on_done)
+            except (wave.Error, EOFError):
+                pass
+        start = time.monotonic()
+        path = self._write_file(audio, extension)
+        if span is not None:
+            span.record("file_write", time.monotonic() - start)
+        return _Queued(path=path, span=span, on_done=on_done)
+
+    def _write_file(self, audio, extension):
+        # Unique per thread so concurrent utterances never share a file
+        path = os.path.join(self.audio_dir, f"{time.time_ns()}_{threading.get_ident()}.{extension}")
+        with open(path, "wb") as f:
+            f.write(audio)
+        return path
+
+    def _pcm_to_file(self, pcm):
+        """WAV file for a line decoded for the device before the device went away"""
+        buffer = io.BytesIO()
+        with wave.open(buffer, "wb") as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(SAMPLE_RATE)
+            wav.writeframes(pcm)
+        return self._write_file(buffer.getvalue(), "wav")
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self.pending:
+                    if self._closing:
+                        return
+                    self._cond.wait()
+                item = self.pending.popleft()
+                self._cond.notify_all()
+            self._skip.clear()
+            start = time.monotonic()
+            error = None
+            try:
+                if item.pcm is not None and self.backend != "sounddevice":
+                    # Decoded for the device, which has since failed - play it from a file instead
+                    item.path, item.pcm = self._pcm_to_file(item.pcm), None
+                if item.pcm is not None:
+                    self._play_pcm(item.pcm)
+                    outcome = "skipped" if self._skip.is_set() else "spoken"
+                else:
+                    # playsound can't be interrupted, so a skip() during the line doesn't cut it short
+                    self.play_file(item.path)
+                    outcome = "spoken"
+            except Exception as e:
+                outcome, error = "error", e
+                if item.pcm is not None:
+                    # The device went away - later lines fall back to files
+                    self._close_stream()
+                    self.backend = "playsound"
+            finally:
+                if item.path:
+                    try:
+                        os.remove(item.path)
+                    except OSError:
+                        pass
+            if item.span is not None:
+                item.span.record("playback", time.monotonic() - start)
+            self._finish(item, outcome, error)
+
+    def _play_pcm(self, pcm):
+        # Blocking writes in short chunks: back-to-back lines stay gapless, skip() stays responsive
+        step = int(SAMPLE_RATE * CHUNK_SECONDS) * 2
+        view = memoryview(pcm)
+        for offset in range(0, len(pcm), step):
+            if self._skip.is_set():
+                return
+            self.stream.write(view[offset:offset + step])
+
+    def _finish(self, item, outcome, error=None):
+        if outcome == "spoken":
+            self.played += 1
+        elif outcome == "skipped":
+            self.skipped += 1
+        if item.on_done:
+            try:
+                item.on_done(outcome, error)
+            except Exception as e:
+                self.log(f"❌ Playback callback error: {e}", "error")
+
+    def skip(self):
+        """Cut the current utterance short (playsound can't be interrupted - it just finishes)"""
+        self._skip.set()
+
+    def clear(self):
+        """Drop every waiting utterance and skip the current one"""
+        with self._cond:
+            dropped = list(self.pending)
+            self.pending.clear()
+            self._cond.notify_all()
+        self.skip()
+        for item in dropped:
+            if item.path:
+                try:
+                    os.remove(item.path)
+                except OSError:
+                    pass
+            self._finish(item, "skipped")
+        return len(dropped)
+
+    def _close_stream(self):
+        if self.stream is not None:
+            try:
+                self.stream.stop()
+                self.stream.close()
+            except Exception:
+                pass
+            self.stream = None
+
+    def close(self, drain=True, timeout=None):
+        """Stop the player - after the queued utterances (drain) or right away"""
+        if not drain:
+            self.clear()
+        with self._cond:
+            self._closing = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self._close_stream()
+        self.backend = None
+
+    def status(self):
+        return {"backend": self.backend or "idle", "queued": len(self.pending),
+                "played": self.played, "skipped": self.skipped}
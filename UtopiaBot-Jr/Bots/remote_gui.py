@@ -0,0 +1,269 @@
+"""
+Remote GUI - Tk front end for a bot running with --daemon
+Runs in its own process and talks to the bot only through the control API,
+so redrawing the window never competes with chat-to-speech for the GIL.
+A reader thread buffers the event stream (bounded - oldest lines are dropped
+if the window can't keep up) and the Tk loop renders it in batches.
+"""
+import json
+import time
+import threading
+import http.client
+from collections import deque
+from urllib.parse import urlsplit
+
+import tkinter as tk
+from tkinter import ttk, scrolledtext
+
+from speech_budget import describe_status
+
+LEVEL_COLORS = {
+    "info": "#ffffff",
+    "success": "#22c55e",
+    "warning": "#fbbf24",
+    "error": "#ef4444",
+    "tts": "#4a9eff",
+    "welcome": "#4ade80",
+}
+STATUS_COLORS = {"Online": "#22c55e", "Connected": "#22c55e", "Offline": "#fbbf24",
+                 "Error": "#ef4444", "Disconnected": "#b3b3b3"}
+
+
+class ControlClient:
+    """Blocking JSON calls to the control API"""
+
+    def __init__(self, base_url, token=None, timeout=10):
+        url = urlsplit(base_url if "//" in base_url else "http://" + base_url)
+        self.host = url.hostname or "127.0.0.1"
+        self.port = url.port or 8765
+        self.token = token
+        self.timeout = timeout
+
+    def headers(self):
+        headers = {"Content-Type": "application/json"}
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        return headers
+
+    def connection(self, timeout=None):
+        return http.client.HTTPConnection(self.host, self.port, timeout=timeout or self.timeout)
+
+    def call(self, method, path, body=None):
+        """Returns (status, payload); status 0 if the bot is unreachable"""
+        conn = self.connection()
+        try:
+            conn.request(method, path, json.dumps(body) if body is not None else None, self.headers())
+            response = conn.getresponse()
+            return response.status, json.loads(response.read() or b"{}")
+        except (OSError, ValueError, http.client.HTTPException) as e:
+            return 0, {"error": str(e)}
+        finally:
+            conn.close()
+
+
+class EventStreamReader(threading.Thread):
+    """Follows GET /events, reconnecting as needed, into a bounded buffer"""
+
+    def __init__(self, client, max_pending=5000):
+        super().__init__(name="event-stream", daemon=True)
+        self.client = client
+        self.pending = deque(maxlen=max_pending)
+        self.dropped = 0
+        self.connected = False
+        self.stopped = threading.Event()
+
+    def run(self):
+        while not self.stopped.is_set():
+            conn = self.client.connection(timeout=30)
+            try:
+                conn.request("GET", "/events", headers=self.client.headers())
+                response = conn.getresponse()
+                if response.status != 200:
+                    raise http.client.HTTPException(f"HTTP {response.status}")
+                self.connected = True
+                while not self.stopped.is_set():
+                    line = response.readline()
+                    if not line:
+                        break
+                    line = line.strip()
+                    if not line:
+                        continue  # heartbeat
+                    if len(self.pending) == self.pending.maxlen:
+                        self.dropped += 1
+                    self.pending.append(json.loads(line))
+            except (OSError, ValueError, http.client.HTTPException):
+                pass
+            finally:
+                self.connected = False
+                conn.close()
+            self.stopped.wait(2)
+
+    def drain(self, max_items):
+        batch = []
+        while self.pending and len(batch) < max_items:
+            batch.append(self.pending.popleft())
+        return batch
+
+    def stop(self):
+        self.stopped.set()
+
+
+class RemoteGUI:
+    """Window with the main controls, stats, activity log and joined users"""
+
+    def __init__(self, base_url="http://127.0.0.1:8765", token=None, refresh_ms=100,
+                 max_batch=500, max_log_lines=2000):
+        self.client = ControlClient(base_url, token)
+        self.reader = EventStreamReader(self.client)
+        self.refresh_ms = refresh_ms
+        self.max_batch = max_batch
+        self.max_log_lines = max_log_lines
+        self.stats = {}
+        self.reported_drops = 0
+
+        self.colors = {
+            'bg_dark': '#1a1a1a',
+            'bg_medium': '#2d2d2d',
+            'text_primary': '#ffffff',
+            'text_secondary': '#b3b3b3',
+        }
+        self.root = tk.Tk()
+        self.root.title(f"TikTok TTS Bot - Remote ({self.client.host}:{self.client.port})")
+        self.root.geometry("900x700")
+        self.root.configure(bg=self.colors['bg_dark'])
+        ttk.Style().theme_use('clam')
+        self.setup_layout()
+
+    def setup_layout(self):
+        frame = tk.Frame(self.root, bg=self.colors['bg_dark'])
+        frame.pack(fill='both', expand=True, padx=10, pady=10)
+
+        self.status_label = tk.Label(frame, text="Status: Connecting to bot...", font=("Arial", 12, "bold"),
+                                     bg=self.colors['bg_dark'], fg=self.colors['text_secondary'])
+        self.status_label.pack(anchor='w')
+
+        buttons = tk.Frame(frame, bg=self.colors['bg_dark'])
+        buttons.pack(fill='x', pady=8)
+        for text, path in (("▶️ Start", "/start"), ("⏹️ Stop", "/stop"), ("🔊 Test TTS", "/test-tts"), ("⏭️ Skip", "/skip"),
+                           ("🔄 Reset Rate Limit", "/reset-rate-limit"), ("💾 Export", "/export")):
+            ttk.Button(buttons, text=text, command=lambda p=path: self.post(p)).pack(side='left', padx=(0, 6))
+
+        voice_row = tk.Frame(frame, bg=self.colors['bg_dark'])
+        voice_row.pack(fill='x', pady=(0, 8))
+        tk.Label(voice_row, text="Voice:", bg=self.colors['bg_dark'], fg=self.colors['text_primary']).pack(side='left')
+        self.voice_entry = ttk.Entry(voice_row, width=30)
+        self.voice_entry.pack(side='left', padx=6)
+        ttk.Button(voice_row, text="🎵 Set Voice",
+                   command=lambda: self.post("/voice", {"voice": self.voice_entry.get().strip()})).pack(side='left')
+
+        self.stats_labels = {}
+        stats_frame = tk.Frame(frame, bg=self.colors['bg_medium'])
+        stats_frame.pack(fill='x', pady=(0, 8))
+        for column, (title, key) in enumerate((("Messages", "messages"), ("Welcomed", "welcomes"),
+                                               ("Returning", "returning"), ("Jokes", "jokes"),
+                                               ("Gifts", "gifts"), ("Likes", "likes"), ("TTS Budget", "budget"),
+                                               ("Unique Users", "unique_users"), ("Uptime", "uptime"))):
+            tk.Label(stats_frame, text=title, bg=self.colors['bg_medium'],
+                     fg=self.colors['text_secondary']).grid(row=0, column=column, padx=10, pady=(6, 0))
+            label = tk.Label(stats_frame, text="0", font=("Arial", 12, "bold"),
+                             bg=self.colors['bg_medium'], fg=self.colors['text_primary'])
+            label.grid(row=1, column=column, padx=10, pady=(0, 6))
+            self.stats_labels[key] = label
+
+        panes = tk.PanedWindow(frame, orient='horizontal', bg=self.colors['bg_dark'], sashwidth=4)
+        panes.pack(fill='both', expand=True)
+        self.log_text = scrolledtext.ScrolledText(panes, bg=self.colors['bg_medium'], fg=self.colors['text_primary'],
+                                                  font=("Consolas", 9), state='disabled', wrap='word')
+        for level, color in LEVEL_COLORS.items():
+            self.log_text.tag_config(level, foreground=color)
+        panes.add(self.log_text, stretch='always')
+        self.users_list = tk.Listbox(panes, bg=self.colors['bg_medium'], fg=self.colors['text_primary'], width=28)
+        panes.add(self.users_list)
+
+    def post(self, path, body=None):
+        """Fire a control call off the Tk thread and log the outcome"""
+        def worker():
+            status, payload = self.client.call("POST", path, body if body is not None else {})
+            if status == 0 or status >= 400:
+                message = f"❌ {path}: {payload.get('error', status)}"
+                self.root.after(0, self.append_log, [(message, "error")])
+        threading.Thread(target=worker, daemon=True).start()
+
+    def pump(self):
+        """Render whatever arrived since the last tick, in one pass"""
+        events = self.reader.drain(self.max_batch)
+        log_lines = []
+        joins = []
+        for event in events:
+            kind = event.get("kind")
+            if kind == "log":
+                stamp = time.strftime("%H:%M:%S", time.localtime(event.get("ts", time.time())))
+                log_lines.append((f"[{stamp}] {event.get('message', '')}", event.get("level", "info")))
+            elif kind == "join":
+                joins.append(f"{'🔁' if event.get('returning') else '👋'} {event.get('user')}")
+            elif kind == "stats":
+                self.stats.update({k: v for k, v in event.items() if k not in ("kind", "ts")})
+            elif kind == "dropped":
+                log_lines.append((f"⚠️ Bot dropped {event.get('count')} events for this window", "warning"))
+        dropped = self.reader.dropped - self.reported_drops
+        if dropped:
+            self.reported_drops = self.reader.dropped
+            log_lines.append((f"⚠️ Window fell behind - skipped {dropped} events", "warning"))
+        if log_lines:
+            self.append_log(log_lines)
+        if joins:
+            self.users_list.insert('end', *joins)
+            overflow = self.users_list.size() - self.max_log_lines
+            if overflow > 0:
+                self.users_list.delete(0, overflow - 1)
+            self.users_list.see('end')
+        self.update_stats()
+        # Catch up faster when a backlog is waiting
+        self.root.after(1 if self.reader.pending else self.refresh_ms, self.pump)
+
+    def append_log(self, lines):
+        self.log_text.config(state='normal')
+        for message, level in lines:
+            self.log_text.insert('end', message + "\n", level)
+        excess = int(self.log_text.index('end-1c').split('.')[0]) - self.max_log_lines
+        if excess > 0:
+            self.log_text.delete('1.0', f"{excess + 1}.0")
+        self.log_text.config(state='disabled')
+        self.log_text.see('end')
+
+    def update_stats(self):
+        if not self.reader.connected:
+            self.status_label.config(text="Status: Bot unreachable - retrying...", fg="#ef4444")
+            return
+        connection = self.stats.get("connection", "Disconnected")
+        running = "running" if self.stats.get("running") else "stopped"
+        self.status_label.config(text=f"Status: @{self.stats.get('username', '?')} {connection} ({running})",
+                                 fg=STATUS_COLORS.get(connection, self.colors['text_secondary']))
+        for key, label in self.stats_labels.items():
+            value = self.stats.get(key, 0)
+            if key == "uptime":
+                value = time.strftime("%H:%M:%S", time.gmtime(value or 0))
+            elif key == "budget":
+                value = describe_status(value or {})
+            label.config(text=str(value))
+
+    def run(self):
+        self.reader.start()
+        self.root.after(self.refresh_ms, self.pump)
+        try:
+            self.root.mainloop()
+        finally:
+            self.reader.stop()
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description='Remote GUI for a TikTok TTS Bot running with --daemon')
+    parser.add_argument('url', nargs='?', default='http://127.0.0.1:8765', help='Control API address')
+    parser.add_argument('--token', help='Bearer token if the bot was started with --control-token')
+    args = parser.parse_args()
+    RemoteGUI(args.url, args.token).run()
+
+
+if __name__ == "__main__":
+    main()
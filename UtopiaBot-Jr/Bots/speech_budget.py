@@ -0,0 +1,127 @@
+"""
+Speech Budget - cap how many characters go to the TTS backend
+Google bills per synthesized character, and one pasted essay ties up the
+speaker for minutes. Viewer messages are cut to a per-message cap at a
+sentence (or word) boundary, and every utterance is charged against a
+rolling per-minute budget and an optional per-session budget as it is
+synthesized, so lines dropped from the queue cost nothing. When a line
+doesn't fit, chat falls back to "<user> sent a long message" (or is skipped)
+and everything else is skipped.
+"""
+import re
+import time
+import threading
+from collections import deque
+
+SENTENCE_END = re.compile(r"[.!?…](?=\s|$)")
+FALLBACKS = ("summarize", "skip")
+CHAT_CLASSES = ("chat", "first_chat")
+EXEMPT_CLASSES = ("test",)
+
+
+def truncate(text, limit):
+    """Shorten to at most `limit` characters, preferring a sentence end, then a word break"""
+    if len(text) <= limit:
+        return text
+    cut = text[:limit]
+    ends = [m.end() for m in SENTENCE_END.finditer(cut)]
+    if ends and ends[-1] >= limit // 2:
+        return cut[:ends[-1]]
+    cut = text[:max(1, limit - 3)]
+    space = cut.rfind(" ")
+    if space >= limit // 2:
+        cut = cut[:space]
+    return cut.rstrip(" ,;:-") + "..."
+
+
+def describe_status(status):
+    """Short text for a stats panel from status(), e.g. '2,400/min · 48,000 left'"""
+    parts = []
+    if status.get("minute_left") is not None:
+        parts.append(f"{status['minute_left']:,}/min")
+    if status.get("session_left") is not None:
+        parts.append(f"{status['session_left']:,} left")
+    return " · ".join(parts) or "unlimited"
+
+
+class SpeechBudget:
+    """Per-message cap plus rolling per-minute and per-session character budgets"""
+
+    def __init__(self, max_message_chars=200, per_minute=3000, per_session=0, fallback="summarize"):
+        self.configure(max_message_chars, per_minute, per_session, fallback)
+        self.session_chars = 0
+        self.truncated = 0
+        self.summarized = 0
+        self.skipped = 0
+        self._window = deque()  # (monotonic time, chars) charged in the last minute
+        self._window_chars = 0
+        self._lock = threading.Lock()
+
+    def configure(self, max_message_chars=None, per_minute=None, per_session=None, fallback=None):
+        """Retune (config reload); 0 disables a budget"""
+        if max_message_chars is not None:
+            self.max_message_chars = max_message_chars
+        if per_minute is not None:
+            self.per_minute = per_minute
+        if per_session is not None:
+            self.per_session = per_session
+        if fallback is not None:
+            self.fallback = fallback
+
+    def cap(self, text):
+        """Apply the per-message cap to viewer text"""
+        if not self.max_message_chars or len(text) <= self.max_message_chars:
+            return text
+        self.truncated += 1
+        return truncate(text, self.max_message_chars)
+
+    def _expire(self, now):
+        while self._window and now - self._window[0][0] >= 60:
+            self._window_chars -= self._window.popleft()[1]
+
+    def _room(self):
+        rooms = []
+        if self.per_minute:
+            rooms.append(self.per_minute - self._window_chars)
+        if self.per_session:
+            rooms.append(self.per_session - self.session_chars)
+        return min(rooms) if rooms else None
+
+    def _charge(self, now, chars):
+        self._window.append((now, chars))
+        self._window_chars += chars
+        self.session_chars += chars
+
+    def admit(self, text, message_class="chat", user=None):
+        """Charge an utterance; returns the text to speak (maybe the fallback) or None to skip"""
+        with self._lock:
+            now = time.monotonic()
+            self._expire(now)
+            room = self._room()
+            if message_class in EXEMPT_CLASSES or room is None or len(text) <= room:
+                self._charge(now, len(text))
+                return text
+            if self.fallback == "summarize" and message_class in CHAT_CLASSES and user:
+                summary = f"{user} sent a long message"
+                if len(summary) <= room:
+                    self.summarized += 1
+                    self._charge(now, len(summary))
+                    return summary
+            self.skipped += 1
+            return None
+
+    def status(self):
+        """Remaining budget (None = unlimited) and what the budget has done so far"""
+        with self._lock:
+            self._expire(time.monotonic())
+            return {
+                "minute_left": max(0, self.per_minute - self._window_chars) if self.per_minute else None,
+                "session_left": max(0, self.per_session - self.session_chars) if self.per_session else None,
+                "session_chars": self.session_chars,
+                "truncated": self.truncated,
+                "summarized": self.summarized,
+                "skipped": self.skipped,
+            }
+
+    def describe(self):
+        return describe_status(self.status())
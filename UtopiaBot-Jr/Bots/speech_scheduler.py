@@ -0,0 +1,204 @@
+"""
+Speech Scheduler - one ordered queue of utterances instead of a thread each
+Utterances are grouped into scheduling classes (commands, first-time chatters,
+welcomes, gifts, regular chat). Inside a class, viewers share airtime by
+weighted fair queuing, so one viewer spamming long messages can't starve the
+rest. Across classes the next utterance is the on-time one with the earliest
+deadline (enqueue time + the class latency target); anything that waited past
+its class's max_wait is dropped rather than read out late.
+"""
+import time
+import heapq
+import itertools
+import threading
+
+# message class -> scheduling class (anything not listed schedules as itself)
+SCHEDULE_CLASSES = {"help": "command", "joke": "command"}
+
+# scheduling class -> latency target / give-up time in seconds
+DEFAULT_CLASSES = {
+    "command": {"target": 3.0, "max_wait": 30.0},
+    "welcome": {"target": 2.0, "max_wait": 20.0},
+    "gift": {"target": 2.0, "max_wait": 60.0},
+    "first_chat": {"target": 4.0, "max_wait": 30.0},
+    "chat": {"target": 10.0, "max_wait": 30.0},
+    "test": {"target": 1.0, "max_wait": 60.0},
+}
+
+
+class _Utterance:
+    __slots__ = ("text", "span", "message_class", "user", "enqueued", "deadline", "expires", "voice")
+
+    def __init__(self, text, span, message_class, user, enqueued, deadline, expires, voice=None):
+        self.text = text
+        self.span = span
+        self.message_class = message_class
+        self.user = user
+        self.enqueued = enqueued
+        self.deadline = deadline
+        self.expires = expires
+        self.voice = voice
+
+
+class _ClassQueue:
+    """Weighted fair queue of one scheduling class: finish tag = max(V, user's last tag) + cost / weight"""
+
+    def __init__(self, name, target, max_wait):
+        self.name = name
+        self.target = target
+        self.max_wait = max_wait
+        self.heap = []
+        self.virtual_time = 0.0
+        self.user_finish = {}
+        self.user_pending = {}
+
+    def push(self, item, weight, seq):
+        start = max(self.virtual_time, self.user_finish.get(item.user, 0.0))
+        finish = start + max(1, len(item.text)) / weight
+        self.user_finish[item.user] = finish
+        self.user_pending[item.user] = self.user_pending.get(item.user, 0) + 1
+        heapq.heappush(self.heap, (finish, seq, item))
+
+    def head(self):
+        return self.heap[0][2] if self.heap else None
+
+    def pop(self):
+        finish, _, item = heapq.heappop(self.heap)
+        self.virtual_time = finish
+        left = self.user_pending[item.user] - 1
+        if left:
+            self.user_pending[item.user] = left
+        else:
+            # Nothing queued for this viewer, so their last tag is <= V - forget them
+            del self.user_pending[item.user]
+            del self.user_finish[item.user]
+        return item
+
+
+class SpeechScheduler:
+    """submit() from any thread; `workers` threads call speak(text, span, message_class, voice, user) in schedule order"""
+
+    def __init__(self, speak, classes=None, workers=1, log=None):
+        self.speak = speak
+        self.log = log or (lambda message, level="info": None)
+        self.workers = workers
+        self.queues = {}
+        self.submitted = 0
+        self.rejected = 0
+        self.spoken = {}
+        self.stale = {}
+        self.waits = {}
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._threads = []
+        self._stopping = False
+        self.configure(classes or DEFAULT_CLASSES)
+
+    def configure(self, classes):
+        """Set class targets (config reload) - queued utterances keep their deadlines"""
+        with self._cond:
+            for name, settings in classes.items():
+                queue = self.queues.get(name)
+                if queue is None:
+                    self.queues[name] = _ClassQueue(name, settings["target"], settings["max_wait"])
+                else:
+                    queue.target = settings["target"]
+                    queue.max_wait = settings["max_wait"]
+
+    def start(self):
+        with self._cond:
+            if self._threads:
+                return
+            self._stopping = False
+            for i in range(self.workers):
+                thread = threading.Thread(target=self._worker, name=f"speech-{i}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def submit(self, text, span=None, message_class="chat", user=None, weight=1.0, voice=None):
+        """Queue an utterance; `weight` is the viewer's share of their class (regulars > 1), `voice` overrides the selected one.
+        Returns False (and drops it) once stop() was called - only an explicit start() takes lines again"""
+        name = SCHEDULE_CLASSES.get(message_class, message_class)
+        with self._cond:
+            if self._stopping:
+                self.rejected += 1
+                if span is not None:
+                    span.finish("stopped")
+                return False
+            queue = self.queues.get(name) or self.queues["chat"]
+            now = time.monotonic()
+            item = _Utterance(text, span, message_class, user, now, now + queue.target, now + queue.max_wait, voice)
+            queue.push(item, max(weight, 0.01), next(self._seq))
+            self.submitted += 1
+            if not self._threads:
+                self.start()
+            self._cond.notify()
+        return True
+
+    def _next(self):
+        """Earliest deadline among on-time heads; if everything is late, the tightest class goes first"""
+        now = time.monotonic()
+        best = None
+        for queue in self.queues.values():
+            while queue.heap and queue.head().expires < now:
+                self._drop(queue, queue.pop(), "stale")
+            head = queue.head()
+            if head is None:
+                continue
+            key = (head.deadline < now, queue.target if head.deadline < now else head.deadline, head.enqueued)
+            if best is None or key < best[0]:
+                best = (key, queue)
+        return (best[1], best[1].pop()) if best else (None, None)
+
+    def _drop(self, queue, item, outcome):
+        if outcome == "stale":
+            self.stale[queue.name] = self.stale.get(queue.name, 0) + 1
+        if item.span is not None:
+            item.span.record("queue", time.monotonic() - item.enqueued)
+            item.span.finish(outcome)
+
+    def _worker(self):
+        while True:
+            with self._cond:
+                queue, item = self._next()
+                while item is None:
+                    if self._stopping:
+                        return
+                    self._cond.wait()
+                    queue, item = self._next()
+                name = queue.name
+                waited = time.monotonic() - item.enqueued
+                self.spoken[name] = self.spoken.get(name, 0) + 1
+                self.waits[name] = max(self.waits.get(name, 0.0), waited)
+            if item.span is not None:
+                item.span.record("queue", waited)
+            try:
+                self.speak(item.text, item.span, item.message_class, item.voice, item.user)
+            except Exception as e:
+                self.log(f"❌ Speech worker error: {e}", "error")
+
+    def depth(self):
+        with self._cond:
+            return sum(len(queue.heap) for queue in self.queues.values())
+
+    def stop(self, drain=True, timeout=None):
+        """Stop the workers - after speaking what's queued (drain) or dropping it"""
+        with self._cond:
+            if not drain:
+                for queue in self.queues.values():
+                    while queue.heap:
+                        self._drop(queue, queue.pop(), "dropped")
+            self._stopping = True
+            self._cond.notify_all()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for thread in self._threads:
+            thread.join(None if deadline is None else max(0.0, deadline - time.monotonic()))
+        self._threads = []
+
+    def stats(self):
+        """Per-class queued / spoken / stale counts and the worst wait seen (seconds)"""
+        with self._cond:
+            return {name: {"queued": len(queue.heap), "spoken": self.spoken.get(name, 0),
+                           "stale": self.stale.get(name, 0),
+                           "max_wait": round(self.waits.get(name, 0.0), 3)}
+                    for name, queue in self.queues.items()}
@@ -0,0 +1,106 @@
+"""
+Synthetic Events - offline stand-ins for TikTokLive Join/Comment events
+Used by the benchmark harness to drive the bot without going live
+"""
+import random
+
+BURST_SHAPES = ("steady", "poisson", "burst", "ramp")
+
+SAMPLE_MESSAGES = [
+    "hello", "hi everyone", "what game is this", "lets gooo", "gg",
+    "that was insane", "how long have you been streaming", "first time here",
+    "love the stream", "can you say hi to me", "lol", "no way",
+    "what are your settings", "play some music", "where are you from",
+    "this is so fun", "follow for follow", "good morning from texas",
+]
+SAMPLE_COMMANDS = ["!joke", "!yo-mama", "!help"]
+SAMPLE_EMOJI = ["😂", "🔥", "❤️", "👋", "🎮", "😭", "💯", "🙏", "😎", "🤣", "👀", "🥳"]
+
+
+class SyntheticUser:
+    """Mimics TikTokLive's User object (only the fields the bot reads)"""
+
+    def __init__(self, unique_id):
+        self.unique_id = unique_id
+
+
+class SyntheticJoinEvent:
+    """Mimics TikTokLive JoinEvent"""
+
+    def __init__(self, user):
+        self.user = SyntheticUser(user)
+
+
+class SyntheticCommentEvent:
+    """Mimics TikTokLive CommentEvent"""
+
+    def __init__(self, user, comment):
+        self.user = SyntheticUser(user)
+        self.comment = comment
+
+
+class SyntheticEventGenerator:
+    """Yields (offset_seconds, event) pairs with a configurable traffic shape"""
+
+    def __init__(self, rate=50.0, events=1000, shape="steady", duplicate_ratio=0.1,
+                 emoji_density=0.2, join_ratio=0.2, command_ratio=0.05, users=200,
+                 burst_size=50, seed=None):
+        if shape not in BURST_SHAPES:
+            raise ValueError(f"Unknown burst shape '{shape}' (choose from {', '.join(BURST_SHAPES)})")
+        self.rate = max(0.001, float(rate))
+        self.events = int(events)
+        self.shape = shape
+        self.duplicate_ratio = duplicate_ratio
+        self.emoji_density = emoji_density
+        self.join_ratio = join_ratio
+        self.command_ratio = command_ratio
+        self.users = [f"viewer_{i:05d}" for i in range(max(1, users))]
+        self.burst_size = max(1, burst_size)
+        self.rng = random.Random(seed)
+
+    def offsets(self):
+        """Arrival times (seconds from start) for every event"""
+        offset = 0.0
+        interval = 1.0 / self.rate
+        for i in range(self.events):
+            if self.shape == "steady":
+                offset = i * interval
+            elif self.shape == "poisson":
+                offset += self.rng.expovariate(self.rate)
+            elif self.shape == "burst":
+                # Whole bursts land at once, spaced so the average rate still matches
+                offset = (i // self.burst_size) * self.burst_size * interval
+            elif self.shape == "ramp":
+                # Rate climbs linearly from ~0 to 2x the target over the run
+                progress = (i + 1) / self.events
+                offset += interval / max(0.05, 2 * progress)
+            yield offset
+
+    def make_text(self):
+        """Random chat text with the configured emoji density"""
+        if self.rng.random() < self.command_ratio:
+            return self.rng.choice(SAMPLE_COMMANDS)
+        words = self.rng.choice(SAMPLE_MESSAGES).split()
+        out = []
+        for word in words:
+            out.append(word)
+            if self.rng.random() < self.emoji_density:
+                out.append(self.rng.choice(SAMPLE_EMOJI) * self.rng.randint(1, 3))
+        return " ".join(out)
+
+    def __iter__(self):
+        recent = []
+        for offset in self.offsets():
+            user = self.rng.choice(self.users)
+            if self.rng.random() < self.join_ratio:
+                yield offset, SyntheticJoinEvent(user)
+                continue
+            if recent and self.rng.random() < self.duplicate_ratio:
+                # Repeat an earlier (user, text) pair exactly - should hit dedup
+                user, text = self.rng.choice(recent)
+            else:
+                text = self.make_text()
+                recent.append((user, text))
+                if len(recent) > 100:
+                    recent.pop(0)
+            yield offset, SyntheticCommentEvent(user, text)
@@ -0,0 +1,113 @@
+"""
+Text Normalizer - turns raw chat text into short, speakable text
+Emoji are looked up in a trie built once from the emoji package, repeated
+emoji/characters are collapsed, and results are cached for repeated messages.
+"""
+import re
+import threading
+from functools import lru_cache
+
+# Zero-width joiner and variation selectors left over after matching
+_INVISIBLE = {"\u200d", "\ufe0e", "\ufe0f"}
+# Letters only, so numbers like "1000" survive; "www." is a web address, not a stretch
+_REPEATED_CHARS = re.compile(r"(?!(?i:www\.))([^\W\d_])\1{2,}")
+_REPEATED_PUNCT = re.compile(r"([^\w\s])\1+")
+_WHITESPACE = re.compile(r"\s+")
+_END = None  # trie key marking "an emoji ends here"
+
+
+def emoji_name(data):
+    """Speakable name from an EMOJI_DATA entry (':face_with_tears_of_joy:' -> 'face with tears of joy')"""
+    return data.get("en", "").strip(":").replace("_", " ").strip()
+
+
+class TextNormalizer:
+    """Precompiled emoji lookup plus repeat-collapsing rules, with an LRU cache"""
+
+    def __init__(self, cache_size=4096, max_repeat_chars=2, collapse_emoji=True, emoji_data=None):
+        self.max_repeat_chars = max_repeat_chars
+        self.collapse_emoji = collapse_emoji
+        self._emoji_data = emoji_data
+        self._trie = None
+        self._first_chars = frozenset()
+        self._build_lock = threading.Lock()
+        self.normalize = lru_cache(maxsize=cache_size)(self._normalize)
+
+    def warm_up(self):
+        """Build the emoji trie now (call from a background thread at start-up)"""
+        if self._trie is None:
+            with self._build_lock:
+                if self._trie is None:
+                    self._build_trie(self._load_emoji_data())
+        return self
+
+    def _load_emoji_data(self):
+        if self._emoji_data is not None:
+            return self._emoji_data
+        try:
+            import emoji
+            return emoji.EMOJI_DATA
+        except ImportError:
+            return {}
+
+    def _build_trie(self, data):
+        trie = {}
+        for symbol, info in data.items():
+            name = emoji_name(info)
+            if not name:
+                continue
+            node = trie
+            for ch in symbol:
+                node = node.setdefault(ch, {})
+            node[_END] = name
+        self._first_chars = frozenset(trie)
+        self._trie = trie
+
+    def demojize(self, text):
+        """Replace emoji with their names; identical emoji in a row are spoken once"""
+        if text.isascii():
+            return text
+        if self._trie is None:
+            self.warm_up()
+        out = []
+        last_name = None
+        i = 0
+        length = len(text)
+        while i < length:
+            ch = text[i]
+            if ch in self._first_chars:
+                # Longest match walk through the trie
+                node = self._trie
+                j = i
+                match_name, match_end = None, i
+                while j < length and text[j] in node:
+                    node = node[text[j]]
+                    j += 1
+                    if _END in node:
+                        match_name, match_end = node[_END], j
+                if match_name:
+                    if not (self.collapse_emoji and match_name == last_name):
+                        out.append(f" {match_name} ")
+                    last_name = match_name
+                    i = match_end
+                    continue
+            if ch in _INVISIBLE:
+                i += 1
+                continue
+            if not ch.isspace():
+                last_name = None
+            out.append(ch)
+            i += 1
+        return "".join(out)
+
+    def _normalize(self, text):
+        text = self.demojize(text)
+        if self.max_repeat_chars:
+            keep = r"\1" * self.max_repeat_chars
+            text = _REPEATED_CHARS.sub(keep, text)
+        text = _REPEATED_PUNCT.sub(r"\1", text)
+        return _WHITESPACE.sub(" ", text).strip()
+
+    def cache_info(self):
+        """LRU cache statistics (hits, misses, maxsize, currsize)"""
+        return self.normalize.cache_info()
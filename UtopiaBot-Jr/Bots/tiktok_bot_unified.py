@@ -6,43 +6,61 @@ import os
 import sys
 import time
 import asyncio
+import inspect
 import logging
 from datetime import datetime
 import threading
 import queue
-import random
 import argparse
-import requests
-import webbrowser
 
-# Core bot imports
-from TikTokLive import TikTokLiveClient
-from TikTokLive.events import ConnectEvent, CommentEvent, JoinEvent
-from google.cloud import texttospeech
-from playsound import playsound
-import emoji
+# Local modules
+import lazy_imports
+from lazy_imports import lazy_import, module_available
+from pipeline_tracing import NullSpan, report_from_file
+from tts_backends import MESSAGE_CLASSES
+from session_replay import SessionRecorder, replay_session
+from bot_services import BotServices
+from connection_supervisor import ConnectionSupervisor, CircuitBreaker
+from event_bus import EventBus
+from speech_scheduler import SpeechScheduler
+from audio_processing import SpeakingRate
+from playback import PlaybackEngine
+from event_aggregator import EventAggregator, gift_details, like_count, plural
+from language_detect import GOOGLE_LANGUAGE
+from links_model import LinksFile, ROW_HEIGHTS
+from exporters import (ExportJob, EXPORT_FORMATS, COMPRESSIONS, viewers_source,
+                       joins_source, memory_joins_source, transcript_source)
 
-# GUI imports (optional)
-try:
-    import tkinter as tk
-    from tkinter import ttk, scrolledtext, messagebox
-    GUI_AVAILABLE = True
-except ImportError:
-    GUI_AVAILABLE = False
+# Core bot imports - deferred until first use so start-up and --help stay fast
+TikTokLive = lazy_import("TikTokLive")
+tiktok_events = lazy_import("TikTokLive.events")
+playsound_module = lazy_import("playsound")
+
+# GUI imports (optional, loaded only when the GUI is built)
+GUI_AVAILABLE = module_available("tkinter", "_tkinter")
+if GUI_AVAILABLE:
+    tk = lazy_import("tkinter")
+    ttk = lazy_import("tkinter.ttk")
+    scrolledtext = lazy_import("tkinter.scrolledtext")
+    messagebox = lazy_import("tkinter.messagebox")
+else:
     print("⚠️ GUI not available - tkinter not installed. Running in command-line mode only.")
 
 class TikTokTTSBot:
-    def __init__(self, username="gamingutopiadf", gui_mode=False):
+    def __init__(self, username="gamingutopiadf", gui_mode=False, trace_path=None,
+                 tts_routes=None, failover_latency=2.5, failover_error_rate=0.3,
+                 record_path=None, viewer_db="data/viewers.db", transcript_dir="transcripts",
+                 services=None, voice_name=None, config_path="config/bot.toml", player=None):
         # Configuration
         self.username = username
         self.gui_mode = gui_mode
-        self.audio_dir = "tts_audio"
-        self.jokes_file = "jokes/random/random.txt"
-        self.yo_mama_file = "jokes/yo_mama/yo_mama.txt"
-        
-        # Create audio directory
-        os.makedirs(self.audio_dir, exist_ok=True)
+        self.daemon_mode = False
+        self.daemon_loop = None
+        self.voice_name = voice_name
+        self.services = None
         
+        # Live events (log lines, joins, comments) for control API / remote GUI subscribers
+        self.events = EventBus()
         # Set up Google Cloud credentials using script directory
         script_dir = os.path.dirname(os.path.abspath(__file__))
         credentials_path = os.path.join(script_dir, "..", "key", "ivory-oarlock-410506-865276f8b548.json")
@@ -54,10 +72,52 @@ class TikTokTTSBot:
             self.log("⚠️ Google Cloud credentials not found", "warning")
             self.log(f"🔍 Looking for credentials at: {credentials_path}", "info")
         
+        # Normalizer, TTS router, tracer, viewer history and transcript - shared when
+        # a multi-stream host passes its own services in
+        self.owns_services = services is None
+        self.services = services or BotServices(trace_path=trace_path, tts_routes=tts_routes,
+                                                failover_latency=failover_latency,
+                                                failover_error_rate=failover_error_rate,
+                                                viewer_db=viewer_db, transcript_dir=transcript_dir,
+                                                log=self.log, config_path=config_path)
+        self.normalizer = self.services.normalizer
+        self.viewer_store = self.services.viewer_store
+        self.viewer_index = self.services.viewer_index
+        self.tracer = self.services.tracer
+        self.transcript = self.services.transcript
+        self.tts_router = self.services.tts_router
+        self.budget = self.services.budget
+        self.voice_catalog = self.services.voice_catalog
+        self.language_detector = self.services.language_detector
+        self.content_filter = self.services.content_filter
+        self.loudness = self.services.loudness
+        
+        # Paths, voices, throttles and help text come from config/bot.toml (see bot_config.py)
+        self.audio_dir = self.config.audio_dir
+        os.makedirs(self.audio_dir, exist_ok=True)
+        self.services.add_config_listener(self.apply_config)
+        
         # TTS Deduplication
         self.spoken_messages = set()
         self.last_reset = time.time()
-        self.reset_interval = 300  # 5 minutes
+        
+        # Utterances play one at a time in priority order (class latency targets, fair share per viewer)
+        self.speech_scheduler = SpeechScheduler(self.speak, classes=self.config.speech_classes, log=self.log)
+        self.chatters = set()  # viewers who have commented this session
+        self.language_voices = {}  # (language, selected voice, catalog version) -> voice name or None
+        self.regulars = set()  # viewers greeted with "welcome back"
+        self.new_viewers = set()  # first seen this session through a comment (not a returning viewer)
+        self.speaking_rate = SpeakingRate(self.config.rate_start_depth, self.config.rate_step, self.config.max_rate)
+        # A multi-stream host passes one engine for every stream, so they take turns on the device
+        self.owns_player = player is None
+        self.player = player or PlaybackEngine(self.play_audio, self.audio_dir, prefetch=self.config.prefetch,
+                                               use_device=self.config.audio_device, log=self.log)
+        
+        # Gifts, likes, follows and shares are read out as one summary per window
+        self.aggregator = EventAggregator(self.announce_summary, window=self.config.event_window,
+                                          min_likes=self.config.min_likes, max_names=self.config.max_names,
+                                          kinds=self.config.announce_events, log=self.log,
+                                          on_gift=self.record_gift)
         
         # Bot state
         self.bot_client = None
@@ -66,19 +126,28 @@ class TikTokTTSBot:
         self.online_check_thread = None
         self.last_online_check = time.time()
         self.connection_status = "Disconnected"
-        self.connection_attempts = 0
-        self.last_connection_attempt = 0
-        self.rate_limit_cooldown = 60  # Wait 60 seconds after rate limit
-        self.connection_retry_delay = 30  # Start with 30 seconds between retries
-        self.failed_attempts = 0
-        self.auto_retry_enabled = True  # Enable automatic retries
-        self.max_retry_attempts = 3  # Maximum automatic retry attempts
+        
+        # Reconnects (classified errors, jittered backoff, circuit breaker) for GUI and CLI alike
+        self.supervisor = ConnectionSupervisor(self.run_bot_async, lambda: self.bot_running,
+                                               is_offline=lambda: self.connection_status == "Offline",
+                                               log=self.log, on_state=self.on_connection_state,
+                                               disconnect=self.disconnect_client,
+                                               policies=self.config.backoff,
+                                               stable_after=self.config.stable_after,
+                                               breaker=CircuitBreaker(self.config.breaker_threshold,
+                                                                      self.config.breaker_open_for))
         
         # Statistics
         self.stats = {
             "messages": 0,
             "jokes": 0,
             "welcomes": 0,
+            "returning": 0,
+            "gifts": 0,
+            "diamonds": 0,
+            "likes": 0,
+            "follows": 0,
+            "shares": 0,
             "start_time": None,
             "connection_checks": 0,
             "last_activity": None
@@ -88,6 +157,9 @@ class TikTokTTSBot:
         self.joined_users = []  # List of users who joined
         self.unique_users = set()  # Set to track unique users
         
+        # Optional recording of raw stream traffic for offline replay
+        self.recorder = SessionRecorder(record_path, username) if record_path else None
+        
         # GUI components (if in GUI mode)
         if self.gui_mode and GUI_AVAILABLE:
             self.setup_gui()
@@ -95,6 +167,39 @@ class TikTokTTSBot:
             # Command line setup
             self.setup_logging()
             
+    @property
+    def config(self):
+        """Current BotConfig - one shared object, replaced whole on reload"""
+        return self.services.config
+    
+    @property
+    def jokes_file(self):
+        return self.config.jokes_file
+    
+    @property
+    def yo_mama_file(self):
+        return self.config.yo_mama_file
+    
+    @property
+    def reset_interval(self):
+        return self.config.reset_interval
+    
+    def apply_config(self, config):
+        """Config reload - retune the running bot without touching the TikTok connection"""
+        if config.audio_dir != self.audio_dir:
+            os.makedirs(config.audio_dir, exist_ok=True)
+            self.audio_dir = config.audio_dir
+        self.supervisor.configure(policies=config.backoff, stable_after=config.stable_after,
+                                  breaker_threshold=config.breaker_threshold,
+                                  breaker_open_for=config.breaker_open_for)
+        self.speech_scheduler.configure(config.speech_classes)
+        self.speaking_rate.configure(config.rate_start_depth, config.rate_step, config.max_rate)
+        self.player.audio_dir = self.audio_dir
+        self.player.prefetch = config.prefetch
+        self.aggregator.configure(config.event_window, config.min_likes, config.max_names, config.announce_events)
+        if self.gui_mode and hasattr(self, 'voice_dropdown'):
+            self.root.after(0, self.refresh_voice_options)
+    
     def setup_logging(self):
         """Set up logging for command-line mode"""
         logging.basicConfig(level=logging.INFO)
@@ -102,6 +207,7 @@ class TikTokTTSBot:
         
     def log(self, message, level="info"):
         """Universal logging function"""
+        self.events.publish("log", message=message, level=level)
         if self.gui_mode and hasattr(self, 'log_queue'):
             # GUI mode - add to queue
             timestamp = datetime.now().strftime("%H:%M:%S")
@@ -129,59 +235,95 @@ class TikTokTTSBot:
             self.last_reset = time.time()
             self.log("🔄 TTS deduplication cache reset", "info")
     
-    def speak(self, text):
-        """Text-to-speech function"""
+    def current_voice_name(self):
+        """Google voice name currently selected (GUI dropdown or CLI default)"""
+        if hasattr(self, 'selected_voice') and hasattr(self, 'voice_options'):
+            selected_display = self.selected_voice.get()
+            return self.voice_options.get(selected_display, self.config.default_voice)
+        return self.voice_name or self.config.default_voice  # Fallback for CLI mode
+    
+    def voice_for_language(self, language):
+        """Voice to read a message in `language` - None keeps the selected voice"""
+        selected = self.current_voice_name()
+        if language == selected.split("-")[0] or language == GOOGLE_LANGUAGE.get(selected.split("-")[0]):
+            return None
+        if language in self.config.language_voices:
+            return self.config.language_voices[language]
+        key = (language, selected, self.voice_catalog.version)
+        if key not in self.language_voices:
+            # Same gender and tier as the selected voice where the catalog has one
+            current = self.voice_catalog.get(selected)
+            candidates = self.voice_catalog.voices(language=GOOGLE_LANGUAGE.get(language, language))
+            if current:
+                candidates = sorted(candidates, key=lambda v: (v.gender != current.gender, v.tier != current.tier))
+            self.language_voices[key] = candidates[0].name if candidates else None
+        return self.language_voices[key]
+    
+    def synthesize(self, text, message_class="chat", voice_name=None):
+        """Synthesize text and return (audio bytes, file extension) - faster under backlog, loudness-normalized"""
+        voice_name = voice_name or self.current_voice_name()
+        rate = self.speaking_rate.rate_for(self.speech_scheduler.depth())
+        audio_content, extension, backend_name = self.tts_router.synthesize(
+            text, message_class, voice_name, speaking_rate=rate)
+        return self.loudness.process(audio_content, extension, f"{backend_name}:{voice_name}"), extension
+    
+    def play_audio(self, path):
+        """Play an audio file and block until it finishes (used when no audio device stream is open)"""
+        playsound_module.playsound(path)
+    
+    def speak(self, text, span=None, message_class="chat", voice_name=None, user=None):
+        """Text-to-speech function - synthesize now, play once the lines queued ahead have played"""
+        span = span or NullSpan()
+        # Charged here rather than when queued, so lines dropped as stale don't use up the budget
+        admitted = self.budget.admit(text, message_class, user and self.speakable_name(user))
+        if admitted is None:
+            span.finish("over_budget")
+            if self.budget.skipped % 50 == 1:
+                self.log(f"💸 TTS budget used up - skipping lines ({self.budget.skipped} so far)", "warning")
+            return
+        text = admitted
         try:
-            # Credentials are already set in __init__, no need to check again
-            client = texttospeech.TextToSpeechClient()
-            ssml = texttospeech.SynthesisInput(text=text)
-            
-            # Get selected voice or default
-            if hasattr(self, 'selected_voice') and hasattr(self, 'voice_options'):
-                selected_display = self.selected_voice.get()
-                voice_name = self.voice_options.get(selected_display, "en-US-Studio-M")
-            else:
-                voice_name = "en-US-Studio-M"  # Fallback for CLI mode
-            
-            # Determine language code based on voice region
-            if "en-AU" in voice_name:
-                language_code = "en-AU"
-            elif "en-GB" in voice_name:
-                language_code = "en-GB"
-            elif "en-IN" in voice_name:
-                language_code = "en-IN"
-            else:
-                language_code = "en-US"
-            
-            voice = texttospeech.VoiceSelectionParams(language_code=language_code, name=voice_name)
-            audio_config = texttospeech.AudioConfig(audio_encoding=texttospeech.AudioEncoding.MP3)
-            result = client.synthesize_speech(input=ssml, voice=voice, audio_config=audio_config)
-            
-            fn = os.path.join(self.audio_dir, f"{int(time.time())}.mp3")
-            with open(fn, "wb") as f:
-                f.write(result.audio_content)
-            playsound(fn)
-            os.remove(fn)
-            
-            if self.gui_mode:
-                self.log("✅ TTS played successfully", "success")
+            with span.stage("synthesize"):
+                audio_content, extension = self.synthesize(text, message_class, voice_name)
         except Exception as e:
+            span.finish("error")
             self.log(f"❌ TTS Error: {str(e)}", "error")
+            return
+        
+        def done(outcome, error=None):
+            span.finish(outcome)
+            if outcome == "error":
+                self.log(f"❌ TTS Error: {str(error)}", "error")
+                return
+            if outcome == "spoken" and self.transcript:
+                self.transcript.record("spoken", text=text, message_class=message_class, stream=self.username)
+            if self.gui_mode and outcome == "spoken":
+                self.log("✅ TTS played successfully", "success")
+        
+        try:
+            self.player.submit(audio_content, extension, span, done)
+        except Exception as e:
+            done("error", e)
+    
+    def skip_speech(self, clear=False):
+        """Cut the current line short; clear=True also drops the lines waiting to play"""
+        dropped = self.player.clear() if clear else 0
+        if not clear:
+            self.player.skip()
+        self.log(f"⏭️ Skipped current line{f' and {dropped} queued' if dropped else ''}", "info")
     
     def get_joke(self):
         """Load a random joke"""
-        if os.path.exists(self.jokes_file):
-            with open(self.jokes_file, "r", encoding="utf-8") as f:
-                jokes = [line.strip() for line in f if line.strip()]
-            return random.choice(jokes) if jokes else "No jokes found."
+        corpus = self.services.corpus(self.jokes_file)
+        if corpus.exists():
+            return corpus.random_line() or "No jokes found."
         return "No jokes file found."
     
     def get_yo_mama(self):
         """Load a yo mama joke"""
-        if os.path.exists(self.yo_mama_file):
-            with open(self.yo_mama_file, "r", encoding="utf-8") as f:
-                jokes = [line.strip() for line in f if line.strip()]
-            return random.choice(jokes) if jokes else "No yo mama jokes found."
+        corpus = self.services.corpus(self.yo_mama_file)
+        if corpus.exists():
+            return corpus.random_line() or "No yo mama jokes found."
         return "No yo mama jokes file found."
     
     def check_online_status(self):
@@ -247,6 +389,12 @@ class TikTokTTSBot:
             # Wait 5 seconds before next check
             time.sleep(5)
     
+    def start_online_monitor(self):
+        """Check every 5 seconds (in a thread) whether the stream is live, until the bot stops"""
+        self.online_check_thread = threading.Thread(target=self.check_online_status, daemon=True)
+        self.online_check_thread.start()
+        self.log("🔍 Started online status monitoring (5-second intervals)", "info")
+    
     def start_bot(self):
         """Start the TikTok bot"""
         if self.bot_running:
@@ -262,57 +410,27 @@ class TikTokTTSBot:
         
         self.log(f"🚀 Starting bot for @{self.username}", "info")
         
-        # Start online status monitoring
-        self.online_check_thread = threading.Thread(target=self.check_online_status, daemon=True)
-        self.online_check_thread.start()
-        self.log("🔍 Started online status monitoring (5-second intervals)", "info")
+        self.start_online_monitor()
         
         if self.gui_mode:
             # Start bot in separate thread for GUI
             self.bot_thread = threading.Thread(target=self.run_bot_threaded, daemon=True)
             self.bot_thread.start()
+        elif self.daemon_mode:
+            # Daemon - the supervisor shares the control API's loop
+            self.daemon_loop.call_soon_threadsafe(self.daemon_loop.create_task, self.supervisor.run())
         else:
             # Run directly for command line
             self.run_bot()
     
     def run_bot_threaded(self):
-        """Run bot in thread for GUI mode with auto-retry"""
-        max_retries = 3
-        retry_count = 0
-        
-        while self.bot_running and retry_count < max_retries:
-            try:
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                loop.run_until_complete(self.run_bot_async())
-                break  # Success, exit retry loop
-            except Exception as e:
-                retry_count += 1
-                error_msg = str(e)
-                
-                if "No Message Provided" in error_msg or "rate" in error_msg.lower():
-                    wait_time = int(self.rate_limit_cooldown)
-                    self.log(f"🔄 Rate limited. Auto-retry {retry_count}/{max_retries} in {wait_time}s...", "warning")
-                    
-                    # Wait with countdown in GUI
-                    for remaining in range(wait_time, 0, -5):
-                        if not self.bot_running:  # Stop if user stops bot
-                            return
-                        if self.gui_mode:
-                            self.status_label.config(text=f"Status: Auto-retry in {remaining}s", fg="#fbbf24")
-                        time.sleep(5)
-                    
-                    if self.bot_running:
-                        self.log(f"🔄 Attempting auto-retry {retry_count}/{max_retries}...", "info")
-                        if self.gui_mode:
-                            self.status_label.config(text="Status: Retrying...", fg="#3b82f6")
-                else:
-                    self.log(f"❌ Bot error (attempt {retry_count}/{max_retries}): {error_msg}", "error")
-                    break  # Don't retry for non-rate-limit errors
-        
-        if retry_count >= max_retries:
-            self.log("❌ Max retries reached. TikTok may be blocking connections.", "error")
-            self.log("💡 Wait 5-10 minutes before trying again", "warning")
+        """Run the connection supervisor in a thread for GUI mode"""
+        try:
+            loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(loop)
+            loop.run_until_complete(self.supervisor.run())
+        except Exception as e:
+            self.log(f"❌ Bot error: {str(e)}", "error")
         
         # Clean up
         self.bot_running = False
@@ -321,166 +439,276 @@ class TikTokTTSBot:
             self.stop_button.config(state='disabled')
             self.status_label.config(text="Status: Disconnected", fg="#b3b3b3")
     
+    def on_connection_state(self, state, detail=None):
+        """Reflect supervisor state in the status bar"""
+        if state == "failed":
+            self.connection_status = "Error"
+        if not self.gui_mode:
+            return
+        if state == "connecting":
+            self.status_label.config(text="Status: Connecting...", fg="#3b82f6")
+        elif state == "retrying":
+            self.status_label.config(text=f"Status: Reconnecting in {detail}s", fg="#fbbf24")
+        elif state == "circuit-open":
+            self.status_label.config(text=f"Status: Paused after repeated failures ({detail}s)", fg="#ef4444")
+        elif state == "failed":
+            self.status_label.config(text="Status: Connection Failed", fg="#ef4444")
+    
+    def replay(self, path, speed=1.0):
+        """Feed a recorded session through the handlers without connecting to TikTok"""
+        self.bot_running = True
+        self.stats["start_time"] = time.time()
+        try:
+            asyncio.run(replay_session(self, path, speed))
+        except KeyboardInterrupt:
+            self.log("🛑 Replay stopped", "warning")
+        except FileNotFoundError:
+            self.log(f"❌ Replay file not found: {path}", "error")
+        finally:
+            self.bot_running = False
+    
     def run_bot(self):
         """Run bot for command line mode"""
         try:
             loop = asyncio.new_event_loop()
             asyncio.set_event_loop(loop)
-            loop.run_until_complete(self.run_bot_async())
+            loop.run_until_complete(self.supervisor.run())
         except KeyboardInterrupt:
             self.log("🛑 Shutting down...", "warning")
         except Exception as e:
             self.log(f"❌ Bot error: {str(e)}", "error")
+        finally:
+            self.bot_running = False
     
-    async def run_bot_async(self):
-        """Async bot logic with improved error handling and rate limiting protection"""
+    def speakable_name(self, user):
+        """A viewer's handle as it may be read aloud - blocked words masked, None if the filter skips it"""
+        return self.content_filter.check(user)
+    
+    def dispatch_speech(self, text, span=None, message_class="chat", user=None, voice_name=None):
+        """Queue text for TTS - the speech scheduler plays it off the event loop, most urgent first"""
+        weight = self.config.regular_weight if user in self.regulars else 1.0
+        self.speech_scheduler.submit(text, span, message_class, user, weight, voice_name)
+    
+    async def handle_connect(self, evt):
+        """TikTokLive ConnectEvent handler"""
+        self.log("✅ Connected to TikTok Live chat", "success")
+        self.connection_status = "Connected"
+        self.supervisor.mark_connected()
+        if self.gui_mode:
+            self.status_label.config(text="Status: Connected", fg="#22c55e")
+    
+    async def handle_join(self, evt):
+        """TikTokLive JoinEvent handler - welcome each viewer once"""
+        user = evt.user.unique_id
+        if self.recorder:
+            self.recorder.record_join(user)
+        if self.transcript:
+            self.transcript.record("join", user, stream=self.username)
+        if self.viewer_store:
+            self.viewer_store.record_join(user)
+        span = self.tracer.start("join", user, evt)
+        
+        with span.stage("dedup"):
+            self.reset_spoken()
+            dedup_key = f"welcome:{user}"
+            duplicate = dedup_key in self.spoken_messages
+            self.spoken_messages.add(dedup_key)
+        if duplicate:
+            span.finish("duplicate")
+            return
         
-        # Rate limiting protection
-        current_time = time.time()
-        time_since_last_attempt = current_time - self.last_connection_attempt
+        # Regulars get a different greeting (constant-time index lookup); someone who
+        # commented before joining is already in the index but is new this session
+        returning = (bool(self.viewer_index and self.viewer_index.seen_before(user))
+                     and user not in self.new_viewers)
+        if self.viewer_index:
+            self.viewer_index.add(user)
+        name = self.speakable_name(user)
+        if returning:
+            welcome_message = f"Welcome back {name}!"
+            self.stats["returning"] += 1
+            self.regulars.add(user)
+        else:
+            welcome_message = f"Thanks for joining {name}!"
         
-        if time_since_last_attempt < self.connection_retry_delay:
-            remaining_wait = self.connection_retry_delay - time_since_last_attempt
-            self.log(f"⏱️ Rate limiting protection: waiting {remaining_wait:.0f} seconds before retry", "warning")
-            await asyncio.sleep(remaining_wait)
+        # Add user to the joined users list
+        self.add_user_to_list(user)
         
-        self.last_connection_attempt = time.time()
+        self.log(f"👋 Welcome{' back' if returning else ''}: {user}", "welcome")
+        self.events.publish("join", user=user, returning=returning)
+        self.stats["welcomes"] += 1
         
-        try:
-            self.log(f"🔗 Connecting to TikTok Live for @{self.username}...", "info")
-            self.log("🔄 Attempting to connect to TikTok Live stream...", "info")
-            
-            self.bot_client = TikTokLiveClient(unique_id=self.username)
-            
-            @self.bot_client.on(ConnectEvent)
-            async def on_connect(evt):
-                self.log("✅ Connected to TikTok Live chat", "success")
-                self.connection_status = "Connected"
-                if self.gui_mode:
-                    self.status_label.config(text="Status: Connected", fg="#22c55e")
-            
-            @self.bot_client.on(JoinEvent)
-            async def on_join(evt):
-                self.reset_spoken()
-                user = evt.user.unique_id
-                welcome_message = f"Thanks for joining {user}!"
-                
-                dedup_key = f"welcome:{user}"
-                if dedup_key in self.spoken_messages:
-                    return
-                self.spoken_messages.add(dedup_key)
-                
-                # Add user to the joined users list
-                self.add_user_to_list(user)
-                
-                self.log(f"👋 Welcome: {user}", "welcome")
-                self.stats["welcomes"] += 1
-                
-                if self.gui_mode:
-                    self.stats_labels["Users Welcomed:"].config(text=str(self.stats["welcomes"]))
-                    threading.Thread(target=self.speak, args=(welcome_message,), daemon=True).start()
-                else:
-                    self.speak(welcome_message)
-            
-            @self.bot_client.on(CommentEvent)
-            async def on_comment(evt):
-                self.reset_spoken()
-                text = evt.comment.strip()
-                user = evt.user.unique_id
-                
-                dedup_key = f"{user}:{text}"
-                if dedup_key in self.spoken_messages:
-                    self.log(f"[TTS] Skipping duplicate: {dedup_key}", "info")
-                    return
-                self.spoken_messages.add(dedup_key)
-                
-                self.stats["messages"] += 1
-                self.stats["last_activity"] = datetime.now().strftime("%H:%M:%S")
-                
-                if self.gui_mode:
-                    self.stats_labels["Messages Processed:"].config(text=str(self.stats["messages"]))
-                
-                # Command handling
-                if text.lower().startswith("!help"):
-                    help_text = "🤖 Available commands: !joke (random joke), !yo-mama (yo mama joke), !help (show this message). Just type normal messages for TTS!"
-                    self.log(f"ℹ️ Help for {user}: Commands shown", "info")
-                    if self.gui_mode:
-                        threading.Thread(target=self.speak, args=(help_text,), daemon=True).start()
-                    else:
-                        self.speak(help_text)
-                        
-                elif text.lower().startswith("!joke"):
-                    joke = self.get_joke()
-                    self.log(f"😂 Joke for {user}: {joke[:50]}...", "tts")
-                    self.stats["jokes"] += 1
-                    if self.gui_mode:
-                        self.stats_labels["Jokes Told:"].config(text=str(self.stats["jokes"]))
-                        threading.Thread(target=self.speak, args=(joke,), daemon=True).start()
-                    else:
-                        self.speak(joke)
-                        
-                elif text.lower().startswith("!yo-mama"):
-                    joke = self.get_yo_mama()
-                    self.log(f"😂 Yo Mama for {user}: {joke[:50]}...", "tts")
-                    self.stats["jokes"] += 1
-                    if self.gui_mode:
-                        self.stats_labels["Jokes Told:"].config(text=str(self.stats["jokes"]))
-                        threading.Thread(target=self.speak, args=(joke,), daemon=True).start()
-                    else:
-                        self.speak(joke)
-                        
-                else:
-                    # Normal TTS
-                    spoken = emoji.demojize(text, delimiters=(" ", " "))
-                    self.log(f"💬 {user}: {spoken}", "tts")
-                    if self.gui_mode:
-                        threading.Thread(target=self.speak, args=(f"{user} says {spoken}",), daemon=True).start()
-                    else:
-                        self.speak(f"{user} says {spoken}")
-            
-            # Attempt connection with detailed error handling and rate limiting
-            try:
-                # Check for rate limiting cooldown
-                current_time = time.time()
-                if (current_time - self.last_connection_attempt) < self.rate_limit_cooldown:
-                    remaining_time = int(self.rate_limit_cooldown - (current_time - self.last_connection_attempt))
-                    self.log(f"⏳ Rate limit cooldown: {remaining_time}s remaining", "warning")
-                    return
+        if self.gui_mode:
+            self.stats_labels["Users Welcomed:"].config(text=str(self.stats["welcomes"]))
+        if name is None:
+            span.finish("filtered")
+            self.log(f"🧹 Not welcoming {user} aloud (blocked words in the name)", "warning")
+            return
+        self.dispatch_speech(welcome_message, span, "welcome", user)
+    
+    async def handle_comment(self, evt):
+        """TikTokLive CommentEvent handler - commands and chat TTS"""
+        text = evt.comment.strip()
+        user = evt.user.unique_id
+        if self.recorder:
+            self.recorder.record_comment(user, text)
+        if self.transcript:
+            self.transcript.record("comment", user, text, stream=self.username)
+        self.events.publish("comment", user=user, text=text)
+        if self.viewer_store:
+            self.viewer_store.record_message(user)
+        if self.viewer_index:
+            if user not in self.chatters and not self.viewer_index.seen_before(user):
+                self.new_viewers.add(user)
+            self.viewer_index.add(user)
+        span = self.tracer.start("comment", user, evt)
+        
+        with span.stage("dedup"):
+            self.reset_spoken()
+            dedup_key = f"{user}:{text}"
+            duplicate = dedup_key in self.spoken_messages
+            self.spoken_messages.add(dedup_key)
+        if duplicate:
+            span.finish("duplicate")
+            self.log(f"[TTS] Skipping duplicate: {dedup_key}", "info")
+            return
+        
+        first_message = user not in self.chatters
+        self.chatters.add(user)
+        self.stats["messages"] += 1
+        self.stats["last_activity"] = datetime.now().strftime("%H:%M:%S")
+        
+        if self.gui_mode:
+            self.stats_labels["Messages Processed:"].config(text=str(self.stats["messages"]))
+        
+        # Command handling
+        if text.lower().startswith("!help"):
+            help_text = self.config.help_text
+            self.log(f"ℹ️ Help for {user}: Commands shown", "info")
+            self.dispatch_speech(help_text, span, "help", user)
                 
-                self.connection_attempts += 1
-                self.last_connection_attempt = current_time
+        elif text.lower().startswith("!joke"):
+            joke = self.get_joke()
+            self.log(f"😂 Joke for {user}: {joke[:50]}...", "tts")
+            self.stats["jokes"] += 1
+            if self.gui_mode:
+                self.stats_labels["Jokes Told:"].config(text=str(self.stats["jokes"]))
+            self.dispatch_speech(joke, span, "joke", user)
                 
-                self.log("🔄 Attempting to connect to TikTok Live stream...", "info")
-                await self.bot_client.connect()
-            except Exception as connect_error:
-                error_msg = str(connect_error)
-                if "User not found" in error_msg or "not capable of going LIVE" in error_msg:
-                    self.log(f"❌ Connection Error: @{self.username} cannot go live or doesn't exist", "error")
-                    self.log("💡 Make sure the username is correct and the user can broadcast live", "warning")
-                elif "No Message Provided" in error_msg:
-                    self.log(f"❌ Connection Error: TikTok Live API issue (Rate Limited)", "error")
-                    self.log(f"💡 TikTok is rate limiting connections. Waiting {self.rate_limit_cooldown}s before retry", "warning")
-                    self.log("🔄 This is normal - TikTok limits API requests to prevent spam", "info")
-                    # Increase cooldown time for subsequent attempts
-                    self.rate_limit_cooldown = min(300, self.rate_limit_cooldown * 1.5)  # Max 5 minutes
-                elif "blocked" in error_msg.lower():
-                    self.log(f"❌ Connection Error: Blocked by TikTok", "error")
-                    self.log("💡 You may be temporarily blocked. Try using a VPN or waiting 10-15 minutes", "warning")
-                    self.rate_limit_cooldown = 600  # 10 minute cooldown for blocks
-                else:
-                    self.log(f"❌ Connection Error: {error_msg}", "error")
-                    self.log("💡 Check your internet connection and try again", "warning")
+        elif text.lower().startswith("!yo-mama"):
+            joke = self.get_yo_mama()
+            self.log(f"😂 Yo Mama for {user}: {joke[:50]}...", "tts")
+            self.stats["jokes"] += 1
+            if self.gui_mode:
+                self.stats_labels["Jokes Told:"].config(text=str(self.stats["jokes"]))
+            self.dispatch_speech(joke, span, "joke", user)
                 
-                self.connection_status = "Error"
-                if self.gui_mode:
-                    self.status_label.config(text=f"Status: Rate Limited ({int(self.rate_limit_cooldown)}s)", fg="#ef4444")
+        else:
+            # Normal TTS - blocked words are masked/substituted, or the message dropped
+            with span.stage("filter"):
+                text = self.content_filter.check(text)
+                name = self.speakable_name(user)
+            if text is None or name is None:
+                span.finish("filtered")
+                self.log(f"🧹 Not reading {user}'s message (blocked words)", "warning")
                 return
-                
-        except Exception as e:
-            self.log(f"❌ Unexpected error in bot setup: {str(e)}", "error")
-            self.connection_status = "Error"
-            if self.gui_mode:
-                self.status_label.config(text="Status: Setup Error", fg="#ef4444")
+            with span.stage("normalize"):
+                spoken = self.budget.cap(self.normalizer.normalize(text))
+            voice_name = None
+            if self.config.detect_language:
+                # Raw text - the normalizer spells emoji out in English
+                with span.stage("language"):
+                    language = self.language_detector.detect(text, user,
+                                                             self.current_voice_name().split("-")[0])
+                    voice_name = self.voice_for_language(language)
+            self.log(f"💬 {user}: {spoken}{f' [{language}]' if voice_name else ''}", "tts")
+            self.dispatch_speech(f"{name} says {spoken}", span, "first_chat" if first_message else "chat", user,
+                                 voice_name)
+    
+    async def handle_gift(self, evt):
+        """TikTokLive GiftEvent handler - the aggregator counts a combo streak once, when it ends"""
+        user = evt.user.unique_id
+        name, count, diamonds, finished = gift_details(evt)
+        self.aggregator.add_gift(user, name, count, diamonds, finished)
+    
+    def record_gift(self, user, name, count, diamonds):
+        """Gift totals, transcript and log - called by the aggregator, so streaks that just time out count too"""
+        self.stats["gifts"] += count
+        self.stats["diamonds"] += count * diamonds
+        if self.transcript:
+            self.transcript.record("gift", user, name, count=count, diamonds=diamonds, stream=self.username)
+        self.log(f"🎁 {user} sent {plural(count, name)}", "welcome")
+        self.events.publish("gift", user=user, gift=name, count=count)
+    
+    async def handle_like(self, evt):
+        """TikTokLive LikeEvent handler - only counted, the summary mentions them"""
+        count = like_count(evt)
+        self.stats["likes"] += count
+        self.aggregator.add_like(evt.user.unique_id, count)
+    
+    async def handle_follow(self, evt):
+        """TikTokLive FollowEvent handler"""
+        user = evt.user.unique_id
+        self.stats["follows"] += 1
+        self.aggregator.add_follow(user)
+        if self.transcript:
+            self.transcript.record("follow", user, stream=self.username)
+        self.log(f"➕ New follower: {user}", "welcome")
+        self.events.publish("follow", user=user)
+    
+    async def handle_share(self, evt):
+        """TikTokLive ShareEvent handler"""
+        user = evt.user.unique_id
+        self.stats["shares"] += 1
+        self.aggregator.add_share(user)
+        if self.transcript:
+            self.transcript.record("share", user, stream=self.username)
+        self.log(f"🔗 {user} shared the stream", "welcome")
+        self.events.publish("share", user=user)
+    
+    def announce_summary(self, text):
+        """Speak one window's gift/like/follow/share summary"""
+        self.log(f"🎉 {text}", "tts")
+        # The summary names viewers - their handles go through the content filter too
+        text = self.content_filter.check(text)
+        if text is not None:
+            self.dispatch_speech(text, message_class="gift")
+    
+    async def run_bot_async(self):
+        """One connection attempt - returns when the stream disconnects, raises on failure"""
+        self.log(f"🔗 Connecting to TikTok Live for @{self.username}...", "info")
+        
+        self.bot_client = TikTokLive.TikTokLiveClient(unique_id=self.username)
+        
+        self.bot_client.on(tiktok_events.ConnectEvent)(self.handle_connect)
+        self.bot_client.on(tiktok_events.JoinEvent)(self.handle_join)
+        self.bot_client.on(tiktok_events.CommentEvent)(self.handle_comment)
+        self.bot_client.on(tiktok_events.GiftEvent)(self.handle_gift)
+        self.bot_client.on(tiktok_events.LikeEvent)(self.handle_like)
+        self.bot_client.on(tiktok_events.FollowEvent)(self.handle_follow)
+        self.bot_client.on(tiktok_events.ShareEvent)(self.handle_share)
+        
+        lazy_imports.mark("connecting")
+        await self.bot_client.connect()
+    
+    async def disconnect_client(self):
+        """Close the live TikTok connection (used by the supervisor when stopping)"""
+        client = self.bot_client
+        if client is not None:
+            result = client.disconnect()
+            if inspect.isawaitable(result):
+                await result
+    
+    def shutdown(self):
+        """Finish queued speech, then flush and close everything that writes to disk"""
+        self.aggregator.stop()
+        self.speech_scheduler.stop(drain=True, timeout=30)
+        if self.owns_player:
+            self.player.close(drain=True, timeout=30)
+        if self.recorder:
+            self.recorder.close()
+        if self.owns_services:
+            self.services.close()
     
     def stop_bot(self):
         """Stop the TikTok bot"""
@@ -490,6 +718,7 @@ class TikTokTTSBot:
         self.bot_running = False
         self.connection_status = "Disconnected"
         self.log("⏹️ Stopping bot and online monitoring...", "warning")
+        self.supervisor.stop()
         
         if self.gui_mode:
             self.start_button.config(state='normal')
@@ -508,10 +737,7 @@ class TikTokTTSBot:
             test_message = "Hello! This is a test of the TTS system."
             self.log("🔊 Testing TTS system...", "info")
             
-        if self.gui_mode:
-            threading.Thread(target=self.speak, args=(test_message,), daemon=True).start()
-        else:
-            self.speak(test_message)
+        self.dispatch_speech(test_message, message_class="test")
 
     def test_connection(self):
         """Test TikTok connection and provide diagnostics"""
@@ -595,13 +821,98 @@ class TikTokTTSBot:
 
     def reset_rate_limit(self):
         """Reset rate limiting cooldown manually"""
-        self.connection_attempts = 0
-        self.last_connection_attempt = 0
-        self.rate_limit_cooldown = 60  # Reset to default
+        self.supervisor.reset()
         self.log("🔄 Rate limit reset! You can try connecting again.", "success")
         if self.gui_mode and not self.bot_running:
             self.status_label.config(text="Status: Ready to Connect", fg="#22c55e")
     
+    def show_trace_report(self):
+        """Log p50/p95/p99 timings for each pipeline stage"""
+        for line in self.tracer.report():
+            self.log(line, "info")
+    
+    def refresh_voice_options(self):
+        """Reload the voice dropdown after a config change, keeping the selection if it still exists"""
+        self.voice_options = dict(self.config.voice_options)
+        self.voice_dropdown.config(values=list(self.voice_options.keys()))
+        self.dropdown_catalog_version = None
+        if self.selected_voice.get() not in self.voice_options:
+            self.selected_voice.set(self.config.default_voice_label())
+    
+    def populate_voice_dropdown(self):
+        """Runs when the dropdown opens: configured favourites first, then the whole catalog (built once per load)"""
+        if self.dropdown_catalog_version == self.voice_catalog.version or not self.voice_catalog.loaded:
+            return
+        self.dropdown_catalog_version = self.voice_catalog.version
+        configured = set(self.config.voice_options.values())
+        self.voice_options = dict(self.config.voice_options)
+        for voice in self.voice_catalog.voices():
+            if voice.name not in configured:
+                self.voice_options[voice.label] = voice.name
+        self.voice_dropdown.config(values=list(self.voice_options.keys()))
+    
+    def set_voice(self, voice_name):
+        """Switch the Google voice (control API / CLI) - picks the matching dropdown entry in the GUI"""
+        self.voice_name = voice_name
+        if hasattr(self, 'selected_voice') and hasattr(self, 'voice_options'):
+            for display, name in self.voice_options.items():
+                if name == voice_name:
+                    self.selected_voice.set(display)
+                    break
+        self.log(f"🎵 Voice changed to: {voice_name}", "success")
+        self.events.publish("voice", voice=voice_name)
+    
+    def stats_snapshot(self):
+        """JSON-friendly view of counters and connection state"""
+        stats = dict(self.stats)
+        started = stats.pop("start_time")
+        stats.update({
+            "username": self.username,
+            "running": self.bot_running,
+            "connection": self.connection_status,
+            "uptime": round(time.time() - started, 1) if started and self.bot_running else 0,
+            "unique_users": len(self.unique_users),
+            "voice": self.current_voice_name(),
+            "supervisor": self.supervisor.status(),
+            "tts": self.tts_router.status(),
+            "speech": self.speech_scheduler.stats(),
+            "budget": self.budget.status(),
+            "speaking_rate": self.speaking_rate.current,
+            "playback": self.player.status(),
+            "languages": self.language_detector.stats(),
+            "filter": self.content_filter.stats(),
+        })
+        return stats
+    
+    def run_daemon(self, host="127.0.0.1", port=8765, token=None, autostart=True):
+        """Headless service: control API plus the connection supervisor on one loop"""
+        self.daemon_mode = True
+        try:
+            asyncio.run(self.serve_daemon(host, port, token, autostart))
+        except KeyboardInterrupt:
+            self.log("🛑 Shutting down...", "warning")
+        finally:
+            self.bot_running = False
+    
+    async def serve_daemon(self, host, port, token, autostart):
+        from control_api import ControlServer
+        self.daemon_loop = asyncio.get_running_loop()
+        stopped = asyncio.Event()
+        try:
+            import signal
+            self.daemon_loop.add_signal_handler(signal.SIGTERM, stopped.set)
+        except (ImportError, NotImplementedError, AttributeError, RuntimeError, ValueError):
+            pass  # Windows or not the main thread - Ctrl+C only
+        server = ControlServer(self, host, port, token)
+        await server.start()
+        if autostart:
+            self.start_bot()
+        try:
+            await stopped.wait()
+        finally:
+            self.stop_bot()
+            await server.close()
+    
     def on_voice_changed(self, event=None):
         """Handle voice selection change"""
         selected_display = self.selected_voice.get()
@@ -753,6 +1064,13 @@ class TikTokTTSBot:
                                          command=self.test_tts)
         self.test_tts_button.pack(side='left', padx=(0, 10))
         
+        # Skip the line that is playing right now
+        self.skip_button = ttk.Button(control_frame,
+                                     text="⏭️ Skip",
+                                     style='Accent.TButton',
+                                     command=self.skip_speech)
+        self.skip_button.pack(side='left', padx=(0, 10))
+        
         # Test Connection button
         self.test_connection_button = ttk.Button(control_frame,
                                                text="🔗 Test Connection",
@@ -767,6 +1085,13 @@ class TikTokTTSBot:
                                            command=self.reset_rate_limit)
         self.reset_limit_button.pack(side='left', padx=(0, 10))
         
+        # Trace Report button
+        self.trace_report_button = ttk.Button(control_frame,
+                                            text="📈 Trace Report",
+                                            style='Accent.TButton',
+                                            command=self.show_trace_report)
+        self.trace_report_button.pack(side='left', padx=(0, 10))
+        
         # Configuration
         config_frame = tk.Frame(self.main_tab, bg=self.colors['bg_medium'], relief='solid', bd=1)
         config_frame.pack(fill='x', pady=(0, 10))
@@ -805,47 +1130,15 @@ class TikTokTTSBot:
                 fg=self.colors['text_primary']).pack(side='left')
         
         # Voice options with emojis - ULTRA NATURAL VOICES (Most Human-Like!)
-        self.voice_options = {
-            "� Google Home Male": "en-US-Studio-M",
-            "🏠 Google Home Female": "en-US-Studio-O", 
-            "� Assistant Male": "en-US-Polyglot-1",
-            "👩 Assistant Female": "en-US-Neural2-F",
-            "� British Female": "en-GB-Neural2-A",
-            "� British Male": "en-GB-Neural2-B",
-            "🌟 Conversational Male": "en-US-Neural2-D",
-            "✨ Conversational Female": "en-US-Neural2-G",
-            "🎭 British Assistant": "en-GB-Neural2-A",
-            "🎩 British Home": "en-GB-Neural2-B",
-            
-            # More US Voices
-            "👨 Natural Male": "en-US-Neural2-A",
-            "🎯 Professional Male": "en-US-Neural2-I",
-            "🌟 Warm Male": "en-US-Neural2-J",
-            "💫 Premium Female": "en-US-Neural2-H",
-            "🎭 Dramatic Female": "en-US-Neural2-C",
-            
-            # British Accents
-            "🎩 Posh British Female": "en-GB-Neural2-C",
-            "👔 Professional British Male": "en-GB-Neural2-D",
-            
-            # Australian Voices
-            "🇦🇺 Aussie Female": "en-AU-Neural2-A",
-            "🇦🇺 Aussie Male": "en-AU-Neural2-B",
-            "🏄 Casual Aussie Female": "en-AU-Neural2-C",
-            "🦘 Outback Aussie Male": "en-AU-Neural2-D",
-            
-            # Indian English (Fixed Gender Issues)
-            "🇮🇳 Indian Female A": "en-IN-Neural2-A",
-            "🇮🇳 Indian Male B": "en-IN-Neural2-B",
-            "🇮🇳 Indian Voice C": "en-IN-Neural2-C",
-            "�🇳 Indian Voice D": "en-IN-Neural2-D"
-        }
+        self.voice_options = dict(self.config.voice_options)
         
-        self.selected_voice = tk.StringVar(value="� Google Home Male")
+        self.selected_voice = tk.StringVar(value=self.config.default_voice_label())
         self.voice_dropdown = ttk.Combobox(voice_frame,
                                          textvariable=self.selected_voice,
                                          values=list(self.voice_options.keys()),
+                                         postcommand=self.populate_voice_dropdown,
                                          state="readonly")
+        self.dropdown_catalog_version = None
         self.voice_dropdown.pack(side='left', padx=(10, 0), fill='x', expand=True)
         self.voice_dropdown.bind('<<ComboboxSelected>>', self.on_voice_changed)
         
@@ -868,6 +1161,11 @@ class TikTokTTSBot:
             ("Messages Processed:", "0"),
             ("Jokes Told:", "0"),
             ("Users Welcomed:", "0"),
+            ("Gifts:", "0"),
+            ("Likes:", "0"),
+            ("Follows:", "0"),
+            ("TTS Budget:", "unlimited"),
+            ("Filtered:", "0"),
             ("Connection Checks:", "0"),
             ("Uptime:", "00:00:00"),
             ("Stream Status:", "Unknown")
@@ -941,6 +1239,12 @@ class TikTokTTSBot:
             # Update connection checks counter
             self.stats_labels["Connection Checks:"].config(text=str(self.stats["connection_checks"]))
             
+            # Gifts, likes and follows arrive too fast to update per event
+            for label, key in (("Gifts:", "gifts"), ("Likes:", "likes"), ("Follows:", "follows")):
+                self.stats_labels[label].config(text=str(self.stats[key]))
+            self.stats_labels["TTS Budget:"].config(text=self.budget.describe())
+            self.stats_labels["Filtered:"].config(text=str(self.content_filter.flagged))
+            
             # Update stream status
             status_colors = {
                 "Online": "#22c55e",
@@ -992,11 +1296,26 @@ class TikTokTTSBot:
         clear_users_btn.pack(side='left', anchor='w', padx=(10, 5), pady=(0, 10))
         
         # Export users button
-        export_users_btn = ttk.Button(users_info_frame,
-                                    text="💾 Export List",
-                                    style='Info.TButton',
-                                    command=self.export_users_list)
-        export_users_btn.pack(side='left', anchor='w', padx=(5, 10), pady=(0, 10))
+        self.export_users_btn = ttk.Button(users_info_frame,
+                                         text="💾 Export List",
+                                         style='Info.TButton',
+                                         command=self.export_users_list)
+        self.export_users_btn.pack(side='left', anchor='w', padx=(5, 5), pady=(0, 10))
+        
+        # Export format / compression
+        self.export_format = tk.StringVar(value="csv")
+        ttk.Combobox(users_info_frame, textvariable=self.export_format, values=EXPORT_FORMATS,
+                     state="readonly", width=8).pack(side='left', anchor='w', padx=5, pady=(0, 10))
+        self.export_compression = tk.StringVar(value="none")
+        ttk.Combobox(users_info_frame, textvariable=self.export_compression, values=COMPRESSIONS,
+                     state="readonly", width=6).pack(side='left', anchor='w', padx=5, pady=(0, 10))
+        
+        self.export_status_label = tk.Label(users_info_frame,
+                                           text="",
+                                           font=('Arial', 9),
+                                           bg=self.colors['bg_medium'],
+                                           fg=self.colors['text_secondary'])
+        self.export_status_label.pack(side='left', anchor='w', padx=10, pady=(0, 10))
         
         # Users list frame
         users_list_frame = tk.Frame(self.users_tab, bg=self.colors['bg_medium'], relief='solid', bd=1)
@@ -1060,169 +1379,117 @@ class TikTokTTSBot:
                                command=self.load_links_from_file)
         refresh_btn.pack(anchor='w', padx=10, pady=(5, 10))
         
-        # Links content frame with scrollbar
+        # Links content - a canvas that only holds widgets for the rows in view
         content_frame = tk.Frame(self.links_tab, bg=self.colors['bg_medium'], relief='solid', bd=1)
         content_frame.pack(fill='both', expand=True, padx=10, pady=(0, 10))
         
-        # Create scrollable area with better configuration for grid layout
         canvas = tk.Canvas(content_frame, bg=self.colors['bg_dark'], highlightthickness=0)
         scrollbar = tk.Scrollbar(content_frame, orient="vertical", command=canvas.yview, 
                                bg=self.colors['bg_light'], troughcolor=self.colors['bg_medium'])
-        self.links_scrollable_frame = tk.Frame(canvas, bg=self.colors['bg_dark'])
+        self.links_canvas = canvas
+        self.link_rows = {}  # row index -> (canvas window id, frame) for rows currently built
         
-        # Configure scrollable frame for grid layout
-        self.links_scrollable_frame.bind(
-            "<Configure>",
-            lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
-        )
+        # Every scroll (scrollbar, wheel or yview) reports here - build whatever came into view
+        def _on_scrolled(first, last):
+            scrollbar.set(first, last)
+            self.render_link_rows()
         
         # Enable mouse wheel scrolling
         def _on_mousewheel(event):
             canvas.yview_scroll(int(-1*(event.delta/120)), "units")
         
         canvas.bind("<MouseWheel>", _on_mousewheel)
-        
-        canvas.create_window((0, 0), window=self.links_scrollable_frame, anchor="nw")
-        canvas.configure(yscrollcommand=scrollbar.set)
+        canvas.configure(yscrollcommand=_on_scrolled, yscrollincrement=20)
         
         # Pack with improved layout
         canvas.pack(side="left", fill="both", expand=True)
         scrollbar.pack(side="right", fill="y")
         
-        # Ensure the scrollable frame expands to fill canvas width
-        canvas.bind('<Configure>', lambda e: canvas.itemconfig(
-            canvas.find_all()[0], width=e.width))
+        # Rows stretch to the canvas width
+        canvas.bind('<Configure>', lambda e: self.render_link_rows(relayout=True))
         
         # Load links from file
+        script_dir = os.path.dirname(os.path.abspath(__file__))
+        self.links_file = LinksFile(os.path.join(script_dir, "..", "links", "links.txt"))
         self.load_links_from_file()
 
     def load_links_from_file(self):
-        """Load and display links from links/links.txt"""
-        # Clear existing content
-        for widget in self.links_scrollable_frame.winfo_children():
-            widget.destroy()
-        
-        # Get the correct path relative to the script location
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        links_file_path = os.path.join(script_dir, "..", "links", "links.txt")
-        
-        self.log(f"🔍 Loading links from file...", "info")
-        
-        try:
-            if os.path.exists(links_file_path):
-                with open(links_file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                
-                self.log(f"📄 Loaded {len(content)} characters from links file", "info")
-                self.parse_and_display_links(content)
-                self.log("✅ Links loaded successfully with grid layout", "success")
-            else:
-                # Show error message if file not found
-                error_label = tk.Label(self.links_scrollable_frame,
-                                     text="❌ links/links.txt not found\n\nCreate a file at: links/links.txt\nwith your links organized by categories",
-                                     font=('Arial', 12),
-                                     bg=self.colors['bg_dark'],
-                                     fg=self.colors['error'],
-                                     justify='center')
-                error_label.pack(pady=50)
-                self.log("❌ links/links.txt file not found", "error")
-        except Exception as e:
-            error_label = tk.Label(self.links_scrollable_frame,
-                                 text=f"❌ Error loading links: {str(e)}",
-                                 font=('Arial', 12),
-                                 bg=self.colors['bg_dark'],
-                                 fg=self.colors['error'])
-            error_label.pack(pady=20)
-            self.log(f"❌ Error loading links: {str(e)}", "error")
+        """Load links/links.txt (parsed again only if it changed) and show the rows in view"""
+        rows, changed = self.links_file.load()
+        if not changed and self.link_rows:
+            return
+        for window, frame in self.link_rows.values():
+            self.links_canvas.delete(window)
+            frame.destroy()
+        self.link_rows.clear()
+        self.links_canvas.configure(scrollregion=(0, 0, 0, self.links_file.height))
+        self.links_canvas.yview_moveto(0)
+        self.render_link_rows()
+        if rows and rows[0][0] == "error":
+            self.log(rows[0][1].split("\n")[0], "error")
+        else:
+            self.log(f"🔗 Loaded {self.links_file.link_count} links in "
+                     f"{self.links_file.category_count} categories", "success")
 
-    def parse_and_display_links(self, content):
-        """Parse the links file content and create clickable elements in a flush grid"""
-        lines = content.split('\n')
-        current_category = None
-        current_grid_frame = None
-        links_in_current_category = []
-        
-        self.log(f"📝 Parsing {len(lines)} lines from links file", "info")
-        
-        for line in lines:
-            line = line.strip()
-            if not line:
+    def render_link_rows(self, relayout=False):
+        """Build widgets for the rows in (or just outside) the visible band, drop the rest"""
+        canvas = self.links_canvas
+        width = canvas.winfo_width()
+        top = canvas.canvasy(0)
+        wanted = self.links_file.visible(top - 200, top + canvas.winfo_height() + 200)
+        for index in [i for i in self.link_rows if i not in wanted]:
+            window, frame = self.link_rows.pop(index)
+            canvas.delete(window)
+            frame.destroy()
+        for index in wanted:
+            if index in self.link_rows:
+                if relayout:
+                    canvas.itemconfig(self.link_rows[index][0], width=width)
                 continue
+            kind, value = self.links_file.rows[index]
+            frame = self.create_link_row(kind, value)
+            window = canvas.create_window(0, self.links_file.offsets[index], window=frame, anchor="nw",
+                                          width=width, height=ROW_HEIGHTS[kind])
+            self.link_rows[index] = (window, frame)
+
+    def create_link_row(self, kind, value):
+        """One display row of the links file: category header, text line, links or an error"""
+        row = tk.Frame(self.links_canvas, bg=self.colors['bg_dark'])
+        row.pack_propagate(False)
+        if kind == "category":
+            category_frame = tk.Frame(row, bg=self.colors['bg_medium'], relief='solid', bd=1)
+            category_frame.pack(fill='x', padx=10, pady=(10, 5))
             
-            # Check if it's a category header (contains emoji and title)
-            if ('🎮' in line or '📺' in line or '📸' in line or '🐦' in line or 
-                '🎵' in line or '💬' in line or '🧱' in line or '☕' in line or
-                '🌐' in line):
-                
-                # If we have pending links from previous category, display them first
-                if links_in_current_category and current_grid_frame:
-                    self.create_links_grid(current_grid_frame, links_in_current_category)
-                    links_in_current_category = []
-                
-                # Category header
-                category_frame = tk.Frame(self.links_scrollable_frame, bg=self.colors['bg_medium'], 
-                                        relief='solid', bd=1)
-                category_frame.pack(fill='x', padx=10, pady=(10, 5))
-                
-                category_label = tk.Label(category_frame,
-                                        text=line,
-                                        font=('Arial', 12, 'bold'),
-                                        bg=self.colors['bg_medium'],
-                                        fg=self.colors['accent_blue'])
-                category_label.pack(anchor='w', padx=10, pady=8)
-                current_category = line
-                
-                # Create grid container for this category's links
-                current_grid_frame = tk.Frame(self.links_scrollable_frame, bg=self.colors['bg_dark'])
-                current_grid_frame.pack(fill='x', padx=20, pady=(5, 10))
-                
-                self.log(f"📂 Created category: {line}", "info")
-                
-            # Check if it's a clickable link (starts with 🔗)
-            elif line.startswith('🔗'):
-                url = line.replace('🔗 ', '').strip()
-                
-                # Add https:// if not present
-                if not url.startswith(('http://', 'https://')):
-                    full_url = 'https://' + url
-                else:
-                    full_url = url
-                
-                # Store link info for grid creation
-                links_in_current_category.append({
-                    'url': url,
-                    'full_url': full_url
-                })
-                
-                self.log(f"🔗 Found link: {url}", "info")
-                
-            # Regular text lines
-            else:
-                # If we have pending links, display them first
-                if links_in_current_category and current_grid_frame:
-                    self.create_links_grid(current_grid_frame, links_in_current_category)
-                    links_in_current_category = []
-                
-                text_frame = tk.Frame(self.links_scrollable_frame, bg=self.colors['bg_dark'])
-                text_frame.pack(fill='x', padx=20, pady=1)
-                
-                text_label = tk.Label(text_frame,
-                                    text=line,
-                                    font=('Arial', 10),
-                                    bg=self.colors['bg_dark'],
-                                    fg=self.colors['text_primary'])
-                text_label.pack(anchor='w')
-        
-        # Handle any remaining links at the end
-        if links_in_current_category and current_grid_frame:
-            self.create_links_grid(current_grid_frame, links_in_current_category)
-        
-        self.log("✅ Finished parsing links file", "success")
+            category_label = tk.Label(category_frame,
+                                    text=value,
+                                    font=('Arial', 12, 'bold'),
+                                    bg=self.colors['bg_medium'],
+                                    fg=self.colors['accent_blue'])
+            category_label.pack(anchor='w', padx=10, pady=8)
+        elif kind == "links":
+            grid_frame = tk.Frame(row, bg=self.colors['bg_dark'])
+            grid_frame.pack(fill='x', padx=20)
+            self.create_links_grid(grid_frame, value)
+        elif kind == "text":
+            text_label = tk.Label(row,
+                                text=value,
+                                font=('Arial', 10),
+                                bg=self.colors['bg_dark'],
+                                fg=self.colors['text_primary'])
+            text_label.pack(anchor='w', padx=20, pady=1)
+        else:
+            error_label = tk.Label(row,
+                                 text=value,
+                                 font=('Arial', 12),
+                                 bg=self.colors['bg_dark'],
+                                 fg=self.colors['error'],
+                                 justify='center')
+            error_label.pack(pady=20)
+        return row
 
     def create_links_grid(self, parent_frame, links_list):
         """Create a flush grid layout for links with improved spacing and organization"""
-        columns = 3  # 3 links per row for better use of space
-        self.log(f"🔧 Creating flush grid with {len(links_list)} links in {columns} columns", "info")
+        columns = self.links_file.columns
         
         # Configure all columns to have equal weight for flush layout
         for col in range(columns):
@@ -1281,8 +1548,6 @@ class TikTokTTSBot:
                 
             link_button.bind("<Enter>", on_enter)
             link_button.bind("<Leave>", on_leave)
-        
-        self.log(f"✅ Flush grid created successfully with {len(links_list)} links in {columns} columns", "success")
 
     def open_link_in_browser(self, url):
         """Open a link in the default browser"""
@@ -1351,52 +1616,185 @@ class TikTokTTSBot:
         
         self.log("🗑️ User list cleared", "info")
 
-    def export_users_list(self):
-        """Export the users list to a text file"""
-        if not self.joined_users:
+    def export_sources(self, session_only=True):
+        """Tables to export - from the viewer database when available"""
+        if self.viewer_store:
+            since = self.stats["start_time"] if session_only else None
+            sources = [joins_source(self.viewer_store, since), viewers_source(self.viewer_store)]
+        else:
+            sources = [memory_joins_source(self.joined_users)]
+        if self.transcript:
+            sources.append(transcript_source(self.transcript.session_paths()))
+        return sources
+    
+    def export_users_list(self, fmt=None, compression=None, directory="exports", wait=False):
+        """Export joins and viewers in the background (CSV / JSONL / Parquet)"""
+        if not self.joined_users and not self.viewer_store:
             self.log("❌ No users to export", "warning")
-            return
+            return None
+        if getattr(self, "export_job", None) and self.export_job.is_alive():
+            self.log("⏳ An export is already running", "warning")
+            return None
+        
+        if self.gui_mode:
+            fmt = fmt or self.export_format.get()
+            compression = compression or self.export_compression.get()
+        fmt = fmt or "csv"
+        compression = compression or "none"
+        
+        def sources():
+            # Runs on the export thread - waiting for pending writes and counting rows can take a while
+            if self.viewer_store:
+                self.viewer_store.flush()
+            return self.export_sources()
+        
+        last_reported = {}
+        
+        def progress(source, written, total):
+            # Log roughly every 10% so huge exports don't flood the activity log
+            percent = int(written * 100 / total) if total else 100
+            if percent // 10 > last_reported.get(source, -1):
+                last_reported[source] = percent // 10
+                self.log(f"💾 Exporting {source}: {written}/{total or written} rows ({percent}%)", "info")
+                if self.gui_mode:
+                    self.root.after(0, lambda: self.export_status_label.config(
+                        text=f"{source}: {percent}%"))
+        
+        def done(paths, error):
+            if error:
+                self.log(f"❌ Export failed: {str(error)}", "error")
+            else:
+                for path in paths:
+                    self.log(f"💾 Exported: {path}", "success")
+            if self.gui_mode:
+                self.root.after(0, lambda: (self.export_users_btn.config(state='normal'),
+                                            self.export_status_label.config(text="")))
         
         try:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"users_joined_{timestamp}.txt"
-            
-            with open(filename, "w", encoding="utf-8") as f:
-                f.write(f"# TikTok Stream Users - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-                f.write(f"# Total Unique Users: {len(self.unique_users)}\n")
-                f.write(f"# Total Join Events: {len(self.joined_users)}\n\n")
-                
-                f.write("Join History (Most Recent First):\n")
-                f.write("-" * 40 + "\n")
-                
-                for user in self.joined_users:
-                    f.write(f"[{user['timestamp']}] {user['username']}\n")
-                
-                f.write("\n" + "-" * 40 + "\n")
-                f.write(f"Unique Users List:\n")
-                
-                for username in sorted(self.unique_users):
-                    f.write(f"• {username}\n")
-            
-            self.log(f"💾 Users list exported to: {filename}", "success")
-            
-        except Exception as e:
+            self.export_job = ExportJob(sources, directory=directory, fmt=fmt,
+                                        compression=compression, progress=progress, done=done)
+        except ValueError as e:
             self.log(f"❌ Export failed: {str(e)}", "error")
+            return None
+        if self.gui_mode:
+            self.export_users_btn.config(state='disabled')
+        self.log(f"💾 Export started ({fmt}{'' if compression == 'none' else ', ' + compression})", "info")
+        self.export_job.start()
+        if wait:
+            self.export_job.join()
+        return self.export_job
+
+def run_multi_stream(args, tts_routes, parser):
+    """--usernames: one process, one event loop, many streams"""
+    from multi_stream import MultiStreamHost, parse_streams
+    try:
+        streams = parse_streams(args.usernames)
+    except ValueError as e:
+        parser.error(f"invalid --usernames: {e}")
+    
+    def log(message, level="info"):
+        print(f"[{datetime.now().strftime('%H:%M:%S')}] {message}")
+    
+    options = dict(trace_path=args.trace, tts_routes=tts_routes,
+                   failover_latency=args.failover_latency,
+                   failover_error_rate=args.failover_error_rate,
+                   viewer_db=None if args.no_viewer_db else args.viewer_db,
+                   transcript_dir=None if args.no_transcript else args.transcript_dir,
+                   config_path=args.config)
+    
+    if args.workers > 1:
+        from fleet import FleetSupervisor
+        fleet = FleetSupervisor(streams, workers=args.workers, options=options, log=log)
+        fleet.start()
+        for line in fleet.report():
+            print(line)
+        return
+    
+    host = MultiStreamHost(streams, log=log, **options)
+    host.start()
+    for line in host.report():
+        print(line)
+    if args.trace_report:
+        for line in host.services.tracer.report():
+            print(line)
+    host.shutdown()
+    
+    if args.import_times:
+        for line in lazy_imports.import_report():
+            print(line)
 
 def main():
     """Main entry point"""
     parser = argparse.ArgumentParser(description='TikTok TTS Bot - Unified Version')
     parser.add_argument('--username', '-u', default='gamingutopiadf', 
                        help='TikTok username to connect to')
+    parser.add_argument('--usernames', metavar='USER[=VOICE],...',
+                       help='Serve several streams from one process (command-line mode), e.g. alice=en-GB-Wavenet-A,bob')
+    parser.add_argument('--workers', type=int, default=1,
+                       help='Shard --usernames across this many worker processes (restarted if they crash)')
     parser.add_argument('--gui', '-g', action='store_true', 
                        help='Run with GUI interface')
     parser.add_argument('--no-gui', action='store_true', 
                        help='Force command-line mode')
+    parser.add_argument('--config', metavar='FILE', default='config/bot.toml',
+                       help='Settings file (TOML), reloaded live when it changes')
+    parser.add_argument('--tts-route', action='append', default=[], metavar='CLASS=BACKEND',
+                       help=f"Route a message class ({', '.join(MESSAGE_CLASSES)}) to 'google' or 'local'")
+    parser.add_argument('--failover-latency', type=float, default=2.5,
+                       help='Average Google latency (seconds) that triggers failover to local TTS')
+    parser.add_argument('--failover-error-rate', type=float, default=0.3,
+                       help='Google error rate (0-1) that triggers failover to local TTS')
+    parser.add_argument('--viewer-db', metavar='FILE', default='data/viewers.db',
+                       help='SQLite file for persistent viewer history')
+    parser.add_argument('--no-viewer-db', action='store_true',
+                       help='Keep viewer history in memory only')
+    parser.add_argument('--transcript-dir', metavar='DIR', default='transcripts',
+                       help='Directory for the append-only chat transcript (one JSONL file per session)')
+    parser.add_argument('--no-transcript', action='store_true',
+                       help='Do not write a chat transcript')
+    parser.add_argument('--export', choices=EXPORT_FORMATS,
+                       help='Export all joins and viewers from the viewer database and exit')
+    parser.add_argument('--export-compression', choices=COMPRESSIONS, default='none',
+                       help='Compression for --export files (parquet: none or gzip)')
+    parser.add_argument('--record', metavar='FILE',
+                       help='Append live Join/Comment events to a replay file')
+    parser.add_argument('--replay', metavar='FILE',
+                       help='Replay a recorded session offline instead of connecting (command-line mode)')
+    parser.add_argument('--speed', type=float, default=1.0,
+                       help='Replay speed multiplier (0 = as fast as possible)')
+    parser.add_argument('--daemon', action='store_true',
+                       help='Run headless with a local HTTP/JSON control API instead of the GUI')
+    parser.add_argument('--control-host', default='127.0.0.1',
+                       help='Address for the control API (default 127.0.0.1)')
+    parser.add_argument('--control-port', type=int, default=8765,
+                       help='Port for the control API (default 8765)')
+    parser.add_argument('--control-token', metavar='TOKEN',
+                       help='Require "Authorization: Bearer TOKEN" on control API requests')
+    parser.add_argument('--remote-gui', metavar='URL', nargs='?', const='http://127.0.0.1:8765',
+                       help='Open the GUI as a client of a bot running with --daemon (default http://127.0.0.1:8765)')
+    parser.add_argument('--import-times', action='store_true',
+                       help='Print a breakdown of deferred import costs and start-up milestones on exit')
+    parser.add_argument('--trace', metavar='FILE',
+                       help='Write per-event pipeline timings to a JSONL file')
+    parser.add_argument('--trace-report', action='store_true',
+                       help='Print p50/p95/p99 stage timings when the bot stops')
+    parser.add_argument('--trace-report-from', metavar='FILE',
+                       help='Print the timing report for an existing JSONL trace and exit')
     
     args = parser.parse_args()
     
+    if args.trace_report_from:
+        for line in report_from_file(args.trace_report_from):
+            print(line)
+        return
+    
+    if args.remote_gui:
+        from remote_gui import RemoteGUI
+        RemoteGUI(args.remote_gui, args.control_token).run()
+        return
+    
     # Determine mode
-    if args.no_gui:
+    if args.no_gui or args.replay or args.export or args.usernames or args.daemon:
         gui_mode = False
     elif args.gui:
         gui_mode = True
@@ -1407,12 +1805,53 @@ def main():
     print(f"🎮 TikTok TTS Bot - Starting in {'GUI' if gui_mode else 'Command Line'} mode")
     
     # Create and run bot
-    bot = TikTokTTSBot(username=args.username, gui_mode=gui_mode)
+    tts_routes = {}
+    for route in args.tts_route:
+        message_class, _, backend = route.partition("=")
+        if message_class not in MESSAGE_CLASSES or backend not in ("google", "local"):
+            parser.error(f"invalid --tts-route '{route}' (expected CLASS=google|local)")
+        tts_routes[message_class] = backend
+    
+    if args.usernames:
+        run_multi_stream(args, tts_routes, parser)
+        return
     
-    if gui_mode:
+    bot = TikTokTTSBot(username=args.username, gui_mode=gui_mode, trace_path=args.trace,
+                       tts_routes=tts_routes, failover_latency=args.failover_latency,
+                       failover_error_rate=args.failover_error_rate,
+                       record_path=args.record,
+                       viewer_db=None if args.no_viewer_db else args.viewer_db,
+                       transcript_dir=None if args.no_transcript or args.export else args.transcript_dir,
+                       config_path=args.config)
+    
+    if args.export:
+        bot.stats["start_time"] = None  # whole history, not just this session
+        bot.export_users_list(args.export, args.export_compression, wait=True)
+    elif args.replay:
+        bot.replay(args.replay, args.speed)
+    elif args.daemon:
+        if args.gui and GUI_AVAILABLE:
+            # Window in its own process so rendering never competes with the bot
+            import subprocess
+            gui_command = [sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), "remote_gui.py"),
+                           f"http://{args.control_host}:{args.control_port}"]
+            if args.control_token:
+                gui_command += ["--token", args.control_token]
+            subprocess.Popen(gui_command)
+        bot.run_daemon(args.control_host, args.control_port, args.control_token)
+    elif gui_mode:
         bot.run_gui()
     else:
         bot.start_bot()
+    
+    bot.shutdown()
+    if args.trace_report:
+        for line in bot.tracer.report():
+            print(line)
+    
+    if args.import_times:
+        for line in lazy_imports.import_report():
+            print(line)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,115 @@
+"""
+Chat Transcript - append-only JSONL log of every join, comment and utterance
+Handlers drop records into a bounded in-memory buffer; a background thread
+writes them in batches and fsyncs once per flush interval, so a crash loses at
+most one interval and the event loop never waits on disk.
+"""
+import os
+import glob
+import json
+import time
+import queue
+import threading
+from datetime import datetime
+
+
+class TranscriptWriter:
+    """One transcript per session, rotated into numbered parts by size"""
+
+    def __init__(self, directory="transcripts", max_bytes=10 * 1024 * 1024, buffer_size=10000,
+                 flush_interval=1.0, log=None):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.flush_interval = flush_interval
+        self.log = log or (lambda message, level="info": None)
+        self.session = datetime.now().strftime("session_%Y%m%d_%H%M%S")
+        self.part = 1
+        self.dropped = 0
+        self.written = 0
+        os.makedirs(directory, exist_ok=True)
+
+        self._buffer = queue.Queue(maxsize=buffer_size)
+        self._stop = threading.Event()
+        self._file = open(self.current_path(), "a", encoding="utf-8")
+        self._writer = threading.Thread(target=self._writer_loop, name="transcript", daemon=True)
+        self._writer.start()
+
+    def current_path(self):
+        suffix = "" if self.part == 1 else f"_part{self.part}"
+        return os.path.join(self.directory, f"{self.session}{suffix}.jsonl")
+
+    def session_paths(self):
+        """Every part written for this session, oldest first"""
+        paths = glob.glob(os.path.join(self.directory, f"{self.session}*.jsonl"))
+        return sorted(paths, key=lambda p: (len(p), p))
+
+    def record(self, kind, user=None, text=None, **extra):
+        """Queue one transcript entry - never blocks; drops (and counts) when the buffer is full"""
+        entry = {"ts": round(time.time(), 3), "kind": kind}
+        if user is not None:
+            entry["user"] = user
+        if text is not None:
+            entry["text"] = text
+        entry.update(extra)
+        try:
+            self._buffer.put_nowait(entry)
+        except queue.Full:
+            self.dropped += 1
+
+    def _writer_loop(self):
+        while not self._stop.is_set():
+            self._stop.wait(self.flush_interval)
+            self._drain()
+        self._drain()
+
+    def _drain(self):
+        lines = []
+        while True:
+            try:
+                lines.append(json.dumps(self._buffer.get_nowait(), ensure_ascii=False) + "\n")
+            except queue.Empty:
+                break
+        if not lines:
+            return
+        try:
+            self._file.writelines(lines)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self.written += len(lines)
+            if self._file.tell() >= self.max_bytes:
+                self._rotate()
+        except OSError as e:
+            self.log(f"❌ Transcript write failed: {e}", "error")
+
+    def _rotate(self):
+        self._file.close()
+        self.part += 1
+        self._file = open(self.current_path(), "a", encoding="utf-8")
+        self.log(f"📜 Transcript rotated to {os.path.basename(self.current_path())}", "info")
+
+    def close(self):
+        """Write whatever is buffered and close the file"""
+        if self._stop.is_set():
+            return
+        self._stop.set()
+        self._writer.join(timeout=10)
+        self._file.close()
+        if self.dropped:
+            self.log(f"⚠️ Transcript buffer overflowed - {self.dropped} entries dropped", "warning")
+
+
+def iter_transcript(paths, chunk_size=1000):
+    """Yield lists of transcript entries from JSONL files, chunk by chunk"""
+    chunk = []
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    chunk.append(json.loads(line))
+                except ValueError:
+                    continue
+                if len(chunk) >= chunk_size:
+                    yield chunk
+                    chunk = []
+    if chunk:
+        yield chunk
@@ -0,0 +1,284 @@
+"""
+TTS Backends - pluggable speech synthesis engines
+Google Cloud (premium voices) and a local offline engine (espeak-ng / Piper),
+plus a router that picks a backend per message class and fails over to local
+when Google gets slow or starts erroring.
+"""
+import os
+import abc
+import time
+import shutil
+import tempfile
+import threading
+import subprocess
+from collections import deque
+
+from lazy_imports import lazy_import, module_available
+
+# Imported on first use (and timed for --import-times) - the local backend never needs it
+texttospeech = lazy_import("google.cloud.texttospeech")
+
+# Message classes the bot speaks
+MESSAGE_CLASSES = ("welcome", "help", "joke", "gift", "first_chat", "chat", "test")
+
+# Default routing: short/frequent lines go local, jokes and chat keep premium voices
+DEFAULT_ROUTES = {
+    "welcome": "local",
+    "help": "google",
+    "joke": "google",
+    "gift": "google",
+    "first_chat": "google",
+    "chat": "google",
+    "test": "google",
+}
+
+
+class TTSError(Exception):
+    """Raised when a backend cannot synthesize speech"""
+
+
+def language_code_for(voice_name):
+    """Language code from a Google voice name like 'en-GB-Neural2-A'"""
+    parts = (voice_name or "").split("-")
+    if len(parts) >= 2 and len(parts[0]) in (2, 3):
+        return f"{parts[0]}-{parts[1]}"
+    return "en-US"
+
+
+def google_credentials_found():
+    """GOOGLE_APPLICATION_CREDENTIALS, or an application-default login from gcloud"""
+    path = os.environ.get("GOOGLE_APPLICATION_CREDENTIALS")
+    if path:
+        return os.path.isfile(path)
+    config_dir = os.environ.get("CLOUDSDK_CONFIG")
+    if not config_dir:
+        config_dir = (os.path.join(os.environ.get("APPDATA", ""), "gcloud") if os.name == "nt"
+                      else os.path.expanduser("~/.config/gcloud"))
+    return os.path.isfile(os.path.join(config_dir, "application_default_credentials.json"))
+
+
+class TTSBackend(abc.ABC):
+    """Base class - subclasses return (audio bytes, file extension)"""
+    name = "base"
+
+    def is_available(self):
+        """Whether this backend can be used on this machine"""
+        return True
+
+    @abc.abstractmethod
+    def synthesize(self, text, voice_name=None, speaking_rate=1.0):
+        """(audio bytes, file extension) for `text`; raises TTSError when it can't"""
+
+
+class GoogleTTSBackend(TTSBackend):
+    """Google Cloud Text-to-Speech with one shared client"""
+    name = "google"
+
+    def __init__(self, catalog=None):
+        self.catalog = catalog
+        self._client = None
+        self._installed = None
+        self._lock = threading.Lock()
+        self._voice_params = {}  # (voice name, language code) -> VoiceSelectionParams
+        self._audio_configs = {}  # speaking rate -> AudioConfig
+
+    def is_available(self):
+        """Needs google-cloud-texttospeech installed and credentials to call it with"""
+        if self._installed is None:
+            self._installed = module_available("google.cloud.texttospeech")
+        return self._installed and google_credentials_found()
+
+    def client(self):
+        """Create the TextToSpeechClient once (it is thread-safe)"""
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    self._client = texttospeech.TextToSpeechClient()
+        return self._client
+
+    def voice_params(self, voice_name):
+        """VoiceSelectionParams built once per voice and language - the language comes from the
+        catalog once it knows the voice, so a guess made before it loaded isn't kept"""
+        language = (self.catalog and self.catalog.language_of(voice_name)) or language_code_for(voice_name)
+        params = self._voice_params.get((voice_name, language))
+        if params is None:
+            params = self._voice_params[voice_name, language] = texttospeech.VoiceSelectionParams(
+                language_code=language, name=voice_name)
+        return params
+
+    def audio_config(self, speaking_rate):
+        """AudioConfig built once per speaking rate"""
+        config = self._audio_configs.get(speaking_rate)
+        if config is None:
+            # LINEAR16 comes back as a WAV file, so it can be loudness-normalized locally
+            config = self._audio_configs[speaking_rate] = texttospeech.AudioConfig(
+                audio_encoding=texttospeech.AudioEncoding.LINEAR16, sample_rate_hertz=24000,
+                speaking_rate=speaking_rate)
+        return config
+
+    def synthesize(self, text, voice_name=None, speaking_rate=1.0):
+        voice_name = voice_name or "en-US-Studio-M"
+        result = self.client().synthesize_speech(
+            input=texttospeech.SynthesisInput(text=text), voice=self.voice_params(voice_name),
+            audio_config=self.audio_config(speaking_rate))
+        return result.audio_content, "wav"
+
+    def list_voices(self):
+        """Every voice Google offers, as plain dicts (for the voice catalog cache)"""
+        response = self.client().list_voices()
+        return [{"name": v.name, "language_codes": list(v.language_codes),
+                 "gender": texttospeech.SsmlVoiceGender(v.ssml_gender).name.lower(),
+                 "sample_rate": v.natural_sample_rate_hertz} for v in response.voices]
+
+
+class LocalTTSBackend(TTSBackend):
+    """Offline synthesis through espeak-ng (or espeak), or Piper when a model is configured"""
+    name = "local"
+
+    def __init__(self, piper_model=None, speed=175, timeout=15):
+        self.piper_model = piper_model or os.environ.get("PIPER_MODEL")
+        self.speed = speed
+        self.timeout = timeout
+        self.piper = shutil.which("piper") if self.piper_model else None
+        self.espeak = shutil.which("espeak-ng") or shutil.which("espeak")
+
+    def is_available(self):
+        return bool(self.piper or self.espeak)
+
+    def synthesize(self, text, voice_name=None, speaking_rate=1.0):
+        if self.piper:
+            return self._synthesize_piper(text, speaking_rate), "wav"
+        if self.espeak:
+            return self._synthesize_espeak(text, voice_name, speaking_rate), "wav"
+        raise TTSError("No local TTS engine found (install espeak-ng or set PIPER_MODEL)")
+
+    def _synthesize_espeak(self, text, voice_name, speaking_rate=1.0):
+        # espeak voices are lower-case variants such as en-us / en-gb
+        voice = language_code_for(voice_name).lower()
+        speed = str(int(self.speed * speaking_rate))
+        result = subprocess.run([self.espeak, "-v", voice, "-s", speed, "--stdout", text],
+                                capture_output=True, timeout=self.timeout)
+        if result.returncode != 0 or not result.stdout:
+            raise TTSError(f"espeak failed: {result.stderr.decode(errors='ignore').strip()}")
+        return result.stdout
+
+    def _synthesize_piper(self, text, speaking_rate=1.0):
+        fd, path = tempfile.mkstemp(suffix=".wav")
+        os.close(fd)
+        try:
+            result = subprocess.run([self.piper, "--model", self.piper_model, "--output_file", path,
+                                     "--length_scale", f"{1 / speaking_rate:.3f}"],
+                                    input=text.encode("utf-8"), capture_output=True, timeout=self.timeout)
+            if result.returncode != 0:
+                raise TTSError(f"piper failed: {result.stderr.decode(errors='ignore').strip()}")
+            with open(path, "rb") as f:
+                return f.read()
+        finally:
+            os.remove(path)
+
+
+class BackendHealth:
+    """Sliding window of recent call latencies and failures for one backend"""
+
+    def __init__(self, window=20):
+        self.calls = deque(maxlen=window)
+
+    def record(self, latency, ok):
+        self.calls.append((latency, ok))
+
+    def error_rate(self):
+        if not self.calls:
+            return 0.0
+        return sum(1 for _, ok in self.calls if not ok) / len(self.calls)
+
+    def average_latency(self):
+        latencies = [latency for latency, ok in self.calls if ok]
+        return sum(latencies) / len(latencies) if latencies else 0.0
+
+
+class TTSRouter:
+    """Chooses a backend per message class and fails over to local on trouble"""
+
+    def __init__(self, backends, routes=None, fallback="local", latency_threshold=2.5,
+                 error_rate_threshold=0.3, min_calls=5, cooldown=60, log=None):
+        self.backends = {b.name: b for b in backends}
+        self.routes = dict(DEFAULT_ROUTES)
+        self.routes.update(routes or {})
+        self.fallback = fallback
+        self.latency_threshold = latency_threshold
+        self.error_rate_threshold = error_rate_threshold
+        self.min_calls = min_calls
+        self.cooldown = cooldown
+        self.log = log or (lambda message, level="info": None)
+        self.health = {name: BackendHealth() for name in self.backends}
+        self.degraded_until = {}
+        self._lock = threading.Lock()
+
+    def set_route(self, message_class, backend_name):
+        """Send a message class to a specific backend"""
+        if backend_name not in self.backends:
+            raise ValueError(f"Unknown TTS backend '{backend_name}'")
+        self.routes[message_class] = backend_name
+
+    def is_degraded(self, name):
+        return time.monotonic() < self.degraded_until.get(name, 0)
+
+    def backend_for(self, message_class):
+        """Backend that should handle this message class right now"""
+        name = self.routes.get(message_class, "google")
+        backend = self.backends.get(name)
+        fallback = self.backends.get(self.fallback)
+        if backend is None or not backend.is_available():
+            return fallback if fallback and fallback.is_available() else self.backends.get("google")
+        if name != self.fallback and self.is_degraded(name) and fallback and fallback.is_available():
+            return fallback
+        return backend
+
+    def synthesize(self, text, message_class="chat", voice_name=None, speaking_rate=1.0):
+        """Synthesize with the routed backend; returns (audio, extension, backend name)"""
+        backend = self.backend_for(message_class)
+        try:
+            return self._call(backend, text, voice_name, speaking_rate) + (backend.name,)
+        except Exception as e:
+            fallback = self.backends.get(self.fallback)
+            if backend.name == self.fallback or fallback is None or not fallback.is_available():
+                raise
+            self.log(f"⚠️ {backend.name} TTS failed ({e}) - using {fallback.name} voice", "warning")
+            return self._call(fallback, text, voice_name, speaking_rate) + (fallback.name,)
+
+    def _call(self, backend, text, voice_name, speaking_rate=1.0):
+        start = time.monotonic()
+        try:
+            result = backend.synthesize(text, voice_name, speaking_rate)
+        except Exception:
+            self._record(backend.name, time.monotonic() - start, False)
+            raise
+        self._record(backend.name, time.monotonic() - start, True)
+        return result
+
+    def _record(self, name, latency, ok):
+        with self._lock:
+            health = self.health.setdefault(name, BackendHealth())
+            health.record(latency, ok)
+            if name == self.fallback or len(health.calls) < self.min_calls or self.is_degraded(name):
+                return
+            error_rate = health.error_rate()
+            avg_latency = health.average_latency()
+            if error_rate >= self.error_rate_threshold or avg_latency >= self.latency_threshold:
+                self.degraded_until[name] = time.monotonic() + self.cooldown
+                health.calls.clear()
+                self.log(f"🔀 {name} TTS degraded (errors {error_rate:.0%}, avg {avg_latency:.1f}s) - "
+                         f"failing over to {self.fallback} for {self.cooldown}s", "warning")
+
+    def status(self):
+        """Short description of each backend's state"""
+        parts = []
+        for name, backend in self.backends.items():
+            if not backend.is_available():
+                state = "unavailable"
+            elif self.is_degraded(name):
+                state = "degraded"
+            else:
+                state = "ok"
+            parts.append(f"{name}={state}")
+        return ", ".join(parts)
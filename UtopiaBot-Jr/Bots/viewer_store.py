@@ -0,0 +1,216 @@
+"""
+Viewer Store - durable viewer history in SQLite (WAL mode)
+Joins and messages are queued by the event handlers and written in batches by
+a background thread, so the handlers never wait on disk.
+"""
+import os
+import time
+import queue
+import sqlite3
+import threading
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS viewers (
+    username      TEXT PRIMARY KEY,
+    first_seen    REAL NOT NULL,
+    last_seen     REAL NOT NULL,
+    join_count    INTEGER NOT NULL DEFAULT 0,
+    message_count INTEGER NOT NULL DEFAULT 0
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_viewers_last_seen ON viewers(last_seen);
+
+CREATE TABLE IF NOT EXISTS joins (
+    id       INTEGER PRIMARY KEY,
+    username TEXT NOT NULL,
+    ts       REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_joins_ts ON joins(ts);
+CREATE INDEX IF NOT EXISTS idx_joins_username_ts ON joins(username, ts);
+"""
+
+UPSERT_VIEWER = """
+INSERT INTO viewers (username, first_seen, last_seen, join_count, message_count)
+VALUES (?, ?, ?, ?, ?)
+ON CONFLICT(username) DO UPDATE SET
+    first_seen    = min(first_seen, excluded.first_seen),
+    last_seen     = max(last_seen, excluded.last_seen),
+    join_count    = join_count + excluded.join_count,
+    message_count = message_count + excluded.message_count
+"""
+
+_STOP = object()
+
+
+def connect(path):
+    """Open a connection with the pragmas every store connection uses"""
+    conn = sqlite3.connect(path, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA busy_timeout=5000")
+    return conn
+
+
+class ViewerStore:
+    """SQLite-backed viewer history with batched background writes"""
+
+    def __init__(self, path="data/viewers.db", flush_interval=1.0, batch_size=500, log=None):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.log = log or (lambda message, level="info": None)
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        self._write_conn = connect(path)
+        self._write_conn.executescript(SCHEMA)
+        self._write_conn.commit()
+        self._read_conn = connect(path)
+        self._read_lock = threading.Lock()
+
+        self._queue = queue.Queue()
+        self._closed = False
+        self.writes = 0
+        self._writer = threading.Thread(target=self._writer_loop, name="viewer-store", daemon=True)
+        self._writer.start()
+
+    # Event handler side - never blocks on disk
+    def record_join(self, username, ts=None):
+        if not self._closed:
+            self._queue.put(("join", username, ts or time.time()))
+
+    def record_message(self, username, ts=None):
+        if not self._closed:
+            self._queue.put(("message", username, ts or time.time()))
+
+    # Writer thread
+    def _writer_loop(self):
+        while True:
+            try:
+                first = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+            batch = [first]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size and batch[-1] is not _STOP:
+                try:
+                    batch.append(self._queue.get(timeout=max(0.0, deadline - time.monotonic())))
+                except queue.Empty:
+                    break
+            stop = any(item is _STOP for item in batch)
+            try:
+                self._write_batch([item for item in batch if item is not _STOP])
+            except sqlite3.Error as e:
+                self.log(f"❌ Viewer database write failed: {e}", "error")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+            if stop:
+                return
+
+    def _write_batch(self, batch):
+        if not batch:
+            return
+        # Fold the batch per viewer so each username is written once
+        viewers = {}
+        joins = []
+        for kind, username, ts in batch:
+            row = viewers.get(username)
+            if row is None:
+                row = viewers[username] = [username, ts, ts, 0, 0]
+            row[1] = min(row[1], ts)
+            row[2] = max(row[2], ts)
+            if kind == "join":
+                row[3] += 1
+                joins.append((username, ts))
+            else:
+                row[4] += 1
+        with self._write_conn:
+            self._write_conn.executemany(UPSERT_VIEWER, viewers.values())
+            if joins:
+                self._write_conn.executemany("INSERT INTO joins (username, ts) VALUES (?, ?)", joins)
+        self.writes += len(batch)
+
+    def flush(self):
+        """Block until everything queued so far is on disk"""
+        self._queue.join()
+
+    def close(self):
+        """Flush pending writes and close the database"""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._writer.join(timeout=10)
+        self._write_conn.close()
+        with self._read_lock:
+            self._read_conn.close()
+
+    # Lookups (primary key / index seeks - O(log n))
+    def lookup(self, username):
+        """Viewer record as a dict, or None if never seen"""
+        with self._read_lock:
+            row = self._read_conn.execute(
+                "SELECT username, first_seen, last_seen, join_count, message_count "
+                "FROM viewers WHERE username = ?", (username,)).fetchone()
+        if row is None:
+            return None
+        return dict(zip(("username", "first_seen", "last_seen", "join_count", "message_count"), row))
+
+    def is_returning(self, username):
+        """True if the viewer was seen before"""
+        with self._read_lock:
+            return self._read_conn.execute(
+                "SELECT 1 FROM viewers WHERE username = ?", (username,)).fetchone() is not None
+
+    def count_viewers(self):
+        with self._read_lock:
+            return self._read_conn.execute("SELECT count(*) FROM viewers").fetchone()[0]
+
+    def count_joins(self, since=None):
+        with self._read_lock:
+            return self._read_conn.execute(
+                "SELECT count(*) FROM joins WHERE ts >= ?", (since or 0,)).fetchone()[0]
+
+    # Streaming reads - each iterator uses its own connection so exports
+    # never hold the lookup lock or load the whole table into memory
+    def _iter_query(self, sql, params=(), chunk_size=1000):
+        conn = connect(self.path)
+        try:
+            cursor = conn.execute(sql, params)
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                yield rows
+        finally:
+            conn.close()
+
+    def iter_viewers(self, chunk_size=1000):
+        """Yield chunks of (username, first_seen, last_seen, join_count, message_count) by username"""
+        return self._iter_query(
+            "SELECT username, first_seen, last_seen, join_count, message_count FROM viewers ORDER BY username",
+            chunk_size=chunk_size)
+
+    def iter_viewers_since(self, last_seen, chunk_size=1000):
+        """Yield chunks of (username, last_seen) for viewers seen after `last_seen` (uses the index)"""
+        return self._iter_query(
+            "SELECT username, last_seen FROM viewers WHERE last_seen > ?",
+            (last_seen,), chunk_size=chunk_size)
+
+    def max_last_seen(self):
+        """Timestamp of the most recent viewer activity on disk"""
+        with self._read_lock:
+            return self._read_conn.execute("SELECT max(last_seen) FROM viewers").fetchone()[0] or 0.0
+
+    def iter_joins(self, since=None, newest_first=True, chunk_size=1000):
+        """Yield chunks of (username, ts) join events, optionally only those after `since`"""
+        order = "DESC" if newest_first else "ASC"
+        return self._iter_query(
+            f"SELECT username, ts FROM joins WHERE ts >= ? ORDER BY ts {order}",
+            (since or 0,), chunk_size=chunk_size)
+
+    def recent_joins(self, limit=50):
+        """Most recent join events, newest first"""
+        with self._read_lock:
+            return self._read_conn.execute(
+                "SELECT username, ts FROM joins ORDER BY ts DESC LIMIT ?", (limit,)).fetchall()
@@ -0,0 +1,162 @@
+"""
+Voice Catalog - every Google voice, fetched once and cached on disk
+list_voices is called at most once per TTL (default a week); the result is
+saved as JSON so later starts - and offline starts - read the file instead.
+Voices are indexed by name, language, gender and tier, so looking up a voice
+or "all female Neural2 voices for de-DE" is a dictionary access.
+"""
+import os
+import json
+import time
+import threading
+
+TIERS = ("Studio", "Neural2", "Wavenet", "Journey", "Chirp", "Polyglot", "News", "Standard")
+LANGUAGE_FLAGS = {"en-US": "🇺🇸", "en-GB": "🇬🇧", "en-AU": "🇦🇺", "en-IN": "🇮🇳", "de-DE": "🇩🇪",
+                  "fr-FR": "🇫🇷", "es-ES": "🇪🇸", "es-US": "🇲🇽", "it-IT": "🇮🇹", "pt-BR": "🇧🇷",
+                  "ja-JP": "🇯🇵", "ko-KR": "🇰🇷", "cmn-CN": "🇨🇳", "ru-RU": "🇷🇺", "nl-NL": "🇳🇱"}
+
+
+def voice_tier(name):
+    """'en-US-Neural2-F' -> 'Neural2'; 'en-US-Chirp3-HD-Aoede' -> 'Chirp'"""
+    parts = name.split("-")
+    if len(parts) < 3:
+        return "Standard"
+    for tier in TIERS:
+        if parts[2].startswith(tier):
+            return tier
+    return parts[2]
+
+
+class Voice:
+    """One catalog entry"""
+    __slots__ = ("name", "language_codes", "gender", "tier", "sample_rate")
+
+    def __init__(self, name, language_codes, gender="neutral", sample_rate=24000):
+        self.name = name
+        self.language_codes = tuple(language_codes)
+        self.gender = gender
+        self.tier = voice_tier(name)
+        self.sample_rate = sample_rate
+
+    @property
+    def language(self):
+        return self.language_codes[0] if self.language_codes else "en-US"
+
+    @property
+    def label(self):
+        """Dropdown label, e.g. '🇬🇧 en-GB-Neural2-A (female)'"""
+        return f"{LANGUAGE_FLAGS.get(self.language, '🌐')} {self.name} ({self.gender})"
+
+    def as_dict(self):
+        return {"name": self.name, "language_codes": list(self.language_codes),
+                "gender": self.gender, "sample_rate": self.sample_rate}
+
+
+class VoiceCatalog:
+    """list_voices result with a disk cache and lookup indexes"""
+
+    def __init__(self, fetch, cache_path="data/voices.json", ttl=7 * 86400, log=None):
+        self.fetch = fetch
+        self.cache_path = cache_path
+        self.ttl = ttl
+        self.log = log or (lambda message, level="info": None)
+        self.by_name = {}
+        self.by_language = {}
+        self.by_gender = {}
+        self.by_tier = {}
+        self.fetched_at = None
+        self.version = 0  # bumps on every (re)load so views can tell they're stale
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self):
+        return bool(self.by_name)
+
+    def load(self, refresh=False):
+        """Fill the catalog from the cache if fresh, else from list_voices (stale cache if that fails)"""
+        with self._lock:
+            cached = None if refresh else self._read_cache()
+            if cached and time.time() - cached["fetched_at"] < self.ttl:
+                self._index(cached["voices"], cached["fetched_at"])
+                return True
+            try:
+                voices = self.fetch()
+            except Exception as e:
+                if cached:
+                    self.log(f"⚠️ Voice list refresh failed ({e}) - using cached list", "warning")
+                    self._index(cached["voices"], cached["fetched_at"])
+                    return True
+                self.log(f"⚠️ Voice catalog unavailable ({e}) - using configured voices only", "warning")
+                return False
+            self._index(voices, time.time())
+            self._write_cache(voices)
+            self.log(f"🎙️ Voice catalog: {len(self.by_name)} voices in {len(self.by_language)} languages", "info")
+            return True
+
+    def _read_cache(self):
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return None
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return data if isinstance(data.get("voices"), list) and "fetched_at" in data else None
+        except (OSError, ValueError, AttributeError):
+            return None
+
+    def _write_cache(self, voices):
+        if not self.cache_path:
+            return
+        try:
+            directory = os.path.dirname(self.cache_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_path = self.cache_path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"fetched_at": self.fetched_at, "voices": voices}, f)
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            self.log(f"⚠️ Could not cache voice list: {e}", "warning")
+
+    def _index(self, voices, fetched_at):
+        by_name, by_language, by_gender, by_tier = {}, {}, {}, {}
+        for entry in voices:
+            voice = Voice(entry["name"], entry.get("language_codes") or [], entry.get("gender", "neutral"),
+                          entry.get("sample_rate", 24000))
+            by_name[voice.name] = voice
+            for code in voice.language_codes:
+                by_language.setdefault(code, []).append(voice)
+            by_gender.setdefault(voice.gender, []).append(voice)
+            by_tier.setdefault(voice.tier, []).append(voice)
+        # Swap whole dicts so readers on other threads never see a half-built index
+        self.by_name, self.by_language, self.by_gender, self.by_tier = by_name, by_language, by_gender, by_tier
+        self.fetched_at = fetched_at
+        self.version += 1
+
+    def get(self, name):
+        return self.by_name.get(name)
+
+    def language_of(self, name):
+        voice = self.by_name.get(name)
+        return voice.language if voice else None
+
+    def languages(self):
+        return sorted(self.by_language)
+
+    def voices(self, language=None, gender=None, tier=None):
+        """Voices matching every given filter, best tiers first"""
+        if language:
+            candidates = self.by_language.get(language)
+            if candidates is None:
+                # 'de' matches de-DE, de-AT, ...
+                candidates = [v for code, vs in self.by_language.items()
+                              if code.split("-")[0] == language for v in vs]
+        elif gender:
+            candidates = self.by_gender.get(gender, [])
+        elif tier:
+            candidates = self.by_tier.get(tier, [])
+        else:
+            candidates = list(self.by_name.values())
+        matches = [v for v in candidates
+                   if (gender is None or v.gender == gender) and (tier is None or v.tier == tier)]
+        rank = {name: i for i, name in enumerate(TIERS)}
+        return sorted(matches, key=lambda v: (rank.get(v.tier, len(TIERS)), v.name))
@@ -0,0 +1,113 @@
+import os
+import re
+import time
+import threading
+
+import pytest
+
+from bot_config import BotConfig, ConfigError, ConfigWatcher, PollingWatcher, load_config, DEFAULTS
+
+BOTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Bots")
+
+
+def write(path, text):
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+
+def test_defaults_without_a_file(tmp_path):
+    config = load_config(str(tmp_path / "missing.toml"))
+    assert config.source is None
+    assert config.reset_interval == DEFAULTS["dedup"]["reset_interval"]
+    assert dict(config.speech_classes["chat"]) == DEFAULTS["speech"]["classes"]["chat"]
+
+
+def test_shipped_config_is_valid():
+    config = load_config(os.path.join(BOTS_DIR, "config", "bot.toml"))
+    assert config.source.endswith("bot.toml")
+
+
+def test_file_values_override_defaults(tmp_path):
+    path = write(tmp_path / "bot.toml", """
+[dedup]
+reset_interval = 120
+
+[connection.backoff]
+network = [1, 10]
+
+[speech.classes.chat]
+target = 5
+""")
+    config = load_config(path)
+    assert config.reset_interval == 120
+    assert config.backoff["network"] == (1, 10)
+    assert config.backoff["dropped"] == tuple(DEFAULTS["connection"]["backoff"]["dropped"])
+    assert dict(config.speech_classes["chat"]) == {"target": 5, "max_wait": 30.0}
+
+
+@pytest.mark.parametrize("toml, message", [
+    ("[dedup]\nreset_intervall = 5", "unknown setting 'dedup.reset_intervall'"),
+    ("[dedup]\nreset_interval = 0", "dedup.reset_interval must be a number >= 1"),
+    ("[dedup]\nreset_interval = true", "dedup.reset_interval"),
+    ("dedup = 5", "'dedup' must be a table"),
+    ("[connection.backoff]\nnetwork = [10, 1]", "max must be >= base"),
+    ("[connection.backoff]\nsolar_flare = [1, 2]", "unknown error class"),
+    ("[budget]\nfallback = \"shout\"", "budget.fallback"),
+    ("[speech.classes.chat]\ntarget = 40", "max_wait must be >= target"),
+    ("[speech.classes.karaoke]\ntarget = 1\nmax_wait = 2", "unknown speech class"),
+    ("[filter]\naction = \"ban\"", "filter.action"),
+    ("[languages]\nmin_confidence = 2", "languages.min_confidence"),
+    ("[audio]\nmax_rate = 5", "audio.max_rate"),
+])
+def test_invalid_settings_are_rejected(tmp_path, toml, message):
+    with pytest.raises(ConfigError, match=re.escape(message)):
+        load_config(write(tmp_path / "bot.toml", toml))
+
+
+def test_broken_toml_is_a_config_error(tmp_path):
+    with pytest.raises(ConfigError):
+        load_config(write(tmp_path / "bot.toml", "[dedup\nreset_interval = "))
+
+
+def test_config_is_read_only():
+    config = BotConfig()
+    with pytest.raises(AttributeError):
+        config.reset_interval = 1
+    with pytest.raises(TypeError):
+        config.backoff["network"] = (1, 2)
+
+
+def test_reload_passes_new_config_to_listeners(tmp_path):
+    path = write(tmp_path / "bot.toml", "[dedup]\nreset_interval = 60")
+    watcher = ConfigWatcher(path, load_config(path))
+    seen = []
+    watcher.add_listener(seen.append)
+    write(tmp_path / "bot.toml", "[dedup]\nreset_interval = 90")
+    assert watcher.reload().reset_interval == 90
+    assert [config.reset_interval for config in seen] == [90]
+    assert watcher.config is seen[0]
+
+
+def test_invalid_edit_keeps_running_config(tmp_path):
+    path = write(tmp_path / "bot.toml", "[dedup]\nreset_interval = 60")
+    messages = []
+    watcher = ConfigWatcher(path, load_config(path), log=lambda message, level="info": messages.append(level))
+    seen = []
+    watcher.add_listener(seen.append)
+    write(tmp_path / "bot.toml", "[dedup]\nreset_interval = -1")
+    assert watcher.reload() is None
+    assert watcher.config.reset_interval == 60
+    assert seen == [] and messages == ["error"]
+
+
+def test_polling_watcher_notices_changes(tmp_path):
+    path = write(tmp_path / "bot.toml", "[dedup]\nreset_interval = 60")
+    changed = threading.Event()
+    watcher = PollingWatcher(path, changed.set, interval=0.05)
+    watcher.start()
+    try:
+        time.sleep(0.1)
+        write(tmp_path / "bot.toml", "[dedup]\nreset_interval = 600")
+        assert changed.wait(2)
+    finally:
+        watcher.stop()
@@ -0,0 +1,139 @@
+import time
+import random
+import asyncio
+
+import pytest
+
+from connection_supervisor import (ConnectionSupervisor, CircuitBreaker, DecorrelatedJitter,
+                                   classify_error, BACKOFF_POLICIES)
+
+FAST = {kind: (0.01, 0.02) for kind in BACKOFF_POLICIES}
+
+
+class UserNotFoundError(Exception):
+    pass
+
+
+def make_supervisor(connect, **kwargs):
+    running = {"value": True}
+    states = []
+    supervisor = ConnectionSupervisor(connect, lambda: running["value"], policies=FAST,
+                                      on_state=lambda state, detail=None: states.append(state),
+                                      rng=random.Random(1), **kwargs)
+    return supervisor, running, states
+
+
+@pytest.mark.parametrize("error, kind", [
+    (UserNotFoundError("nope"), "not_found"),
+    (Exception("Rate limit exceeded (429)"), "rate_limited"),
+    (Exception("host is not live"), "offline"),
+    (ConnectionResetError("reset"), "network"),
+    (Exception("you have been blocked"), "blocked"),
+    (ValueError("something odd"), "unknown"),
+])
+def test_classify_error(error, kind):
+    assert classify_error(error) == kind
+
+
+def test_decorrelated_jitter_stays_between_base_and_cap():
+    jitter = DecorrelatedJitter(1, 10, random.Random(0))
+    delays = [jitter.next_delay() for _ in range(50)]
+    assert all(1 <= delay <= 10 for delay in delays)
+    assert max(delays) == 10
+    jitter.reset()
+    assert jitter.sleep == 1
+
+
+def test_circuit_breaker_opens_and_backs_off_after_failed_trial():
+    breaker = CircuitBreaker(threshold=2, open_for=60, max_open_for=200)
+    assert not breaker.record_failure()
+    assert breaker.record_failure()
+    assert breaker.state == "open"
+    breaker.opened_at = time.monotonic() - 61
+    assert breaker.state == "half-open"
+    assert breaker.record_failure()
+    assert breaker.open_for == 120
+    breaker.record_success()
+    assert (breaker.state, breaker.failures, breaker.open_for) == ("closed", 0, 60)
+
+
+def test_reconnects_after_errors_until_connected():
+    attempts = []
+
+    async def connect():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise ConnectionResetError("reset")
+        running["value"] = False
+
+    supervisor, running, states = make_supervisor(connect)
+    asyncio.run(supervisor.run())
+    assert len(attempts) == 3
+    assert supervisor.reconnects == 2
+    assert states[-1] == "stopped"
+
+
+def test_fatal_error_gives_up():
+    async def connect():
+        raise UserNotFoundError("user not found")
+
+    supervisor, running, states = make_supervisor(connect)
+    asyncio.run(supervisor.run())
+    assert supervisor.attempts == 1
+    assert states[-1] == "failed"
+
+
+def test_stop_disconnects_and_ends_run():
+    disconnected = []
+
+    async def connect():
+        await asyncio.sleep(60)
+
+    async def disconnect():
+        disconnected.append(True)
+
+    supervisor, running, states = make_supervisor(connect, disconnect=disconnect)
+
+    async def main():
+        task = asyncio.create_task(supervisor.run())
+        await asyncio.sleep(0.05)
+        running["value"] = False
+        supervisor.stop()
+        await asyncio.wait_for(task, 2)
+
+    asyncio.run(main())
+    assert disconnected == [True]
+    assert states[-1] == "stopped"
+    assert supervisor.reconnects == 0
+
+
+def test_cancellation_from_outside_propagates():
+    async def connect():
+        await asyncio.sleep(60)
+
+    supervisor, running, states = make_supervisor(connect)
+
+    async def main():
+        task = asyncio.create_task(supervisor.run())
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(main())
+    assert supervisor.reconnects == 0
+
+
+def test_connection_cancelled_by_the_client_reconnects():
+    attempts = []
+
+    async def connect():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise asyncio.CancelledError()
+        running["value"] = False
+
+    supervisor, running, states = make_supervisor(connect)
+    asyncio.run(supervisor.run())
+    assert len(attempts) == 2
+    assert supervisor.reconnects == 1
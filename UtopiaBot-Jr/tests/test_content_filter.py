@@ -0,0 +1,95 @@
+import pytest
+
+from content_filter import Automaton, ContentFilter, fold, parse_rule
+
+
+@pytest.fixture
+def content_filter():
+    return ContentFilter(words=["ass", "shit*", "bitch*", "dick", "damn = dang"])
+
+
+def test_automaton_finds_overlapping_patterns():
+    automaton = Automaton(["he", "she", "his", "hers"])
+    found = {(start, end, automaton.patterns[index]) for start, end, index in automaton.matches("ushers")}
+    assert found == {(1, 4, "she"), (2, 4, "he"), (2, 6, "hers")}
+
+
+def test_fold_collapses_runs_and_maps_back():
+    folded, origin = fold("Heeey")
+    assert folded == "hey"
+    assert origin[1] == (1, 4)
+
+
+def test_parse_rule():
+    assert parse_rule("word") == ("word", False, None)
+    assert parse_rule("Wörd* # comment") == ("word", True, None)
+    assert parse_rule("damn = dang") == ("damn", False, "dang")
+    assert parse_rule("   # only a comment") is None
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("you ass", "you a**"),
+    ("ASS!", "A**!"),
+    ("a55", "a**"),
+    ("@ss", "@**"),
+    ("assssss", "a******"),
+    ("sh!t happens", "s*** happens"),
+    ("shiiiiit", "s*******"),
+    ("b1tch", "b****"),
+    ("bitches", "b******"),
+    ("shitty", "s*****"),
+    ("ŝhit", "ŝ***"),
+])
+def test_disguised_words_are_masked(content_filter, expected, text):
+    assert content_filter.check(text) == expected
+
+
+@pytest.mark.parametrize("text", [
+    "what a class act",
+    "as if",
+    "assume nothing",
+    "455 followers",
+    "1000 likes",
+    "no!",
+    "read dickens",
+    "passed the test",
+])
+def test_innocent_text_is_untouched(content_filter, text):
+    assert content_filter.check(text) == text
+
+
+def test_substitution(content_filter):
+    assert content_filter.check("damn that was close") == "dang that was close"
+
+
+def test_skip_action_drops_the_message():
+    content_filter = ContentFilter(words=["ass"], action="skip")
+    assert content_filter.check("you ass") is None
+    assert content_filter.check("class") == "class"
+    assert content_filter.skipped == 1
+
+
+def test_substitute_action_uses_the_replacement():
+    content_filter = ContentFilter(words=["ass"], action="substitute", replacement="beep")
+    assert content_filter.check("you ass") == "you beep"
+
+
+def test_disabled_filter_passes_everything():
+    content_filter = ContentFilter(words=["ass"], enabled=False)
+    assert content_filter.check("you ass") == "you ass"
+
+
+def test_word_files_reload_when_changed(tmp_path):
+    words = tmp_path / "words.txt"
+    words.write_text("apple\n", encoding="utf-8")
+    content_filter = ContentFilter(files=[str(words)], recheck_files=0)
+    assert content_filter.check("pear") == "pear"
+    words.write_text("apple\npear\n", encoding="utf-8")
+    assert content_filter.check("pear") == "p***"
+
+
+def test_hits_are_counted(content_filter):
+    content_filter.check("ass ass shitty")
+    stats = content_filter.stats()
+    assert stats["hits"] == {"ass": 2, "shit*": 1}
+    assert stats["flagged"] == 1
@@ -0,0 +1,64 @@
+from links_model import LinksFile, ROW_HEIGHTS, parse_links
+
+SAMPLE = """
+🎮 Gaming
+🔗 twitch.tv/someone
+🔗 https://youtube.com/@someone
+🔗 http://example.com
+🔗 kick.com/someone
+
+Just some text
+🐦 Social
+🔗 x.com/someone
+"""
+
+
+def test_parse_links_groups_rows():
+    rows = parse_links(SAMPLE, columns=3)
+    assert [kind for kind, _ in rows] == ["category", "links", "links", "text", "category", "links"]
+    assert rows[0] == ("category", "🎮 Gaming")
+    assert [link["url"] for link in rows[1][1]] == ["twitch.tv/someone", "https://youtube.com/@someone",
+                                                     "http://example.com"]
+    assert len(rows[2][1]) == 1
+    assert rows[3] == ("text", "Just some text")
+
+
+def test_parse_links_adds_https_only_when_missing():
+    links = parse_links(SAMPLE)[1][1]
+    assert [link["full_url"] for link in links] == ["https://twitch.tv/someone", "https://youtube.com/@someone",
+                                                    "http://example.com"]
+
+
+def test_parse_links_of_empty_file():
+    assert parse_links("\n  \n") == []
+
+
+def test_links_file_caches_until_modified(tmp_path):
+    path = tmp_path / "links.txt"
+    path.write_text(SAMPLE, encoding="utf-8")
+    links = LinksFile(str(path))
+    rows, changed = links.load()
+    assert changed and links.link_count == 5 and links.category_count == 2
+    assert links.load() == (rows, False)
+    path.write_text(SAMPLE + "🔗 new.example\n", encoding="utf-8")
+    _, changed = links.load()
+    assert changed and links.link_count == 6
+
+
+def test_missing_file_shows_an_error_row(tmp_path):
+    links = LinksFile(str(tmp_path / "missing.txt"))
+    rows, changed = links.load()
+    assert changed and rows[0][0] == "error"
+    assert links.height == ROW_HEIGHTS["error"]
+
+
+def test_visible_rows(tmp_path):
+    path = tmp_path / "links.txt"
+    path.write_text("\n".join(f"🔗 site{i}.example" for i in range(30)), encoding="utf-8")
+    links = LinksFile(str(path), columns=3)
+    links.load()
+    height = ROW_HEIGHTS["links"]
+    assert len(links.rows) == 10 and links.height == 10 * height
+    assert list(links.visible(0, height - 1)) == [0]
+    assert list(links.visible(height * 2.5, height * 4.5)) == [2, 3, 4]
+    assert list(links.visible(0, links.height * 2)) == list(range(10))
@@ -0,0 +1,82 @@
+import pytest
+
+from membership_index import BloomFilter, ViewerIndex, HEADER
+from viewer_store import ViewerStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ViewerStore(str(tmp_path / "viewers.db"), flush_interval=0.05)
+    yield store
+    store.close()
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    names = [f"viewer{i}" for i in range(1000)]
+    for name in names:
+        bloom.add(name)
+    assert all(name in bloom for name in names)
+
+
+def test_bloom_filter_fills_up():
+    bloom = BloomFilter(capacity=2)
+    bloom.add("alice")
+    assert not bloom.is_full()
+    bloom.add("bob")
+    assert bloom.is_full()
+
+
+def test_bloom_filter_counts_each_key_once():
+    bloom = BloomFilter(capacity=10)
+    assert bloom.add("alice")
+    assert not bloom.add("alice")
+    assert bloom.count == 1
+
+
+def test_snapshot_round_trip(store, tmp_path):
+    snapshot = str(tmp_path / "viewers.bloom")
+    for name in ("alice", "bob"):
+        store.record_join(name)
+    index = ViewerIndex(store, snapshot, capacity=100)
+    index.add("carol")
+    store.record_join("carol")
+    index.save()
+
+    loaded = ViewerIndex(store, snapshot, capacity=100)
+    assert loaded.filter.bits == index.filter.bits
+    assert loaded.filter.hashes == index.filter.hashes
+    assert bytes(loaded.filter.data) == bytes(index.filter.data)
+    assert loaded.watermark == index.watermark
+    assert all(loaded.seen_before(name) for name in ("alice", "bob", "carol"))
+
+
+def test_snapshot_picks_up_rows_written_after_it(store, tmp_path):
+    snapshot = str(tmp_path / "viewers.bloom")
+    store.record_join("alice")
+    ViewerIndex(store, snapshot, capacity=100).save()
+    # Written by another process sharing the database
+    store.record_join("dave", ts=10 ** 10)
+    store.flush()
+    assert ViewerIndex(store, snapshot, capacity=100).seen_before("dave")
+
+
+def test_corrupt_snapshot_rebuilds_from_database(store, tmp_path):
+    snapshot = tmp_path / "viewers.bloom"
+    store.record_join("alice")
+    store.flush()
+    snapshot.write_bytes(b"not a snapshot" * 4)
+    messages = []
+    index = ViewerIndex(store, str(snapshot), capacity=100, log=lambda message, level="info": messages.append(level))
+    assert index.seen_before("alice")
+    assert "warning" in messages
+
+
+def test_truncated_snapshot_is_ignored(store, tmp_path):
+    snapshot = tmp_path / "viewers.bloom"
+    store.record_join("alice")
+    index = ViewerIndex(store, str(snapshot), capacity=100)
+    index.save()
+    data = snapshot.read_bytes()
+    snapshot.write_bytes(data[:HEADER.size + 3])
+    assert ViewerIndex(store, str(snapshot), capacity=100).seen_before("alice")
@@ -0,0 +1,88 @@
+import pytest
+
+from speech_budget import SpeechBudget, truncate, describe_status
+
+
+def test_short_text_is_untouched():
+    assert truncate("hello there", 50) == "hello there"
+
+
+def test_truncate_prefers_a_sentence_end():
+    text = "First sentence here. Second one is much longer and goes on and on."
+    assert truncate(text, 40) == "First sentence here."
+
+
+def test_truncate_falls_back_to_a_word_break():
+    text = "one two three four five six seven eight nine ten"
+    cut = truncate(text, 20)
+    assert cut == "one two three..."
+    assert len(cut) <= 20
+
+
+def test_truncate_cuts_a_single_long_word():
+    assert truncate("a" * 50, 10) == "a" * 7 + "..."
+
+
+def test_cap_counts_truncations():
+    budget = SpeechBudget(max_message_chars=20)
+    assert budget.cap("short") == "short"
+    assert len(budget.cap("x " * 40)) <= 20
+    assert budget.truncated == 1
+
+
+def test_admit_charges_until_the_minute_budget_runs_out():
+    budget = SpeechBudget(per_minute=30, fallback="skip")
+    assert budget.admit("a" * 20) == "a" * 20
+    assert budget.admit("b" * 20) is None
+    assert budget.admit("c" * 10) == "c" * 10
+    assert budget.status()["minute_left"] == 0
+    assert budget.skipped == 1
+
+
+def test_over_budget_chat_is_summarized():
+    budget = SpeechBudget(per_minute=40)
+    assert budget.admit("x" * 35, "chat", "bob") == "x" * 35
+    assert budget.admit("y" * 100, "chat", "al") is None  # the summary doesn't fit either
+    budget = SpeechBudget(per_minute=60)
+    budget.admit("x" * 30)
+    assert budget.admit("y" * 100, "chat", "bob") == "bob sent a long message"
+    assert budget.summarized == 1
+
+
+def test_only_chat_is_summarized():
+    budget = SpeechBudget(per_minute=60)
+    budget.admit("x" * 30)
+    assert budget.admit("y" * 100, "welcome", "bob") is None
+
+
+def test_test_lines_are_exempt():
+    budget = SpeechBudget(per_minute=10)
+    assert budget.admit("this is a test of the voice", "test") is not None
+
+
+def test_minute_window_expires(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("speech_budget.time.monotonic", lambda: now[0])
+    budget = SpeechBudget(per_minute=20, fallback="skip")
+    assert budget.admit("a" * 20)
+    assert budget.admit("b") is None
+    now[0] += 60
+    assert budget.admit("b") == "b"
+
+
+def test_session_budget():
+    budget = SpeechBudget(per_minute=0, per_session=25, fallback="skip")
+    assert budget.admit("a" * 20)
+    assert budget.admit("b" * 10) is None
+    assert budget.status()["session_left"] == 5
+    assert budget.status()["minute_left"] is None
+
+
+@pytest.mark.parametrize("status, text", [
+    ({"minute_left": 2400, "session_left": 48000}, "2,400/min · 48,000 left"),
+    ({"minute_left": 300, "session_left": None}, "300/min"),
+    ({"minute_left": None, "session_left": None}, "unlimited"),
+    ({}, "unlimited"),
+])
+def test_describe_status(status, text):
+    assert describe_status(status) == text
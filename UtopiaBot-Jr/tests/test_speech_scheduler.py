@@ -0,0 +1,127 @@
+import time
+import threading
+
+from speech_scheduler import SpeechScheduler, DEFAULT_CLASSES
+
+
+class Span:
+    def __init__(self):
+        self.outcome = None
+        self.stages = {}
+
+    def record(self, stage, seconds):
+        self.stages[stage] = seconds
+
+    def finish(self, outcome):
+        self.outcome = outcome
+
+
+class Speaker:
+    """speak() that holds the first line until release(), so the rest queue up behind it"""
+
+    def __init__(self):
+        self.spoken = []
+        self.gate = threading.Event()
+        self.busy = threading.Event()
+        self.done = threading.Condition()
+
+    def __call__(self, text, span, message_class, voice, user):
+        if not self.busy.is_set():
+            self.busy.set()
+            self.gate.wait(5)
+        with self.done:
+            self.spoken.append(text)
+            self.done.notify_all()
+
+    def wait_for(self, count):
+        with self.done:
+            assert self.done.wait_for(lambda: len(self.spoken) >= count, 5)
+        return self.spoken
+
+
+def blocked_scheduler(classes=None):
+    speaker = Speaker()
+    scheduler = SpeechScheduler(speaker, classes=classes)
+    scheduler.submit("hold", message_class="test", user="host")
+    assert speaker.busy.wait(5)
+    return scheduler, speaker
+
+
+def test_earliest_deadline_goes_first():
+    scheduler, speaker = blocked_scheduler()
+    scheduler.submit("chat line", message_class="chat", user="a")
+    scheduler.submit("welcome line", message_class="welcome", user="b")
+    scheduler.submit("joke", message_class="joke", user="c")
+    speaker.gate.set()
+    assert speaker.wait_for(4) == ["hold", "welcome line", "joke", "chat line"]
+    scheduler.stop()
+
+
+def test_viewers_share_a_class_fairly():
+    scheduler, speaker = blocked_scheduler()
+    for i in range(3):
+        scheduler.submit(f"spam {i}", message_class="chat", user="spammer")
+    scheduler.submit("hello!", message_class="chat", user="quiet")  # same cost as each spam line
+    speaker.gate.set()
+    assert speaker.wait_for(5)[1:] == ["spam 0", "hello!", "spam 1", "spam 2"]
+    scheduler.stop()
+
+
+def test_regulars_get_a_bigger_share():
+    scheduler, speaker = blocked_scheduler()
+    for i in range(2):
+        scheduler.submit(f"new {i}", message_class="chat", user="new")
+    for i in range(2):
+        scheduler.submit(f"regular {i}", message_class="chat", user="regular", weight=2.0)
+    speaker.gate.set()
+    assert speaker.wait_for(5)[1:] == ["regular 0", "new 0", "regular 1", "new 1"]
+    scheduler.stop()
+
+
+def test_lines_past_max_wait_are_dropped():
+    classes = dict(DEFAULT_CLASSES, chat={"target": 0.01, "max_wait": 0.05})
+    scheduler, speaker = blocked_scheduler(classes)
+    span = Span()
+    scheduler.submit("too late", span, message_class="chat", user="a")
+    time.sleep(0.1)
+    scheduler.submit("on time", message_class="welcome", user="b")
+    speaker.gate.set()
+    assert speaker.wait_for(2) == ["hold", "on time"]
+    assert span.outcome == "stale"
+    assert scheduler.stats()["chat"]["stale"] == 1
+    scheduler.stop()
+
+
+def test_stop_with_drain_speaks_queued_lines():
+    scheduler, speaker = blocked_scheduler()
+    scheduler.submit("queued", message_class="chat", user="a")
+    speaker.gate.set()
+    scheduler.stop(drain=True, timeout=5)
+    assert speaker.spoken == ["hold", "queued"]
+
+
+def test_stop_without_drain_drops_queued_lines():
+    scheduler, speaker = blocked_scheduler()
+    span = Span()
+    scheduler.submit("queued", span, message_class="chat", user="a")
+    threading.Timer(0.05, speaker.gate.set).start()
+    scheduler.stop(drain=False, timeout=5)
+    assert speaker.spoken == ["hold"]
+    assert span.outcome == "dropped"
+    assert scheduler.depth() == 0
+
+
+def test_submit_after_stop_is_rejected_until_started():
+    speaker = Speaker()
+    speaker.busy.set()
+    scheduler = SpeechScheduler(speaker)
+    scheduler.stop()
+    span = Span()
+    assert scheduler.submit("late", span, user="a") is False
+    assert span.outcome == "stopped"
+    assert scheduler.rejected == 1
+    assert scheduler._threads == []
+    scheduler.start()
+    assert scheduler.submit("again", user="a") is True
+    assert speaker.wait_for(1) == ["again"]
+    scheduler.stop()